@@ -0,0 +1,9 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: Installable entry point for the hatchery simulation (task1) and the
+stock/crypto analytics (task2). The command line lives in ematm0048.cli; nothing is
+imported here so that starting the command stays fast.
+"""
+
+__version__ = "0.1.0"
@@ -0,0 +1,10 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: Allows the command line to be run with "python -m ematm0048".
+"""
+
+from ematm0048.cli import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: Single command line for the project: "simulate" and "sweep" run the hatchery
+simulation in task1, and "validate", "ingest", "analyze", "regimes" and "report" run the
+analytics in task2.
+Both folders use flat imports (e.g. "from Supplier import Supplier"), so each command
+puts only the folder it needs on sys.path, and NumPy, pandas, matplotlib and the other
+heavy libraries are imported inside the command that uses them. "simulate" only needs
+the standard library, so it starts in tens of milliseconds (see STARTUP_BUDGETS_MS);
+"--startup-check" turns that into a pass/fail check for CI.
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+# CPU time allowed between interpreter start and running each command, measured with
+# --startup-report (simulate needs no third-party library and usually takes 30-50 ms;
+# the analytics load pandas)
+STARTUP_BUDGETS_MS = {"simulate": 100, "sweep": 200, "analyze": 750, "validate": 750, "ingest": 750,
+                      "regimes": 750, "report": 750}
+
+# Libraries that should only be imported by the commands that need them
+HEAVY_MODULES = ["numpy", "pandas", "matplotlib", "seaborn", "yfinance"]
+
+# Commands that must start without importing any of HEAVY_MODULES
+LIGHT_COMMANDS = ["simulate"]
+
+# Installed package folders and the repository folders they are built from
+SOURCES = {
+    "simulation": "task1",
+    "analytics": os.path.join("task2", "additional code"),
+}
+
+# Commands that hand their arguments to an existing command line in task2
+DELEGATED = {
+    "validate": ("data_quality", "Check the raw price files before cleaning (see data_quality.py)."),
+    "ingest": ("live_ingest", "Aggregate live ticks into bars and group metrics (see live_ingest.py)."),
+    "regimes": ("regimes", "Detect return and volatility regimes and label the dataset (see regimes.py)."),
+    "report": ("report", "Build the HTML report of the grouped dataset (see report.py)."),
+}
+
+
+def use_sources(name):
+    """
+    Make the flat modules of task1 or task2 importable.
+
+    Args:
+        name (str): "simulation" (task1) or "analytics" (task2).
+
+    Returns:
+        str: Folder added to sys.path.
+    """
+    # An installed package ships the folders as ematm0048.simulation / ematm0048.analytics
+    spec = importlib.util.find_spec(f"ematm0048.{name}")
+    if spec is not None and spec.submodule_search_locations:
+        folder = list(spec.submodule_search_locations)[0]
+    else:
+        # Running from a checkout: use the repository folders next to the package
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        folder = os.path.join(root, SOURCES[name])
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+    return folder
+
+
+def startup_report(command):
+    """
+    Measure the start-up cost of the current command.
+
+    Args:
+        command (str): Name of the command being started.
+
+    Returns:
+        dict: "cpu_ms" (CPU time since the interpreter started), "budget_ms",
+        "within_budget", "heavy_modules" (the heavy libraries already imported) and
+        "passed" (within budget, and no heavy library for LIGHT_COMMANDS).
+    """
+    cpu_ms = time.process_time() * 1000
+    budget = STARTUP_BUDGETS_MS[command]
+    heavy = [name for name in HEAVY_MODULES if name in sys.modules]
+    return {
+        "cpu_ms": cpu_ms,
+        "budget_ms": budget,
+        "within_budget": cpu_ms <= budget,
+        "heavy_modules": heavy,
+        "passed": cpu_ms <= budget and not (command in LIGHT_COMMANDS and heavy)
+    }
+
+
+def _print_startup_report(args):
+    """
+    Print the start-up report to stderr if --startup-report or --startup-check was given.
+
+    Commands call this once their own imports are done, so the report covers them. With
+    --startup-check the command stops here, with exit status 1 if the check failed.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+    """
+    if not (args.startup_report or args.startup_check):
+        return
+    report = startup_report(args.command)
+    status = "within" if report["within_budget"] else "OVER"
+    heavy = ", ".join(report["heavy_modules"]) or "none"
+    print(f"{args.command} startup: {report['cpu_ms']:.1f} ms CPU ({status} the {report['budget_ms']} ms budget); "
+          f"heavy modules loaded: {heavy}", file=sys.stderr)
+    if args.startup_check:
+        sys.exit(0 if report["passed"] else 1)
+
+
+def _sale(text):
+    """
+    Parse one --sell argument of the form "Fish Type=quantity".
+
+    Args:
+        text (str): Argument value.
+
+    Returns:
+        tuple: (fish type, quantity to sell each quarter).
+    """
+    fish_type, _, quantity = text.rpartition("=")
+    if not fish_type.strip():
+        raise argparse.ArgumentTypeError(f"expected 'Fish Type=quantity', got '{text}'")
+    try:
+        quantity = int(quantity)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"quantity must be a whole number, got '{text}'")
+    if quantity < 0:
+        raise argparse.ArgumentTypeError(f"quantity must be 0 or more, got '{text}'")
+    return fish_type.strip(), quantity
+
+
+def _parse_sales(pairs):
+    """
+    Combine the parsed --sell arguments.
+
+    Args:
+        pairs (list of tuple or None): (fish type, quantity) pairs from --sell.
+
+    Returns:
+        dict or None: Fish type mapped to the quantity to sell each quarter.
+    """
+    if not pairs:
+        return None
+    return dict(pairs)
+
+
+def _technician_count(text):
+    """
+    Parse --technicians, keeping it within the limits of the Technician class.
+
+    Args:
+        text (str): Argument value.
+
+    Returns:
+        int: Number of technicians.
+    """
+    use_sources("simulation")
+    from Technician import Technician
+
+    try:
+        count = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{text}'")
+    if not Technician.MIN_TECHNICIANS <= count <= Technician.MAX_TECHNICIANS:
+        raise argparse.ArgumentTypeError(
+            f"must be between {Technician.MIN_TECHNICIANS} and {Technician.MAX_TECHNICIANS}, got {count}")
+    return count
+
+
+def simulate(args):
+    """
+    Run the hatchery for a number of quarters with a fixed policy, without prompts.
+
+    Each quarter follows main.py: sales in Hatchery.CUSTOMER_DEMAND order, wages, fixed
+    and storage costs, depreciation, then restocking from the chosen vendor.
+
+    Args:
+        args (argparse.Namespace): Parsed "simulate" arguments.
+
+    Returns:
+        int: Exit status (1 if the hatchery went bankrupt).
+    """
+    use_sources("simulation")
+    from Hatchery import Hatchery
+    from Supplier import Supplier
+
+    vendor = args.vendor or list(Supplier.PRICES)[0]
+    sales = _parse_sales(args.sell)
+    if sales is None:
+        # Default policy: try to sell half of each fish type's demand
+        sales = {fish: details["demand"] // 2 for fish, details in Hatchery.CUSTOMER_DEMAND.items()}
+    unknown = set(sales) - set(Hatchery.CUSTOMER_DEMAND)
+    if unknown:
+        raise SystemExit(f"Unknown fish type(s): {', '.join(sorted(unknown))}")
+
+    hatchery = Hatchery()
+    hatchery.add_technicians([(f"Technician {i + 1}", None) for i in range(args.technicians)])
+    _print_startup_report(args)
+
+    for quarter in range(1, args.quarters + 1):
+        hatchery.start_new_quarter()
+        sold = {}
+        for fish_type in Hatchery.CUSTOMER_DEMAND:
+            quantity = sales.get(fish_type, 0)
+            if quantity > 0:
+                result = hatchery.sell_fish(fish_type, quantity)
+                sold[fish_type] = result["sell_quantity"] if result["status"] == "success" else 0
+
+        # End-of-quarter costs, in the order of main.py
+        hatchery.pay_technicians()
+        hatchery.cash_balance -= Hatchery.FIXED_QUARTERLY_COST
+        hatchery.cash_balance -= hatchery.calculate_storage_costs()["total_storage_cost"]
+        hatchery.warehouse.calculate_depreciation()
+        restock = hatchery.restock_resources(vendor)
+
+        sold_text = ", ".join(f"{fish} {quantity}" for fish, quantity in sold.items()) or "nothing"
+        print(f"Quarter {quarter}: sold {sold_text}; cash {hatchery.cash_balance:.2f}")
+        if restock["status"] == "bankrupt":
+            print(f"Bankrupt in quarter {quarter}: could not restock {restock['resource']}.")
+            return 1
+    return 0
+
+
+def sweep(args):
+    """
+    Run a Morris sensitivity screening, or a resumable campaign of random scenarios.
+
+    Args:
+        args (argparse.Namespace): Parsed "sweep" arguments.
+
+    Returns:
+        int: Exit status.
+    """
+    use_sources("simulation")
+    if args.campaign:
+        from CampaignRunner import CampaignRunner
+
+        _print_startup_report(args)
+
+        try:
+            created = CampaignRunner.create(args.campaign, args.scenarios, args.chunk_size, args.seed, args.spread)
+        except ValueError as error:
+            raise SystemExit(f"{error}. Use a new file, or the options the campaign was created with.")
+        print("Campaign created." if created else "Resuming campaign.")
+        runner = CampaignRunner(args.campaign)
+        runner.run(args.workers)
+        print(runner.summary())
+        return 0
+
+    from SensitivityAnalysis import SensitivityAnalysis
+
+    _print_startup_report(args)
+
+    result = SensitivityAnalysis(spread=args.spread).run(args.trajectories, args.seed)
+    print(SensitivityAnalysis.format_report(result, args.top))
+    return 0
+
+
+def analyze(args):
+    """
+    Compare two groups of the grouped dataset with parametric and resampling tests.
+
+    Args:
+        args (argparse.Namespace): Parsed "analyze" arguments.
+
+    Returns:
+        int: Exit status.
+    """
+    use_sources("analytics")
+    import hypothesis_tests
+    from loaders import DATA_DIR
+
+    _print_startup_report(args)
+
+    # An installed package ships the code but not the task2 data folder
+    path = args.data or os.path.join(DATA_DIR, "cleaned_grouped_data.csv")
+    if not os.path.isfile(path):
+        raise SystemExit(f"Data file not found: {os.path.normpath(path)}\n"
+                         "Pass --data with the path to a grouped CSV file such as cleaned_grouped_data.csv.")
+
+    kwargs = {"path": path, "groups": tuple(args.groups), "metrics": tuple(args.metrics),
+              "n_resamples": args.resamples, "seed": args.seed, "n_jobs": args.jobs}
+    print(hypothesis_tests.compare_groups(**kwargs).to_string())
+    return 0
+
+
+def build_parser():
+    """
+    Build the argument parser with one subcommand per task.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(prog="ematm0048", description="Hatchery simulation and market analytics.")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print the start-up CPU time of the command against its budget")
+    parser.add_argument("--startup-check", action="store_true",
+                        help="stop after start-up, failing if the command is over budget or loaded "
+                             "heavy libraries it should not need")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sim = commands.add_parser("simulate", help="run the hatchery with a fixed policy")
+    sim.add_argument("--quarters", type=int, default=8)
+    sim.add_argument("--technicians", type=_technician_count, default=2,
+                     help="technicians without a specialisation (within the Technician limits)")
+    sim.add_argument("--sell", action="append", type=_sale, metavar="FISH=QTY",
+                     help="quantity of a fish type to sell each quarter (repeatable; default half the demand)")
+    sim.add_argument("--vendor", default=None, help="supplier used for restocking")
+    sim.set_defaults(handler=simulate)
+
+    swp = commands.add_parser("sweep", help="sensitivity screening or a resumable scenario campaign")
+    swp.add_argument("--spread", type=float, default=0.2, help="largest relative change of each constant")
+    swp.add_argument("--seed", type=int, default=0)
+    swp.add_argument("--trajectories", type=int, default=20, help="Morris trajectories")
+    swp.add_argument("--top", type=int, default=15, help="factors to show")
+    swp.add_argument("--campaign", default=None, metavar="PATH", help="run a campaign stored in this SQLite file")
+    swp.add_argument("--scenarios", type=int, default=100_000, help="campaign scenarios")
+    swp.add_argument("--chunk-size", type=int, default=1000, help="campaign scenarios per chunk")
+    swp.add_argument("--workers", type=int, default=1, help="campaign worker processes")
+    swp.set_defaults(handler=sweep)
+
+    ana = commands.add_parser("analyze", help="compare two groups of the grouped dataset")
+    ana.add_argument("--data", default=None, help="grouped CSV file (default: cleaned_grouped_data.csv)")
+    ana.add_argument("--groups", nargs=2, default=["Stocks", "Cryptos"])
+    ana.add_argument("--metrics", nargs="+", default=["Avg_Return", "Avg_Volatility"])
+    ana.add_argument("--resamples", type=int, default=10_000)
+    ana.add_argument("--seed", type=int, default=None)
+    ana.add_argument("--jobs", type=int, default=None, help="worker processes for resampling")
+    ana.set_defaults(handler=analyze)
+
+    # Delegated commands keep their own options; everything after the name is passed on
+    for name, (_, description) in DELEGATED.items():
+        commands.add_parser(name, help=description, add_help=False)
+    return parser
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list of str or None): Arguments; defaults to sys.argv[1:].
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = build_parser()
+
+    # Hand delegated commands straight to their own parsers
+    flags = []
+    while argv[len(flags):len(flags) + 1] in (["--startup-report"], ["--startup-check"]):
+        flags.append(argv[len(flags)])
+    rest = argv[len(flags):]
+    if rest and rest[0] in DELEGATED:
+        use_sources("analytics")
+        module = importlib.import_module(DELEGATED[rest[0]][0])
+        _print_startup_report(argparse.Namespace(startup_report="--startup-report" in flags,
+                                                 startup_check="--startup-check" in flags, command=rest[0]))
+        # Usage messages of the delegated parser show the full command
+        sys.argv[0] = f"{parser.prog} {rest[0]}"
+        module.main(rest[1:])
+        return
+
+    args = parser.parse_args(argv)
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
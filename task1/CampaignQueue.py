@@ -0,0 +1,307 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the CampaignQueue class, a work queue kept in a single
+SQLite file. A campaign of scenarios is split into chunks that any number of worker
+processes, on one machine or on several machines sharing the file, can claim. Claims
+are leases kept alive by heartbeats; a chunk whose worker stops sending heartbeats is
+handed to another worker, and failed chunks are retried a limited number of times.
+Results are written once per chunk, so a chunk finished twice is only stored once.
+"""
+
+
+class CampaignQueue:
+    """
+    The CampaignQueue class stores a campaign's chunks, their claims and their results.
+
+    The database uses SQLite's default rollback journal rather than WAL, because WAL
+    does not work on network filesystems. Every change runs in an IMMEDIATE transaction,
+    so two workers can never claim the same chunk.
+
+    Attributes:
+        BUSY_TIMEOUT (float): Seconds to wait for another process to release the database.
+        SCHEMA (str): Tables for the campaign description, the chunks and their results.
+        path (str): Path of the SQLite file.
+        connection (sqlite3.Connection): Connection used by this object.
+    """
+    BUSY_TIMEOUT = 60.0
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS campaign (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS chunks (
+            id INTEGER PRIMARY KEY,
+            start INTEGER NOT NULL,
+            stop INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            worker TEXT,
+            lease TEXT,
+            heartbeat REAL,
+            error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS chunks_status ON chunks (status, id);
+        CREATE TABLE IF NOT EXISTS results (
+            chunk_id INTEGER PRIMARY KEY,
+            payload BLOB NOT NULL,
+            worker TEXT,
+            finished REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path):
+        """
+        Open (or create) the queue database.
+
+        Args:
+            path (str): Path of the SQLite file.
+        """
+        self.path = path
+        # Autocommit mode, so transactions are started explicitly with BEGIN IMMEDIATE
+        self.connection = sqlite3.connect(path, timeout=CampaignQueue.BUSY_TIMEOUT, isolation_level=None)
+        self.connection.executescript(CampaignQueue.SCHEMA)
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        self.connection.close()
+
+    def _transaction(self):
+        """
+        Start a write transaction that locks out other writers until it commits.
+
+        Returns:
+            sqlite3.Cursor: Cursor of the transaction.
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        return cursor
+
+    @staticmethod
+    def worker_name():
+        """
+        Build a name that identifies the current process across machines.
+
+        Returns:
+            str: "host:pid".
+        """
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def create(self, spec, scenarios, chunk_size):
+        """
+        Split a campaign into chunks, or resume it if the same campaign already exists.
+
+        Args:
+            spec (dict): JSON-serialisable description of the campaign.
+            scenarios (int): Number of scenarios.
+            chunk_size (int): Scenarios per chunk.
+
+        Returns:
+            bool: True if the campaign was created, False if an existing one was resumed.
+
+        Raises:
+            ValueError: If the file already holds a different campaign.
+        """
+        stored = dict(spec, scenarios=scenarios, chunk_size=chunk_size)
+        encoded = json.dumps(stored, sort_keys=True)
+
+        cursor = self._transaction()
+        try:
+            row = cursor.execute("SELECT value FROM campaign WHERE key = 'spec'").fetchone()
+            if row is not None:
+                # Resuming: the stored campaign must match, or results would be mixed
+                if row[0] != encoded:
+                    existing = json.loads(row[0])
+                    different = ", ".join(f"{key} {existing.get(key)!r} (asked for {value!r})"
+                                          for key, value in sorted(stored.items()) if existing.get(key) != value)
+                    raise ValueError(f"Campaign {self.path} exists with a different spec: {different}")
+                cursor.execute("COMMIT")
+                return False
+
+            cursor.execute("INSERT INTO campaign (key, value) VALUES ('spec', ?)", (encoded,))
+            cursor.executemany(
+                "INSERT INTO chunks (id, start, stop) VALUES (?, ?, ?)",
+                ((i, start, min(start + chunk_size, scenarios))
+                 for i, start in enumerate(range(0, scenarios, chunk_size)))
+            )
+            cursor.execute("COMMIT")
+            return True
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+    def spec(self):
+        """
+        Retrieve the campaign description.
+
+        Returns:
+            dict or None: The spec given to create(), with "scenarios" and "chunk_size".
+        """
+        row = self.connection.execute("SELECT value FROM campaign WHERE key = 'spec'").fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def claim(self, worker, lease_timeout, max_attempts):
+        """
+        Claim the next chunk that is pending or whose worker has stopped sending heartbeats.
+
+        Args:
+            worker (str): Name of the claiming worker.
+            lease_timeout (float): Seconds without a heartbeat after which a claim expires.
+            max_attempts (int): Attempts after which a chunk is marked as failed.
+
+        Returns:
+            dict or None: "id", "start", "stop", "lease" and "attempt" of the claimed chunk,
+            or None if no chunk is available.
+        """
+        now = time.time()
+        cursor = self._transaction()
+        try:
+            # Chunks whose worker died have used up an attempt; give up on them at the limit
+            cursor.execute(
+                "UPDATE chunks SET status = 'failed', error = 'lease expired', lease = NULL "
+                "WHERE status = 'running' AND heartbeat < ? AND attempts >= ?",
+                (now - lease_timeout, max_attempts)
+            )
+            row = cursor.execute(
+                "SELECT id, start, stop, attempts FROM chunks "
+                "WHERE status = 'pending' OR (status = 'running' AND heartbeat < ?) "
+                "ORDER BY id LIMIT 1",
+                (now - lease_timeout,)
+            ).fetchone()
+            if row is None:
+                cursor.execute("COMMIT")
+                return None
+
+            # A fresh lease token lets the previous holder detect that it lost the chunk
+            lease = uuid.uuid4().hex
+            cursor.execute(
+                "UPDATE chunks SET status = 'running', attempts = attempts + 1, worker = ?, "
+                "lease = ?, heartbeat = ? WHERE id = ?",
+                (worker, lease, now, row[0])
+            )
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        return {"id": row[0], "start": row[1], "stop": row[2], "lease": lease, "attempt": row[3] + 1}
+
+    def heartbeat(self, chunk_id, lease):
+        """
+        Renew the claim on a chunk.
+
+        Args:
+            chunk_id (int): Chunk being worked on.
+            lease (str): Lease token returned by claim().
+
+        Returns:
+            bool: False if the claim has expired and the chunk was given to another worker.
+        """
+        cursor = self.connection.execute(
+            "UPDATE chunks SET heartbeat = ? WHERE id = ? AND lease = ? AND status = 'running'",
+            (time.time(), chunk_id, lease)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, chunk_id, payload, worker):
+        """
+        Store the result of a chunk and mark it as done.
+
+        The result is written at most once, so a chunk that was finished by two workers
+        (for example after a lease expired during a long pause) keeps the first result.
+
+        Args:
+            chunk_id (int): Chunk that was evaluated.
+            payload (bytes): Serialised result of the chunk.
+            worker (str): Name of the worker.
+
+        Returns:
+            bool: True if this call stored the result, False if it was already stored.
+        """
+        cursor = self._transaction()
+        try:
+            cursor.execute(
+                "INSERT OR IGNORE INTO results (chunk_id, payload, worker, finished) VALUES (?, ?, ?, ?)",
+                (chunk_id, payload, worker, time.time())
+            )
+            stored = cursor.rowcount == 1
+            cursor.execute(
+                "UPDATE chunks SET status = 'done', lease = NULL, error = NULL WHERE id = ?", (chunk_id,)
+            )
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        return stored
+
+    def fail(self, chunk_id, lease, error, max_attempts):
+        """
+        Release a chunk after an error so it can be retried, or mark it as failed.
+
+        Args:
+            chunk_id (int): Chunk that failed.
+            lease (str): Lease token returned by claim().
+            error (str): Description of the error.
+            max_attempts (int): Attempts after which the chunk is not retried.
+        """
+        self.connection.execute(
+            "UPDATE chunks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "lease = NULL, error = ? WHERE id = ? AND lease = ?",
+            (max_attempts, error, chunk_id, lease)
+        )
+
+    def retry_failed(self):
+        """
+        Put every failed chunk back in the queue with its attempts reset.
+
+        Returns:
+            int: Number of chunks requeued.
+        """
+        cursor = self.connection.execute(
+            "UPDATE chunks SET status = 'pending', attempts = 0, error = NULL WHERE status = 'failed'"
+        )
+        return cursor.rowcount
+
+    def progress(self):
+        """
+        Count the chunks in each state.
+
+        Returns:
+            dict: "pending", "running", "done" and "failed" chunk counts plus "total".
+        """
+        counts = {"pending": 0, "running": 0, "done": 0, "failed": 0}
+        for status, count in self.connection.execute("SELECT status, COUNT(*) FROM chunks GROUP BY status"):
+            counts[status] = count
+        counts["total"] = sum(counts.values())
+        return counts
+
+    def failures(self):
+        """
+        List the chunks that failed.
+
+        Returns:
+            list of dict: "id", "attempts" and "error" of each failed chunk.
+        """
+        rows = self.connection.execute("SELECT id, attempts, error FROM chunks WHERE status = 'failed' ORDER BY id")
+        return [{"id": row[0], "attempts": row[1], "error": row[2]} for row in rows]
+
+    def results(self):
+        """
+        Iterate over the stored results in chunk order.
+
+        Returns:
+            iterator of tuple: (chunk id, start, stop, payload).
+        """
+        return self.connection.execute(
+            "SELECT chunks.id, chunks.start, chunks.stop, results.payload FROM results "
+            "JOIN chunks ON chunks.id = results.chunk_id ORDER BY chunks.id"
+        )
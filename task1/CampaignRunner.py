@@ -0,0 +1,349 @@
+import argparse
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from CampaignQueue import CampaignQueue
+from SensitivityAnalysis import SensitivityAnalysis
+from VectorHatcheryEnv import VENDORS
+
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the CampaignRunner class, which runs very large Monte
+Carlo campaigns of hatchery scenarios through a CampaignQueue. Each scenario scales every
+simulation constant by a random multiplier (see SensitivityAnalysis) and each chunk of
+scenarios is simulated as one VectorHatcheryEnv batch. A chunk's scenarios are drawn from
+the campaign seed and the chunk number, so a chunk evaluated again after a crash gives
+the same result. A campaign interrupted at any point resumes from the chunks not yet done.
+"""
+
+
+class CampaignRunner:
+    """
+    The CampaignRunner class creates campaigns and runs workers that evaluate their chunks.
+
+    Attributes:
+        path (str): Path of the campaign's SQLite file.
+        spec (dict): Campaign description stored in the file.
+        lease_timeout (float): Seconds without a heartbeat after which a chunk is reclaimed.
+        heartbeat_interval (float): Seconds between heartbeats while a chunk is evaluated.
+        max_attempts (int): Attempts per chunk before it is marked as failed.
+        analysis (SensitivityAnalysis): Simulates a batch of scenarios under the campaign's policy.
+    """
+
+    @staticmethod
+    def create(path, scenarios, chunk_size=1000, seed=0, spread=0.2, quarters=8, roster=None,
+               sales_fraction=0.5, vendor=VENDORS[0]):
+        """
+        Create a campaign file, or resume the identical campaign if it already exists.
+
+        Args:
+            path (str): Path of the campaign's SQLite file.
+            scenarios (int): Number of scenarios.
+            chunk_size (int): Scenarios per chunk (one vectorised batch).
+            seed (int): Seed from which every chunk's scenarios are drawn.
+            spread (float): Largest relative change applied to a constant.
+            quarters (int): Quarters simulated per scenario.
+            roster (dict or None): Technicians hired in the first quarter, by specialisation.
+            sales_fraction (float): Share of each fish type's demand the policy tries to sell.
+            vendor (str): Supplier used for restocking.
+
+        Returns:
+            bool: True if the campaign was created, False if it was resumed.
+        """
+        spec = {
+            "seed": seed,
+            "spread": spread,
+            "quarters": quarters,
+            # JSON objects cannot have None keys, so the roster is stored as pairs
+            "roster": None if roster is None else [[specialisation, count] for specialisation, count in roster.items()],
+            "sales_fraction": sales_fraction,
+            "vendor": vendor
+        }
+        queue = CampaignQueue(path)
+        try:
+            return queue.create(spec, scenarios, chunk_size)
+        finally:
+            queue.close()
+
+    def __init__(self, path, lease_timeout=60.0, heartbeat_interval=10.0, max_attempts=3):
+        """
+        Initialize a runner for an existing campaign.
+
+        Args:
+            path (str): Path of the campaign's SQLite file.
+            lease_timeout (float): Seconds without a heartbeat after which a chunk is reclaimed.
+            heartbeat_interval (float): Seconds between heartbeats (well below lease_timeout).
+            max_attempts (int): Attempts per chunk before it is marked as failed.
+
+        Raises:
+            ValueError: If the file holds no campaign.
+        """
+        self.path = path
+        self.lease_timeout = lease_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.max_attempts = max_attempts
+
+        queue = CampaignQueue(path)
+        try:
+            self.spec = queue.spec()
+        finally:
+            queue.close()
+        if self.spec is None:
+            raise ValueError(f"{path} holds no campaign; create it first")
+
+        roster = self.spec["roster"]
+        self.analysis = SensitivityAnalysis(
+            spread=self.spec["spread"],
+            quarters=self.spec["quarters"],
+            roster=None if roster is None else {specialisation: count for specialisation, count in roster},
+            sales_fraction=self.spec["sales_fraction"],
+            vendor=self.spec["vendor"]
+        )
+
+    def multipliers(self, chunk_id, start, stop):
+        """
+        Draw the multipliers of a chunk's scenarios.
+
+        Args:
+            chunk_id (int): Chunk number.
+            start (int): First scenario of the chunk.
+            stop (int): Scenario after the last one.
+
+        Returns:
+            np.ndarray: (scenarios, factors) multipliers, the same every time for a chunk.
+        """
+        rng = np.random.default_rng([self.spec["seed"], chunk_id])
+        spread = self.spec["spread"]
+        return rng.uniform(1 - spread, 1 + spread, size=(stop - start, len(self.analysis.factors)))
+
+    def evaluate(self, chunk_id, start, stop):
+        """
+        Simulate a chunk's scenarios in one batch.
+
+        Args:
+            chunk_id (int): Chunk number.
+            start (int): First scenario of the chunk.
+            stop (int): Scenario after the last one.
+
+        Returns:
+            bytes: Final cash (float64) followed by bankruptcy flags (uint8) per scenario.
+        """
+        final_cash, bankrupt = self.analysis.simulate(self.multipliers(chunk_id, start, stop))
+        return final_cash.astype(np.float64).tobytes() + bankrupt.astype(np.uint8).tobytes()
+
+    @staticmethod
+    def decode(payload, count):
+        """
+        Unpack a chunk result written by evaluate().
+
+        Args:
+            payload (bytes): Stored result.
+            count (int): Scenarios in the chunk.
+
+        Returns:
+            tuple: (final cash, bankruptcy flags) arrays.
+        """
+        final_cash = np.frombuffer(payload, dtype=np.float64, count=count)
+        bankrupt = np.frombuffer(payload, dtype=np.uint8, count=count, offset=8 * count).astype(bool)
+        return final_cash, bankrupt
+
+    def _keep_alive(self, chunk_id, lease, stop):
+        """
+        Send heartbeats for a chunk until told to stop or the claim is lost.
+
+        Args:
+            chunk_id (int): Chunk being evaluated.
+            lease (str): Lease token of the claim.
+            stop (threading.Event): Set when the chunk is finished.
+        """
+        # SQLite connections belong to one thread, so the heartbeat thread opens its own
+        queue = CampaignQueue(self.path)
+        try:
+            while not stop.wait(self.heartbeat_interval):
+                if not queue.heartbeat(chunk_id, lease):
+                    break
+        finally:
+            queue.close()
+
+    def work(self, max_chunks=None, worker=None):
+        """
+        Claim and evaluate chunks until none are left.
+
+        Args:
+            max_chunks (int or None): Stop after this many chunks (None for no limit).
+            worker (str or None): Worker name; defaults to "host:pid".
+
+        Returns:
+            int: Number of chunks this worker evaluated.
+        """
+        worker = CampaignQueue.worker_name() if worker is None else worker
+        queue = CampaignQueue(self.path)
+        done = 0
+        try:
+            while max_chunks is None or done < max_chunks:
+                chunk = queue.claim(worker, self.lease_timeout, self.max_attempts)
+                if chunk is None:
+                    break
+
+                # Keep the claim alive from a background thread while the batch runs
+                stop = threading.Event()
+                heartbeat = threading.Thread(target=self._keep_alive, args=(chunk["id"], chunk["lease"], stop),
+                                             daemon=True)
+                heartbeat.start()
+                try:
+                    payload = self.evaluate(chunk["id"], chunk["start"], chunk["stop"])
+                except Exception:
+                    queue.fail(chunk["id"], chunk["lease"], traceback.format_exc(), self.max_attempts)
+                    continue
+                finally:
+                    stop.set()
+                    heartbeat.join()
+
+                # Results are deterministic, so storing them is safe even if the claim expired
+                queue.complete(chunk["id"], payload, worker)
+                done += 1
+        finally:
+            queue.close()
+        return done
+
+    def run(self, workers=1):
+        """
+        Evaluate the remaining chunks with several worker processes on this machine.
+
+        Further workers (for example on other machines sharing the file) can join at any
+        time with work().
+
+        Args:
+            workers (int): Number of worker processes (1 runs in this process).
+
+        Returns:
+            dict: Chunk counts by state after the run (see progress()).
+        """
+        if workers == 1:
+            self.work()
+        else:
+            settings = (self.path, self.lease_timeout, self.heartbeat_interval, self.max_attempts)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(_work_in_process, [settings] * workers))
+        return self.progress()
+
+    def progress(self):
+        """
+        Count the campaign's chunks in each state.
+
+        Returns:
+            dict: "pending", "running", "done", "failed" and "total" chunk counts.
+        """
+        queue = CampaignQueue(self.path)
+        try:
+            return queue.progress()
+        finally:
+            queue.close()
+
+    def results(self):
+        """
+        Collect the results of every finished chunk.
+
+        Returns:
+            tuple: (scenario numbers, final cash, bankruptcy flags) arrays for the
+            scenarios evaluated so far.
+        """
+        queue = CampaignQueue(self.path)
+        scenarios, cash, bankrupt = [], [], []
+        try:
+            for _, start, stop, payload in queue.results():
+                chunk_cash, chunk_bankrupt = CampaignRunner.decode(payload, stop - start)
+                scenarios.append(np.arange(start, stop))
+                cash.append(chunk_cash)
+                bankrupt.append(chunk_bankrupt)
+        finally:
+            queue.close()
+        if not scenarios:
+            return np.array([], dtype=np.int64), np.array([]), np.array([], dtype=bool)
+        return np.concatenate(scenarios), np.concatenate(cash), np.concatenate(bankrupt)
+
+    def summary(self):
+        """
+        Summarise the scenarios evaluated so far.
+
+        Returns:
+            dict: Scenarios done, mean and 5th/50th/95th percentiles of final cash,
+            bankruptcy risk and the chunk counts from progress().
+        """
+        _, cash, bankrupt = self.results()
+        result = {"scenarios_done": len(cash), "progress": self.progress()}
+        if len(cash):
+            result["mean_final_cash"] = float(cash.mean())
+            result["final_cash_percentiles"] = dict(zip((5, 50, 95), np.percentile(cash, [5, 50, 95]).tolist()))
+            result["bankruptcy_risk"] = float(bankrupt.mean())
+        return result
+
+
+def _work_in_process(settings):
+    """
+    Run a worker in a separate process.
+
+    Args:
+        settings (tuple): (path, lease_timeout, heartbeat_interval, max_attempts).
+
+    Returns:
+        int: Number of chunks the worker evaluated.
+    """
+    path, lease_timeout, heartbeat_interval, max_attempts = settings
+    return CampaignRunner(path, lease_timeout, heartbeat_interval, max_attempts).work()
+
+
+def main(argv=None):
+    """
+    Command-line entry point: create a campaign, run workers or show its status.
+
+    Args:
+        argv (list or None): Command-line arguments (defaults to sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="Resumable hatchery scenario campaigns.")
+    parser.add_argument("path", help="SQLite file of the campaign")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create = commands.add_parser("create", help="create (or resume) a campaign")
+    create.add_argument("--scenarios", type=int, required=True)
+    create.add_argument("--chunk-size", type=int, default=1000)
+    create.add_argument("--seed", type=int, default=0)
+    create.add_argument("--spread", type=float, default=0.2)
+
+    work = commands.add_parser("work", help="evaluate chunks until none are left")
+    work.add_argument("--workers", type=int, default=1)
+    work.add_argument("--lease-timeout", type=float, default=60.0)
+    work.add_argument("--retry-failed", action="store_true", help="requeue failed chunks first")
+
+    commands.add_parser("status", help="show progress and the results so far")
+    args = parser.parse_args(argv)
+
+    if args.command == "create":
+        try:
+            created = CampaignRunner.create(args.path, args.scenarios, args.chunk_size, args.seed, args.spread)
+        except ValueError as error:
+            raise SystemExit(f"{error}. Use a new file, or the options the campaign was created with.")
+        print("Campaign created." if created else "Campaign already exists; it will resume.")
+    elif args.command == "work":
+        if args.retry_failed:
+            queue = CampaignQueue(args.path)
+            print(f"Requeued {queue.retry_failed()} failed chunks.")
+            queue.close()
+        runner = CampaignRunner(args.path, lease_timeout=args.lease_timeout,
+                                heartbeat_interval=args.lease_timeout / 6)
+        print(runner.run(args.workers))
+    else:
+        runner = CampaignRunner(args.path)
+        print(runner.summary())
+        queue = CampaignQueue(args.path)
+        for failure in queue.failures():
+            print(f"Chunk {failure['id']} failed after {failure['attempts']} attempts:\n{failure['error']}")
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ from Technician import Technician
 from Warehouse import Warehouse
 from Fish import Fish
 from Supplier import Supplier
+from LabourLedger import LabourLedger
+from StockLots import StockLots
 
 """
 Author: Mishara Sapukotanage
@@ -25,6 +27,7 @@ class Hatchery:
         technicians (list): List of Technician objects employed by the hatchery.
         warehouse (Warehouse): Instance of the Warehouse class to manage resources.
         available_labor (float): Tracks available labor hours for the quarter.
+        labour_ledger (LabourLedger): Remaining labour of each technician for the quarter.
     """
     # Static data related to customer demand and fixed quarterly costs
     CUSTOMER_DEMAND = {
@@ -54,14 +57,21 @@ class Hatchery:
         # Track available labor hours (updated at the start of each quarter)
         self.available_labor = 0
 
+        # Track the labour left by each technician (rebuilt at the start of each quarter)
+        self.labour_ledger = LabourLedger(self.technicians)
+
     def start_new_quarter(self):
         """
         Reset available labor based on the number of technicians at the start of each quarter.
-        Calculates labor using the Technician class's static method.
+        Calculates labor using the Technician class's static method and gives every
+        technician a fresh quarter of labour in the ledger.
         """
         # Calculate total labor hours based on the number of employed technicians
         self.available_labor = Technician.calculate_total_labour(len(self.technicians))
 
+        # Start a new ledger so each technician's weeks are tracked individually
+        self.labour_ledger = LabourLedger(self.technicians)
+
     @classmethod
     def get_demand_and_price(cls, fish_type):
         """
@@ -186,34 +196,13 @@ class Hatchery:
         # Calculate the total maintenance time required for selling the specified quantity
         base_maintenance_time = Fish.calculate_total_maintenance_time(fish_type, sell_quantity)
 
-        # Split technicians into two groups: specialized and regular
-        specialized_technicians = [
-            technician for technician in self.technicians if technician.is_specialised_for(fish_type)
-        ]
-        regular_technicians = [
-            technician for technician in self.technicians if not technician.is_specialised_for(fish_type)
-        ]
-
-        # Calculate total labor available for specialized technicians
-        specialized_labor_available = len(specialized_technicians) * Technician.LABOUR_PER_QUARTER
-        # Convert specialized labor into equivalent time using a 3:2 ratio for efficiency
-        equivalent_specialized_time = specialized_labor_available * (3 / 2)
-        # Determine the maximum quantity of fish that can be handled by specialized technicians
-        max_specialized_quantity = equivalent_specialized_time / (base_maintenance_time / sell_quantity)
-
-        # Calculate the actual maintenance time based on labor availability
-        if max_specialized_quantity >= sell_quantity:
-            # If specialized technicians can handle all the fish, apply the efficiency factor
-            actual_maintenance_time = base_maintenance_time * (2 / 3)
-        else:
-            # Split the work between specialized and regular technicians
-            specialized_maintenance_time = max_specialized_quantity * (base_maintenance_time / sell_quantity) * (2 / 3)
-            remaining_quantity = sell_quantity - max_specialized_quantity
-            regular_maintenance_time = remaining_quantity * (base_maintenance_time / sell_quantity)
-            actual_maintenance_time = specialized_maintenance_time + regular_maintenance_time
+        # Work out the labour needed from the technicians' remaining weeks, using
+        # specialists first at the 3:2 efficiency rate (see LabourLedger)
+        labour_quote = self.labour_ledger.quote(fish_type, base_maintenance_time)
+        actual_maintenance_time = labour_quote["required_labor"]
 
         # Check if there is sufficient labor available
-        labor_issue = self.available_labor < actual_maintenance_time
+        labor_issue = not labour_quote["feasible"]
 
         # Check if there are sufficient resources available
         resource_needs = Fish.calculate_resource_needs(fish_type, sell_quantity)
@@ -221,7 +210,8 @@ class Hatchery:
         for resource, amount_needed in resource_needs.items():
             # Calculate the total available stock for the resource
             available_amount = self.warehouse.main_stock.get(resource, 0) + self.warehouse.aux_stock.get(resource, 0)
-            if available_amount < amount_needed:
+            # Shortfalls within the lots' rounding tolerance still count as enough stock
+            if available_amount + StockLots.TOLERANCE < amount_needed:
                 # Record the shortage details if resources are insufficient
                 insufficient_resources[resource] = {
                     "needed": amount_needed,
@@ -248,8 +238,9 @@ class Hatchery:
                 "resources": insufficient_resources
             }
 
-        # Deduct the required labor and resources
-        self.available_labor -= actual_maintenance_time
+        # Allocate the labour to individual technicians and deduct the resources
+        labour_allocation = self.labour_ledger.allocate(fish_type, base_maintenance_time)["allocation"]
+        self.available_labor = self.labour_ledger.total_remaining
         for resource, amount_needed in resource_needs.items():
             self.warehouse.check_and_deduct_resources(resource, amount_needed)
 
@@ -262,7 +253,8 @@ class Hatchery:
             "status": "success",
             "fish_type": fish_type,
             "sell_quantity": sell_quantity,
-            "revenue": revenue
+            "revenue": revenue,
+            "labour_allocation": labour_allocation
         }
 
     def pay_technicians(self):
@@ -0,0 +1,154 @@
+import numpy as np
+
+from Hatchery import Hatchery
+from Technician import Technician
+from VectorHatcheryEnv import FISH_TYPES, RESOURCES, ROSTER_SLOTS, VENDORS
+
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the HatcheryEnv class, an environment with reset/step
+methods over the hatchery rules, so automated policies can be trained and evaluated
+instead of answering main.py's prompts. Each step runs one quarter with the Hatchery,
+Warehouse and Technician classes directly. VectorHatcheryEnv runs many of these
+environments at once with NumPy and uses the same observation and action layout.
+"""
+
+
+class HatcheryEnv:
+    """
+    The HatcheryEnv class wraps one Hatchery as an environment stepped one quarter at a time.
+
+    Actions are a dict:
+        "hire": 7 changes in the number of technicians per roster slot (slot 0 has no
+            specialisation, slots 1-6 follow Hatchery.CUSTOMER_DEMAND).
+        "sales": 6 quantities to sell, in Hatchery.CUSTOMER_DEMAND order.
+        "vendor": Index of the vendor in Supplier.PRICES used for restocking.
+
+    Observations are arrays laid out as VectorHatcheryEnv.OBSERVATION_FIELDS.
+
+    Attributes:
+        max_quarters (int): Quarters per episode.
+        hatchery (Hatchery): Hatchery of the current episode.
+        quarter (int): Quarters completed in the current episode.
+    """
+
+    def __init__(self, max_quarters=8):
+        """
+        Initialize the environment.
+
+        Args:
+            max_quarters (int): Quarters per episode (main.py allows up to 8).
+        """
+        self.max_quarters = max_quarters
+        self._hired = 0  # Used to give every new technician a unique name
+        self.reset()
+
+    def reset(self):
+        """
+        Start a new episode with a new hatchery.
+
+        Returns:
+            np.ndarray: The first observation.
+        """
+        self.hatchery = Hatchery()
+        self.quarter = 0
+        return self.observe()
+
+    def roster(self):
+        """
+        Count the technicians in each roster slot.
+
+        Returns:
+            np.ndarray: Number of technicians per slot.
+        """
+        counts = np.zeros(len(ROSTER_SLOTS), dtype=np.int64)
+        for technician in self.hatchery.technicians:
+            counts[ROSTER_SLOTS.index(technician.specialisation)] += 1
+        return counts
+
+    def observe(self):
+        """
+        Build the observation.
+
+        Returns:
+            np.ndarray: Observation laid out as VectorHatcheryEnv.OBSERVATION_FIELDS.
+        """
+        warehouse = self.hatchery.warehouse
+        return np.concatenate([
+            [self.hatchery.cash_balance],
+            [warehouse.main_stock[resource] for resource in RESOURCES],
+            [warehouse.aux_stock[resource] for resource in RESOURCES],
+            self.roster(),
+            [self.hatchery.labour_ledger.total_remaining, self.quarter]
+        ]).astype(float)
+
+    def _apply_hiring(self, hire):
+        """
+        Hire or release technicians per roster slot, ignoring changes that break the limits.
+
+        Args:
+            hire (array-like): Change in technicians per roster slot.
+        """
+        hire = np.asarray(hire, dtype=np.int64)
+        proposed = self.roster() + hire
+        total = proposed.sum()
+        # Ignore the whole change if it breaks the staffing limits, as main.py reprompts
+        if (proposed < 0).any() or not Technician.MIN_TECHNICIANS <= total <= Technician.MAX_TECHNICIANS:
+            return
+
+        technicians = self.hatchery.technicians
+        # Release before hiring, so a valid change never passes MAX_TECHNICIANS part-way
+        for slot, change in enumerate(hire):
+            specialisation = ROSTER_SLOTS[slot]
+            # Release the most recently hired technicians of this slot first
+            for _ in range(-change):
+                position = max(i for i, technician in enumerate(technicians)
+                               if technician.specialisation == specialisation)
+                technicians.pop(position)
+        for slot, change in enumerate(hire):
+            specialisation = ROSTER_SLOTS[slot]
+            for _ in range(change):
+                self._hired += 1
+                self.hatchery.add_technicians([(f"Technician {self._hired}", specialisation)])
+
+    def step(self, action):
+        """
+        Simulate one quarter.
+
+        Args:
+            action (dict): "hire", "sales" and "vendor" (see the class docstring).
+
+        Returns:
+            tuple: (observation, reward, done, info). The reward is the change in cash;
+            info holds "bankrupt" and "sold".
+        """
+        hatchery = self.hatchery
+        start_cash = hatchery.cash_balance
+
+        # Staffing, then a fresh quarter of labour
+        self._apply_hiring(action["hire"])
+        hatchery.start_new_quarter()
+
+        # Sales in the order main.py asks for them; failed sales sell nothing
+        sold = np.zeros(len(FISH_TYPES))
+        for f, fish_type in enumerate(FISH_TYPES):
+            quantity = int(min(max(action["sales"][f], 0), Hatchery.CUSTOMER_DEMAND[fish_type]["demand"]))
+            result = hatchery.sell_fish(fish_type, quantity)
+            if result["status"] == "success":
+                sold[f] = result["sell_quantity"]
+
+        # Wages, fixed cost, storage cost and depreciation
+        hatchery.pay_technicians()
+        hatchery.cash_balance -= Hatchery.FIXED_QUARTERLY_COST
+        hatchery.cash_balance -= hatchery.calculate_storage_costs()["total_storage_cost"]
+        hatchery.warehouse.calculate_depreciation()
+
+        # Restock with the chosen vendor
+        restock = hatchery.restock_resources(VENDORS[int(action["vendor"])])
+        bankrupt = restock["status"] == "bankrupt"
+
+        self.quarter += 1
+        done = bankrupt or self.quarter >= self.max_quarters
+        reward = hatchery.cash_balance - start_cash
+        return self.observe(), reward, done, {"bankrupt": bankrupt, "sold": sold}
@@ -0,0 +1,247 @@
+import heapq
+
+from Technician import Technician
+
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the LabourLedger class, which tracks the weeks of labour
+each technician has left in the current quarter. Sales are allocated to technicians
+greedily: specialists for the fish type first (at the 3:2 efficiency rate), then
+technicians without a specialisation, then specialists of other fish types. Priority
+queues keep each allocation step at O(log n) for n technicians.
+"""
+
+
+class LabourLedger:
+    """
+    The LabourLedger class records the remaining labour of every technician in a quarter
+    and allocates the maintenance work of each sale to individual technicians.
+
+    Attributes:
+        SPECIALIST_RATE (float): Weeks of standard work done in one specialist week (3:2).
+        TOLERANCE (float): Remaining labour below this is treated as zero.
+        technicians (list): Technician objects covered by the ledger.
+        remaining (list of float): Weeks of labour left for each technician.
+        total_remaining (float): Weeks of labour left over all technicians.
+        specialist_remaining (dict): Fish type mapped to the weeks left by its specialists.
+    """
+    SPECIALIST_RATE = 3 / 2  # One specialist week does 1.5 weeks of standard work
+    TOLERANCE = 1e-9
+
+    def __init__(self, technicians, weeks_per_technician=None):
+        """
+        Initialize the ledger with a full quarter of labour for every technician.
+
+        Args:
+            technicians (list of Technician): Technicians working this quarter.
+            weeks_per_technician (float or None): Weeks of labour each technician starts
+                with; defaults to Technician.LABOUR_PER_QUARTER.
+        """
+        # Use the standard labour per quarter unless told otherwise
+        weeks = Technician.get_quarterly_labour() if weeks_per_technician is None else weeks_per_technician
+
+        # Store the technicians and their remaining weeks (same order)
+        self.technicians = list(technicians)
+        self.remaining = [float(weeks)] * len(self.technicians)
+        self.total_remaining = float(weeks) * len(self.technicians)
+
+        # Track the total weeks left by the specialists of each fish type
+        self.specialist_remaining = {}
+
+        # Max-heaps of (-remaining weeks, technician index), one per fish type for its
+        # specialists and one for standard work, which prefers technicians without a
+        # specialisation so that specialists are kept for their own fish types
+        self._specialist_heaps = {}
+        self._standard_heap = []
+        for index, technician in enumerate(self.technicians):
+            if technician.specialisation is not None:
+                fish_type = technician.specialisation
+                self.specialist_remaining[fish_type] = self.specialist_remaining.get(fish_type, 0.0) + weeks
+                self._specialist_heaps.setdefault(fish_type, []).append((-weeks, index))
+            self._standard_heap.append(self._standard_key(index))
+        for heap in self._specialist_heaps.values():
+            heapq.heapify(heap)
+        heapq.heapify(self._standard_heap)
+
+    def _standard_key(self, index):
+        """
+        Build the standard-work heap entry of a technician from their remaining weeks.
+
+        Args:
+            index (int): Position of the technician in the ledger.
+
+        Returns:
+            tuple: (1 if specialised else 0, -remaining weeks, technician index).
+        """
+        # Technicians without a specialisation sort first, then the most remaining labour
+        return (0 if self.technicians[index].specialisation is None else 1, -self.remaining[index], index)
+
+    def quote(self, fish_type, base_weeks):
+        """
+        Work out the labour a sale needs without allocating it.
+
+        Args:
+            fish_type (str): Type of fish being sold.
+            base_weeks (float): Maintenance time of the sale at the standard rate.
+
+        Returns:
+            dict: Specialist weeks, standard weeks, total required weeks and whether the
+            remaining labour can cover them.
+        """
+        # Specialists of this fish type handle as much of the work as their weeks allow
+        specialist_capacity = self.specialist_remaining.get(fish_type, 0.0)
+        specialist_work = min(base_weeks, specialist_capacity * LabourLedger.SPECIALIST_RATE)
+        specialist_weeks = specialist_work / LabourLedger.SPECIALIST_RATE
+
+        # The rest is done at the standard rate by everyone else
+        standard_weeks = base_weeks - specialist_work
+        other_capacity = self.total_remaining - specialist_capacity
+
+        # Return the breakdown and whether it fits
+        return {
+            "specialist_weeks": specialist_weeks,
+            "standard_weeks": standard_weeks,
+            "required_labor": specialist_weeks + standard_weeks,
+            "feasible": standard_weeks <= other_capacity + LabourLedger.TOLERANCE
+        }
+
+    def _take(self, index, weeks):
+        """
+        Deduct weeks from one technician and refresh their heap entries.
+
+        Args:
+            index (int): Position of the technician in the ledger.
+            weeks (float): Weeks to deduct.
+        """
+        # Update the technician's remaining labour and the running totals
+        self.remaining[index] -= weeks
+        self.total_remaining -= weeks
+        fish_type = self.technicians[index].specialisation
+        if fish_type is not None:
+            self.specialist_remaining[fish_type] -= weeks
+
+        # Push fresh heap entries; older entries are skipped when popped (lazy deletion)
+        if self.remaining[index] > LabourLedger.TOLERANCE:
+            heapq.heappush(self._standard_heap, self._standard_key(index))
+            if fish_type is not None:
+                heapq.heappush(self._specialist_heaps[fish_type], (-self.remaining[index], index))
+
+    def _pop_current(self, heap, key_of):
+        """
+        Pop the best heap entry that still matches its technician's remaining labour.
+
+        Args:
+            heap (list): Heap to pop from.
+            key_of (callable): Builds the current entry of a technician from their index.
+
+        Returns:
+            int or None: Technician index, or None if no technician has labour left.
+        """
+        while heap:
+            entry = heapq.heappop(heap)
+            index = entry[-1]
+            # Skip stale entries and technicians with no labour left
+            if entry == key_of(index) and self.remaining[index] > LabourLedger.TOLERANCE:
+                return index
+        return None
+
+    def allocate(self, fish_type, base_weeks):
+        """
+        Allocate the labour of a sale to individual technicians.
+
+        Args:
+            fish_type (str): Type of fish being sold.
+            base_weeks (float): Maintenance time of the sale at the standard rate.
+
+        Returns:
+            dict: The quote for the sale plus "allocation", a list of
+            (technician name, weeks used) pairs, or the quote alone if the labour is
+            insufficient (nothing is deducted in that case).
+        """
+        # Check the sale fits before touching any technician
+        quote = self.quote(fish_type, base_weeks)
+        if not quote["feasible"]:
+            return quote
+
+        allocation = []
+
+        # Specialists first: each week of theirs covers 1.5 weeks of standard work
+        needed = quote["specialist_weeks"]
+        heap = self._specialist_heaps.get(fish_type, [])
+        while needed > LabourLedger.TOLERANCE:
+            index = self._pop_current(heap, lambda i: (-self.remaining[i], i))
+            if index is None:
+                break
+            weeks = min(needed, self.remaining[index])
+            self._take(index, weeks)
+            allocation.append((self.technicians[index].name, weeks))
+            needed -= weeks
+
+        # Then the remaining work at the standard rate
+        needed = quote["standard_weeks"]
+        while needed > LabourLedger.TOLERANCE:
+            index = self._pop_current(self._standard_heap, self._standard_key)
+            if index is None:
+                break
+            weeks = min(needed, self.remaining[index])
+            self._take(index, weeks)
+            allocation.append((self.technicians[index].name, weeks))
+            needed -= weeks
+
+        # Return the quote together with the per-technician allocation
+        quote["allocation"] = allocation
+        return quote
+
+    def add_technician(self, technician, weeks):
+        """
+        Add a technician part-way through the quarter.
+
+        Args:
+            technician (Technician): Technician joining the quarter.
+            weeks (float): Weeks of labour they can still provide this quarter.
+        """
+        # Append the technician and their labour to the ledger
+        self.technicians.append(technician)
+        self.remaining.append(float(weeks))
+        self.total_remaining += weeks
+        index = len(self.technicians) - 1
+
+        # Register the new labour with the heaps and the specialist totals
+        heapq.heappush(self._standard_heap, self._standard_key(index))
+        fish_type = technician.specialisation
+        if fish_type is not None:
+            self.specialist_remaining[fish_type] = self.specialist_remaining.get(fish_type, 0.0) + weeks
+            heapq.heappush(self._specialist_heaps.setdefault(fish_type, []), (-float(weeks), index))
+
+    def remove_technician(self, name):
+        """
+        Withdraw the remaining labour of a technician who leaves part-way through the quarter.
+
+        Args:
+            name (str): Name of the technician leaving.
+
+        Returns:
+            float: Weeks of labour the technician still had, or 0 if they were not found.
+        """
+        # Find the technician's position in the ledger
+        for index, technician in enumerate(self.technicians):
+            if technician.name == name and self.remaining[index] > 0:
+                weeks = self.remaining[index]
+                # Their heap entries become stale and are skipped when popped
+                self.remaining[index] = 0.0
+                self.total_remaining -= weeks
+                if technician.specialisation is not None:
+                    self.specialist_remaining[technician.specialisation] -= weeks
+                return weeks
+        return 0.0
+
+    def remaining_by_technician(self):
+        """
+        Retrieve the weeks each technician has left.
+
+        Returns:
+            dict: Technician name mapped to their remaining weeks.
+        """
+        # Pair every technician's name with their remaining labour
+        return {technician.name: weeks for technician, weeks in zip(self.technicians, self.remaining)}
@@ -0,0 +1,253 @@
+import numpy as np
+
+from VectorHatcheryEnv import (FISH_TYPES, RESOURCES, ROSTER_SLOTS, VENDORS, VectorHatcheryEnv,
+                               default_parameters)
+
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the SensitivityAnalysis class, which measures how the
+final cash balance and the risk of bankruptcy respond to every simulation constant
+(fish requirements and maintenance times, supplier prices, storage costs, depreciation
+rates, warehouse capacities, customer demand and prices, and technician wages). It uses
+a Morris elementary-effects design, and all of the perturbed runs are simulated together
+as one batch with VectorHatcheryEnv, each environment holding its own constants.
+"""
+
+
+def list_factors():
+    """
+    List every constant that is perturbed, with the parameter entry it maps to.
+
+    Returns:
+        list of tuple: (label, parameter name, index within the parameter array).
+    """
+    factors = []
+    requirement_keys = ["fertilizer_req", "feed_req", "salt_req"]
+    for f, fish in enumerate(FISH_TYPES):
+        for r, key in enumerate(requirement_keys):
+            factors.append((f"Fish.FISH_DATA[{fish}][{key}]", "fish_requirements", (f, r)))
+        factors.append((f"Fish.FISH_DATA[{fish}][maintenance_time]", "maintenance_weeks", (f,)))
+    for v, vendor in enumerate(VENDORS):
+        for r, resource in enumerate(RESOURCES):
+            factors.append((f"Supplier.PRICES[{vendor}][{resource}]", "vendor_prices", (v, r)))
+    for r, resource in enumerate(RESOURCES):
+        factors.append((f"Warehouse.COSTS[{resource}]", "storage_costs", (r,)))
+        factors.append((f"Warehouse.DEPRECIATION_RATES[{resource}]", "depreciation_rates", (r,)))
+        factors.append((f"Warehouse.CAPACITIES[{resource}][main]", "capacity_main", (r,)))
+        factors.append((f"Warehouse.CAPACITIES[{resource}][aux]", "capacity_aux", (r,)))
+    for f, fish in enumerate(FISH_TYPES):
+        factors.append((f"Hatchery.CUSTOMER_DEMAND[{fish}][demand]", "demand", (f,)))
+        factors.append((f"Hatchery.CUSTOMER_DEMAND[{fish}][price]", "price", (f,)))
+    factors.append(("Technician.WEEKLY_WAGE", "weekly_wage", ()))
+    return factors
+
+
+class SensitivityAnalysis:
+    """
+    The SensitivityAnalysis class runs a Morris screening of the simulation constants.
+
+    Every constant is scaled by a multiplier in [1 - spread, 1 + spread]. Each Morris
+    trajectory starts from a random point on a grid of multipliers and changes one
+    constant at a time, so the difference between consecutive runs is the elementary
+    effect of that constant.
+
+    Attributes:
+        LEVELS (int): Number of grid levels per multiplier.
+        spread (float): Largest relative change applied to a constant.
+        quarters (int): Quarters simulated per run.
+        roster (dict): Technicians hired in the first quarter per specialisation (None for none).
+        sales_fraction (float): Share of each fish type's demand the policy tries to sell.
+        vendor (str): Supplier used for restocking.
+        factors (list of tuple): Output of list_factors().
+    """
+    LEVELS = 4
+
+    def __init__(self, spread=0.2, quarters=8, roster=None, sales_fraction=0.5, vendor=VENDORS[0]):
+        """
+        Initialize the analysis and the fixed policy every run follows.
+
+        Args:
+            spread (float): Largest relative change applied to a constant (0.2 is +/-20%).
+            quarters (int): Quarters simulated per run.
+            roster (dict or None): Technicians hired in the first quarter, by specialisation;
+                defaults to two technicians without a specialisation.
+            sales_fraction (float): Share of each fish type's demand the policy tries to sell.
+            vendor (str): Supplier used for restocking.
+        """
+        self.spread = spread
+        self.quarters = quarters
+        self.roster = {None: 2} if roster is None else roster
+        self.sales_fraction = sales_fraction
+        self.vendor = vendor
+        self.factors = list_factors()
+
+    def design(self, trajectories, seed=None):
+        """
+        Build Morris trajectories on the multiplier grid.
+
+        Args:
+            trajectories (int): Number of trajectories.
+            seed (int or None): Seed for reproducible designs.
+
+        Returns:
+            tuple: (points of shape (trajectories, factors + 1, factors) in [0, 1], and the
+            factor changed at each step, of shape (trajectories, factors)).
+        """
+        rng = np.random.default_rng(seed)
+        k = len(self.factors)
+        levels = SensitivityAnalysis.LEVELS
+        delta = levels / (2 * (levels - 1))
+
+        # Start on the lower half of the grid and step up, or on the upper half and step down
+        upward = rng.random((trajectories, k)) < 0.5
+        start = rng.integers(0, levels // 2, size=(trajectories, k)) / (levels - 1)
+        start = np.where(upward, start, start + delta)
+        steps = np.where(upward, delta, -delta)
+
+        # Change the factors one at a time, in a random order per trajectory
+        order = np.argsort(rng.random((trajectories, k)), axis=1)
+        points = np.repeat(start[:, None, :], k + 1, axis=1)
+        rows = np.arange(trajectories)
+        for step in range(k):
+            changed = order[:, step]
+            points[:, step + 1:, :][rows, :, changed] += steps[rows, changed][:, None]
+        return points, order
+
+    def parameters(self, multipliers):
+        """
+        Build per-run constants from multipliers.
+
+        Args:
+            multipliers (np.ndarray): (runs, factors) multipliers of the base constants.
+
+        Returns:
+            dict: Parameter arrays for VectorHatcheryEnv, one row per run.
+        """
+        runs = multipliers.shape[0]
+        params = {name: np.repeat(value[None, ...], runs, axis=0).astype(float)
+                  for name, value in default_parameters().items()}
+        for column, (_, name, index) in enumerate(self.factors):
+            params[name][(slice(None),) + index] *= multipliers[:, column]
+        # Customers buy whole fish
+        params["demand"] = np.floor(params["demand"])
+        return params
+
+    def simulate(self, multipliers):
+        """
+        Simulate every run in one vectorised batch under the fixed policy.
+
+        Args:
+            multipliers (np.ndarray): (runs, factors) multipliers of the base constants.
+
+        Returns:
+            tuple: (final cash per run, True where the run went bankrupt).
+        """
+        runs = multipliers.shape[0]
+        params = self.parameters(multipliers)
+        env = VectorHatcheryEnv(runs, max_quarters=self.quarters, params=params)
+
+        hire = np.zeros((runs, len(ROSTER_SLOTS)), dtype=np.int64)
+        for specialisation, count in self.roster.items():
+            hire[:, ROSTER_SLOTS.index(specialisation)] = count
+        actions = {
+            "hire": hire,
+            "sales": np.floor(params["demand"] * self.sales_fraction),
+            "vendor": np.full(runs, VENDORS.index(self.vendor))
+        }
+
+        final_cash = np.full(runs, np.nan)
+        bankrupt = np.zeros(runs, dtype=bool)
+        finished = np.zeros(runs, dtype=bool)
+        for quarter in range(self.quarters):
+            _, _, dones, info = env.step(actions)
+            # Keep the outcome of each run's first episode; later episodes are auto-resets
+            first = dones & ~finished
+            final_cash[first] = info["final_cash"][first]
+            bankrupt[first] = info["bankrupt"][first]
+            finished |= dones
+            if quarter == 0:
+                actions["hire"] = np.zeros_like(hire)
+        return final_cash, bankrupt
+
+    def run(self, trajectories=20, seed=None):
+        """
+        Run the Morris screening.
+
+        Args:
+            trajectories (int): Number of trajectories (runs = trajectories x (factors + 1)).
+            seed (int or None): Seed for reproducible designs.
+
+        Returns:
+            dict: "baseline_cash", "bankruptcy_risk" (share of all runs that went bankrupt),
+            "runs" and "factors", a list of per-factor results sorted by mu_star with
+            "mu" and "mu_star" (mean and mean absolute effect on final cash of a change
+            from the lowest to the highest multiplier), "sigma", "elasticity" (percentage
+            change in final cash per percentage change in the constant) and
+            "bankruptcy_effect" (mean change in bankruptcy probability per such change).
+        """
+        k = len(self.factors)
+        points, order = self.design(trajectories, seed)
+        multipliers = 1 - self.spread + 2 * self.spread * points
+
+        # The baseline run goes first, then every design point, all in one batch
+        batch = np.concatenate([np.ones((1, k)), multipliers.reshape(-1, k)])
+        cash, bankrupt = self.simulate(batch)
+        baseline = cash[0]
+        cash = cash[1:].reshape(trajectories, k + 1)
+        bankrupt = bankrupt[1:].reshape(trajectories, k + 1).astype(float)
+
+        # Elementary effects, scaled to a change across the whole multiplier range
+        moved = np.diff(multipliers, axis=1)[np.arange(trajectories)[:, None], np.arange(k), order]
+        scale = 2 * self.spread / moved
+        cash_effects = np.empty((trajectories, k))
+        risk_effects = np.empty((trajectories, k))
+        rows = np.arange(trajectories)[:, None]
+        cash_effects[rows, order] = np.diff(cash, axis=1) * scale
+        risk_effects[rows, order] = np.diff(bankrupt, axis=1) * scale
+
+        results = []
+        for column, (label, _, _) in enumerate(self.factors):
+            mu = cash_effects[:, column].mean()
+            results.append({
+                "factor": label,
+                "mu": mu,
+                "mu_star": np.abs(cash_effects[:, column]).mean(),
+                "sigma": cash_effects[:, column].std(ddof=1) if trajectories > 1 else 0.0,
+                # d(cash)/d(multiplier) is the change per relative change in the constant
+                "elasticity": mu / (2 * self.spread) / abs(baseline) if baseline else np.nan,
+                "bankruptcy_effect": risk_effects[:, column].mean()
+            })
+        results.sort(key=lambda result: result["mu_star"], reverse=True)
+        return {
+            "baseline_cash": baseline,
+            "bankruptcy_risk": bankrupt.mean(),
+            "runs": batch.shape[0],
+            "factors": results
+        }
+
+    @staticmethod
+    def format_report(result, top=15):
+        """
+        Format the most influential factors as a text table.
+
+        Args:
+            result (dict): Output of run().
+            top (int): Number of factors to show.
+
+        Returns:
+            str: The table.
+        """
+        lines = [
+            f"Baseline final cash: {result['baseline_cash']:.2f}, bankruptcy risk over "
+            f"{result['runs']} runs: {result['bankruptcy_risk']:.1%}",
+            f"{'Factor':55} {'mu*':>12} {'mu':>12} {'sigma':>12} {'elast.':>8} {'d(risk)':>8}"
+        ]
+        for factor in result["factors"][:top]:
+            lines.append(f"{factor['factor']:55} {factor['mu_star']:12.2f} {factor['mu']:12.2f} "
+                         f"{factor['sigma']:12.2f} {factor['elasticity']:8.3f} {factor['bankruptcy_effect']:8.3f}")
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(SensitivityAnalysis.format_report(SensitivityAnalysis().run(seed=0)))
@@ -0,0 +1,199 @@
+from array import array
+
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the StockLots class, which stores the stock of one
+resource in one warehouse as lots, each with the quarter it was bought in and its unit
+cost. Lots sit in a ring buffer of typed arrays and are used first in, first out.
+Depreciation multiplies one shared scale factor rather than every lot, and spoiled lots
+are always the oldest, so every operation only touches the lots it uses or removes.
+"""
+
+
+class StockLots:
+    """
+    The StockLots class is a FIFO queue of stock lots held in a ring buffer.
+
+    Lot amounts are stored divided by the scale factor in force when they were added, so
+    depreciation of every lot is a single multiplication of the scale factor.
+
+    Attributes:
+        INITIAL_SIZE (int): Number of lots the buffer holds before it first grows.
+        TOLERANCE (float): Amounts below this are treated as zero.
+        RESCALE_BELOW (float): Scale factor below which stored amounts are renormalised.
+        scale (float): Depreciation applied since the stored amounts were last normalised.
+        total (float): Current amount over all lots.
+    """
+    INITIAL_SIZE = 4
+    TOLERANCE = 1e-9
+    RESCALE_BELOW = 1e-12
+
+    def __init__(self):
+        """
+        Initialize an empty buffer.
+        """
+        # Parallel arrays of lot data, with the oldest lot at _head
+        self._quarter = array("i", [0]) * StockLots.INITIAL_SIZE
+        self._amount = array("d", [0.0]) * StockLots.INITIAL_SIZE  # Stored amount (current amount / scale)
+        self._cost = array("d", [0.0]) * StockLots.INITIAL_SIZE  # Price paid per unit
+        self._head = 0
+        self._count = 0
+
+        # Shared depreciation factor and running total
+        self.scale = 1.0
+        self.total = 0.0
+
+    def __len__(self):
+        """
+        Count the lots held.
+
+        Returns:
+            int: Number of lots.
+        """
+        return self._count
+
+    def _grow(self):
+        """
+        Double the buffer, moving the lots to the start of the new arrays in FIFO order.
+        """
+        for name in ("_quarter", "_amount", "_cost"):
+            old = getattr(self, name)
+            # The buffer is full, so the lots run from _head to the end and then wrap around
+            new = old[self._head:] + old[:self._head]
+            new.extend(old[:1] * len(old))
+            setattr(self, name, new)
+        self._head = 0
+
+    def _pop(self):
+        """
+        Remove the oldest lot.
+        """
+        self._head = (self._head + 1) % len(self._amount)
+        self._count -= 1
+        # Reset the total exactly once the buffer is empty so rounding errors cannot build up
+        if self._count == 0:
+            self.total = 0.0
+
+    def add(self, amount, quarter, unit_cost):
+        """
+        Add a new lot behind the existing ones.
+
+        Args:
+            amount (float): Amount bought.
+            quarter (int): Quarter the lot was bought in.
+            unit_cost (float): Price paid per unit.
+        """
+        if amount <= StockLots.TOLERANCE:
+            return
+        if self._count == len(self._amount):
+            self._grow()
+
+        # Store the lot relative to the current scale factor
+        position = (self._head + self._count) % len(self._amount)
+        self._quarter[position] = quarter
+        self._amount[position] = amount / self.scale
+        self._cost[position] = unit_cost
+        self._count += 1
+        self.total += amount
+
+    def take(self, amount):
+        """
+        Use stock from the oldest lots first.
+
+        Args:
+            amount (float): Amount to use.
+
+        Returns:
+            tuple: (amount taken, purchase cost of the amount taken at the lots' prices).
+            Less than the amount asked for is taken if the lots run out.
+        """
+        taken = 0.0
+        cost = 0.0
+        while amount - taken > StockLots.TOLERANCE and self._count:
+            # Use as much of the oldest lot as needed
+            head = self._head
+            available = self._amount[head] * self.scale
+            used = min(available, amount - taken)
+            cost += used * self._cost[head]
+            taken += used
+            self.total -= used
+
+            # Remove the lot once it is used up
+            if available - used <= StockLots.TOLERANCE:
+                self._pop()
+            else:
+                self._amount[head] -= used / self.scale
+        return taken, cost
+
+    def decay(self, factor):
+        """
+        Multiply the amount of every lot by a factor.
+
+        Args:
+            factor (float): Share of the stock that remains (1 - depreciation rate).
+        """
+        if factor <= 0:
+            self.clear()
+            return
+        self.scale *= factor
+        self.total *= factor
+
+        # Renormalise rarely so the stored amounts never overflow
+        if self.scale < StockLots.RESCALE_BELOW:
+            self._normalise()
+
+    def _normalise(self):
+        """
+        Fold the scale factor into the stored amounts.
+        """
+        size = len(self._amount)
+        for offset in range(self._count):
+            position = (self._head + offset) % size
+            self._amount[position] *= self.scale
+        self.scale = 1.0
+
+    def expire(self, oldest_quarter):
+        """
+        Remove the lots bought before a quarter.
+
+        Args:
+            oldest_quarter (int): Lots bought before this quarter have spoiled.
+
+        Returns:
+            float: Amount spoiled.
+        """
+        spoiled = 0.0
+        # Lots are added in time order, so the spoiled lots are at the front
+        while self._count and self._quarter[self._head] < oldest_quarter:
+            amount = self._amount[self._head] * self.scale
+            spoiled += amount
+            self.total -= amount
+            self._pop()
+        return spoiled
+
+    def clear(self):
+        """
+        Remove every lot.
+        """
+        self._head = 0
+        self._count = 0
+        self.scale = 1.0
+        self.total = 0.0
+
+    def lots(self):
+        """
+        List the lots from oldest to newest.
+
+        Returns:
+            list of dict: Quarter bought, current amount and unit cost of each lot.
+        """
+        lots = []
+        for offset in range(self._count):
+            position = (self._head + offset) % len(self._amount)
+            lots.append({
+                "quarter": self._quarter[position],
+                "amount": self._amount[position] * self.scale,
+                "unit_cost": self._cost[position]
+            })
+        return lots
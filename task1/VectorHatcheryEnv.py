@@ -0,0 +1,350 @@
+import numpy as np
+
+from Fish import Fish
+from Hatchery import Hatchery
+from LabourLedger import LabourLedger
+from StockLots import StockLots
+from Supplier import Supplier
+from Technician import Technician
+from Warehouse import Warehouse
+
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the VectorHatcheryEnv class, which runs N independent
+hatcheries side by side with NumPy arrays, one quarter per step. It follows the same
+quarterly rules as main.py and HatcheryEnv (staffing, sales with specialists first at
+the 3:2 rate, wages, fixed and storage costs, depreciation and restocking), but every
+rule is applied to all environments in one array operation. Labour is tracked per
+technician in hiring order and allocated in the same order as LabourLedger, so the
+observations match HatcheryEnv's (see tests/test_vector_env.py). Environments that go
+bankrupt or reach the last quarter are reset automatically. The simulation constants
+are stored per environment, so batches of perturbed runs can be evaluated together.
+"""
+
+# Order of the resources, roster slots and observation entries used by the arrays
+RESOURCES = ["fertiliser", "feed", "salt"]
+FISH_TYPES = list(Hatchery.CUSTOMER_DEMAND)
+ROSTER_SLOTS = [None] + FISH_TYPES  # Slot 0 holds technicians without a specialisation
+VENDORS = list(Supplier.PRICES)
+OBSERVATION_FIELDS = (
+    ["cash"]
+    + [f"main_{resource}" for resource in RESOURCES]
+    + [f"aux_{resource}" for resource in RESOURCES]
+    + [f"roster_{slot or 'none'}" for slot in ROSTER_SLOTS]
+    + ["labour", "quarter"]
+)
+
+
+def default_parameters():
+    """
+    Collect the simulation constants from the hatchery classes as arrays.
+
+    Returns:
+        dict: Arrays of the constants, without the environment axis.
+    """
+    # Resource requirements per fish use the same keys as Fish.calculate_resource_needs
+    requirement_keys = ["fertilizer_req", "feed_req", "salt_req"]
+    return {
+        "initial_cash": np.array(10000.0),
+        "fish_requirements": np.array([[Fish.FISH_DATA[fish][key] for key in requirement_keys]
+                                       for fish in FISH_TYPES], dtype=float),
+        "maintenance_weeks": np.array([Fish.get_maintenance_time(fish) for fish in FISH_TYPES]),
+        "demand": np.array([Hatchery.CUSTOMER_DEMAND[fish]["demand"] for fish in FISH_TYPES], dtype=float),
+        "price": np.array([Hatchery.CUSTOMER_DEMAND[fish]["price"] for fish in FISH_TYPES], dtype=float),
+        "vendor_prices": np.array([[Supplier.PRICES[vendor][resource] for resource in RESOURCES]
+                                   for vendor in VENDORS]),
+        "storage_costs": np.array([Warehouse.COSTS[resource] for resource in RESOURCES], dtype=float),
+        "depreciation_rates": np.array([Warehouse.DEPRECIATION_RATES[resource] for resource in RESOURCES]),
+        "capacity_main": np.array([Warehouse.CAPACITIES[resource]["main"] for resource in RESOURCES], dtype=float),
+        "capacity_aux": np.array([Warehouse.CAPACITIES[resource]["aux"] for resource in RESOURCES], dtype=float),
+        "weekly_wage": np.array(float(Technician.WEEKLY_WAGE)),
+        "labour_per_quarter": np.array(float(Technician.LABOUR_PER_QUARTER)),
+        "fixed_cost": np.array(float(Hatchery.FIXED_QUARTERLY_COST)),
+    }
+
+
+class VectorHatcheryEnv:
+    """
+    The VectorHatcheryEnv class steps N hatchery simulations at once.
+
+    Actions are a dict of arrays:
+        "hire": (N, 7) change in the number of technicians per roster slot (slot 0 has no
+            specialisation, slots 1-6 follow Hatchery.CUSTOMER_DEMAND). A change that would
+            take the roster outside Technician.MIN/MAX_TECHNICIANS is ignored, like main.py.
+        "sales": (N, 6) quantities to sell, in Hatchery.CUSTOMER_DEMAND order.
+        "vendor": (N,) index of the vendor in Supplier.PRICES used for restocking.
+
+    Observations are (N, len(OBSERVATION_FIELDS)) float arrays.
+
+    Attributes:
+        WAGE_WEEKS (int): Weeks of wages paid per quarter.
+        num_envs (int): Number of environments.
+        max_quarters (int): Quarters per episode.
+        params (dict): Simulation constants, each with a leading environment axis.
+        cash (np.ndarray): Cash balance per environment.
+        main_stock (np.ndarray): (N, 3) main warehouse stock.
+        aux_stock (np.ndarray): (N, 3) auxiliary warehouse stock.
+        roster (np.ndarray): (N, 7) technicians per roster slot.
+        staff (np.ndarray): (N, MAX_TECHNICIANS) roster slot of each technician in hiring
+            order (the order of Hatchery.technicians), -1 for unused positions.
+        labour (np.ndarray): Labour weeks left at the end of the last quarter.
+        quarter (np.ndarray): Quarters completed in the current episode.
+    """
+    WAGE_WEEKS = 12
+
+    def __init__(self, num_envs, max_quarters=8, params=None):
+        """
+        Initialize the environments.
+
+        Args:
+            num_envs (int): Number of environments.
+            max_quarters (int): Quarters per episode (main.py allows up to 8).
+            params (dict or None): Overrides of default_parameters(); each value may hold a
+                leading axis of length num_envs to give every environment its own constants.
+        """
+        self.num_envs = num_envs
+        self.max_quarters = max_quarters
+
+        # Give every constant a leading environment axis
+        params = dict(default_parameters(), **(params or {}))
+        defaults = default_parameters()
+        self.params = {}
+        for name, value in params.items():
+            value = np.asarray(value, dtype=float)
+            shape = defaults[name].shape
+            if value.shape == shape:
+                value = np.broadcast_to(value, (num_envs,) + shape)
+            self.params[name] = np.ascontiguousarray(value)
+
+        self.reset()
+
+    def reset(self, mask=None):
+        """
+        Reset all environments, or only those selected by a mask.
+
+        Args:
+            mask (np.ndarray or None): Boolean array of environments to reset.
+
+        Returns:
+            np.ndarray: Observations of all environments.
+        """
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+            # Allocate the state arrays on the first reset
+            self.cash = np.zeros(self.num_envs)
+            self.main_stock = np.zeros((self.num_envs, len(RESOURCES)))
+            self.aux_stock = np.zeros((self.num_envs, len(RESOURCES)))
+            self.roster = np.zeros((self.num_envs, len(ROSTER_SLOTS)), dtype=np.int64)
+            self.staff = np.full((self.num_envs, Technician.MAX_TECHNICIANS), -1, dtype=np.int64)
+            self.labour = np.zeros(self.num_envs)
+            self.quarter = np.zeros(self.num_envs, dtype=np.int64)
+
+        # A new hatchery starts with full warehouses and no technicians
+        self.cash[mask] = self.params["initial_cash"][mask]
+        self.main_stock[mask] = self.params["capacity_main"][mask]
+        self.aux_stock[mask] = self.params["capacity_aux"][mask]
+        self.roster[mask] = 0
+        self.staff[mask] = -1
+        self.labour[mask] = 0.0
+        self.quarter[mask] = 0
+        return self.observe()
+
+    def observe(self):
+        """
+        Build the observation array.
+
+        Returns:
+            np.ndarray: (N, len(OBSERVATION_FIELDS)) observations.
+        """
+        return np.concatenate([
+            self.cash[:, None], self.main_stock, self.aux_stock, self.roster,
+            self.labour[:, None], self.quarter[:, None]
+        ], axis=1)
+
+    def _apply_hiring(self, hire):
+        """
+        Apply roster changes, ignoring any that break the staffing limits.
+
+        As in HatcheryEnv, releases come before hires: the most recently hired technicians
+        of a slot leave first, then new technicians join the end of the staff, slot by slot.
+
+        Args:
+            hire (np.ndarray): (N, 7) change per roster slot.
+        """
+        hire = np.asarray(hire, dtype=np.int64)
+        proposed = self.roster + hire
+        total = proposed.sum(axis=1)
+        valid = ((proposed >= 0).all(axis=1) & (total >= Technician.MIN_TECHNICIANS)
+                 & (total <= Technician.MAX_TECHNICIANS))
+        change = np.where(valid[:, None], hire, 0)
+
+        positions = np.arange(self.staff.shape[1])
+        rows = np.arange(self.num_envs)
+        for slot in range(len(ROSTER_SLOTS)):
+            for _ in range(max(0, -change[:, slot].min())):
+                release = change[:, slot] < 0
+                # Close the gap left by the last technician of this slot
+                last = np.where(self.staff == slot, positions, -1).max(axis=1)
+                shifted = np.concatenate([self.staff[:, 1:], np.full((self.num_envs, 1), -1)], axis=1)
+                gap = release[:, None] & (positions >= last[:, None])
+                self.staff = np.where(gap, shifted, self.staff)
+                change[release, slot] += 1
+        for slot in range(len(ROSTER_SLOTS)):
+            for _ in range(max(0, change[:, slot].max())):
+                join = change[:, slot] > 0
+                self.staff[rows[join], (self.staff[join] >= 0).sum(axis=1)] = slot
+                change[join, slot] -= 1
+        self.roster[valid] = proposed[valid]
+
+    def _allocate(self, labour, eligible, needed):
+        """
+        Take labour from technicians as LabourLedger does: repeatedly from the eligible
+        technician with the most weeks left (the earliest hired on ties).
+
+        Args:
+            labour (np.ndarray): (N, MAX_TECHNICIANS) weeks left per technician, updated in place.
+            eligible (np.ndarray): (N, MAX_TECHNICIANS) technicians that may do the work.
+            needed (np.ndarray): (N,) weeks to take.
+
+        Returns:
+            np.ndarray: (N,) weeks the eligible technicians could not cover.
+        """
+        # Each pass either covers an environment's need or uses up one technician, so
+        # only the environments still needing labour are visited
+        unmet = np.zeros(self.num_envs)
+        rows = np.flatnonzero(needed > LabourLedger.TOLERANCE)
+        needed = needed[rows]
+        for _ in range(labour.shape[1]):
+            if rows.size == 0:
+                break
+            left = labour[rows]
+            candidates = np.where(eligible[rows] & (left > LabourLedger.TOLERANCE), left, -np.inf)
+            pick = candidates.argmax(axis=1)
+            available = candidates[np.arange(rows.size), pick]
+            take = np.where(np.isfinite(available), np.minimum(needed, available), 0.0)
+            labour[rows, pick] -= take
+            needed -= take
+            unmet[rows] = needed
+            more = (needed > LabourLedger.TOLERANCE) & np.isfinite(available)
+            rows, needed = rows[more], needed[more]
+        return unmet
+
+    def _sell(self, sales):
+        """
+        Attempt every sale in Hatchery.CUSTOMER_DEMAND order for all environments.
+
+        Each sale follows Hatchery.sell_fish: it succeeds only if both the labour and the
+        resources cover it, otherwise nothing is sold. Labour is allocated per technician
+        as in LabourLedger: specialists of the fish type first, then standard-rate work
+        from technicians without a specialisation, then from specialists, each time from
+        whoever has the most weeks left.
+
+        Args:
+            sales (np.ndarray): (N, 6) requested quantities.
+
+        Returns:
+            tuple: (revenue per environment, (N, 6) quantities sold).
+        """
+        p = self.params
+        rate = LabourLedger.SPECIALIST_RATE
+        # Remaining labour per technician for this quarter
+        labour = np.where(self.staff >= 0, p["labour_per_quarter"][:, None], 0.0)
+        quantity = np.minimum(np.maximum(np.asarray(sales, dtype=float), 0), p["demand"])
+        sold = np.zeros_like(quantity)
+        revenue = np.zeros(self.num_envs)
+
+        for f in range(len(FISH_TYPES)):
+            q = quantity[:, f]
+            base = q * p["maintenance_weeks"][:, f]
+            own = self.staff == f + 1
+            specialists = (labour * own).sum(axis=1)
+            specialist_work = np.minimum(base, specialists * rate)
+            specialist_weeks = specialist_work / rate
+            standard = base - specialist_work
+            labour_ok = standard <= labour.sum(axis=1) - specialists + LabourLedger.TOLERANCE
+
+            need = q[:, None] * p["fish_requirements"][:, f]
+            stock_ok = (self.main_stock + self.aux_stock + StockLots.TOLERANCE >= need).all(axis=1)
+            ok = (q > 0) & labour_ok & stock_ok
+
+            # The specialists' weeks, then standard work: technicians without a
+            # specialisation first, then specialists
+            self._allocate(labour, own, np.where(ok, specialist_weeks, 0.0))
+            unmet = self._allocate(labour, self.staff == 0, np.where(ok, standard, 0.0))
+            self._allocate(labour, self.staff > 0, unmet)
+
+            # Take resources from the main warehouse first, then the auxiliary one
+            need = np.where(ok[:, None], need, 0.0)
+            from_main = np.minimum(self.main_stock, need)
+            self.main_stock -= from_main
+            self.aux_stock = np.maximum(0.0, self.aux_stock - (need - from_main))
+
+            sold[:, f] = np.where(ok, q, 0.0)
+            revenue += sold[:, f] * p["price"][:, f]
+
+        self.labour = labour.sum(axis=1)
+        return revenue, sold
+
+    def _restock(self, vendor):
+        """
+        Restock both warehouses to capacity, resource by resource, as Warehouse.restock_to_full does.
+
+        Args:
+            vendor (np.ndarray): (N,) vendor index per environment.
+
+        Returns:
+            np.ndarray: True where the environment could not pay (bankrupt).
+        """
+        p = self.params
+        prices = p["vendor_prices"][np.arange(self.num_envs), np.asarray(vendor, dtype=np.int64)]
+        bankrupt = np.zeros(self.num_envs, dtype=bool)
+        for r in range(len(RESOURCES)):
+            for stock, capacity in ((self.main_stock, p["capacity_main"]), (self.aux_stock, p["capacity_aux"])):
+                cost = prices[:, r] * (capacity[:, r] - stock[:, r])
+                pay = ~bankrupt & (self.cash >= cost)
+                bankrupt |= ~bankrupt & ~pay
+                self.cash -= np.where(pay, cost, 0.0)
+                stock[:, r] = np.where(pay, capacity[:, r], stock[:, r])
+        return bankrupt
+
+    def step(self, actions):
+        """
+        Simulate one quarter in every environment.
+
+        Args:
+            actions (dict): "hire", "sales" and "vendor" arrays (see the class docstring).
+
+        Returns:
+            tuple: (observations, rewards, dones, info). Rewards are the change in cash.
+            Finished environments are reset, so their observation is the first of a new
+            episode; info holds "final_cash" (NaN where not done), "bankrupt" and "sold".
+        """
+        p = self.params
+        start_cash = self.cash.copy()
+
+        self._apply_hiring(actions["hire"])
+        revenue, sold = self._sell(actions["sales"])
+        self.cash += revenue
+
+        # Wages, fixed costs and storage costs, in the order of main.py
+        technicians = self.roster.sum(axis=1)
+        self.cash -= technicians * p["weekly_wage"] * VectorHatcheryEnv.WAGE_WEEKS
+        self.cash -= p["fixed_cost"]
+        self.cash -= ((self.main_stock + self.aux_stock) * p["storage_costs"]).sum(axis=1)
+
+        # Depreciation scales every lot alike, so pooled stock is enough here (lots only
+        # matter with a Warehouse.SHELF_LIFE, which this vectorised model does not apply)
+        keep = 1 - p["depreciation_rates"]
+        self.main_stock = self.main_stock * keep
+        self.aux_stock = self.aux_stock * keep
+
+        bankrupt = self._restock(actions["vendor"])
+        self.quarter += 1
+        rewards = self.cash - start_cash
+        dones = bankrupt | (self.quarter >= self.max_quarters)
+
+        info = {"final_cash": np.where(dones, self.cash, np.nan), "bankrupt": bankrupt, "sold": sold}
+        if dones.any():
+            self.reset(dones)
+        return self.observe(), rewards, dones, info
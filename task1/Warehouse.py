@@ -4,8 +4,11 @@ Section: Data Science
 Description: This file contains the Warehouse class, which manages stock levels,
 depreciation, storage costs, and resource restocking for the hatchery. It interacts with
 the Supplier class to handle pricing and ensures resource availability for operations.
+Stock is held as lots (see StockLots) that record the quarter and price they were bought
+at, and lots are used first in, first out.
 """
 
+from StockLots import StockLots
 from Supplier import Supplier
 
 class Warehouse:
@@ -19,8 +22,15 @@ class Warehouse:
         DEPRECIATION_RATES (dict): Static dictionary defining depreciation rates for each
         resource type.
         COSTS (dict): Static dictionary defining storage costs per unit for each resource.
+        SHELF_LIFE (dict): Static dictionary defining the quarters a lot of each resource
+        keeps before it spoils completely (None for no limit).
+        quarter (int): Quarters completed, used to date new lots.
+        main_lots (dict): StockLots of each resource in the main warehouse.
+        aux_lots (dict): StockLots of each resource in the auxiliary warehouse.
         main_stock (dict): Current stock levels in the main warehouse.
         aux_stock (dict): Current stock levels in the auxiliary warehouse.
+        used_cost (dict): Purchase cost of the stock of each resource used so far.
+        spoiled (dict): Amount of each resource lost to spoilage so far.
     """
     # Static data for warehouse capacities, depreciation rates, and costs
     CAPACITIES = {
@@ -41,26 +51,115 @@ class Warehouse:
         "salt": 1  # Storage cost per kg
     }
 
+    SHELF_LIFE = {
+        "fertiliser": None,  # Quarters before a lot spoils completely (None for no limit)
+        "feed": None,
+        "salt": None
+    }
+
     def __init__(self):
         """
         Initialize the Warehouse with full stock capacities for both main and auxiliary warehouses.
         """
-        # Set initial stock levels to the full capacity for the main warehouse
-        self.main_stock = {
-            "fertiliser": Warehouse.CAPACITIES["fertiliser"]["main"],
-            "feed": Warehouse.CAPACITIES["feed"]["main"],
-            "salt": Warehouse.CAPACITIES["salt"]["main"]
-        }
-        # Set initial stock levels to the full capacity for the auxiliary warehouse
-        self.aux_stock = {
-            "fertiliser": Warehouse.CAPACITIES["fertiliser"]["aux"],
-            "feed": Warehouse.CAPACITIES["feed"]["aux"],
-            "salt": Warehouse.CAPACITIES["salt"]["aux"]
-        }
+        self.quarter = 0
+
+        # One lot queue per resource in each warehouse
+        self.main_lots = {resource: StockLots() for resource in Warehouse.CAPACITIES}
+        self.aux_lots = {resource: StockLots() for resource in Warehouse.CAPACITIES}
+
+        # Stock levels are the totals of the lots, kept up to date after every change
+        self.main_stock = {}
+        self.aux_stock = {}
+        self.used_cost = {resource: 0.0 for resource in Warehouse.CAPACITIES}
+        self.spoiled = {resource: 0.0 for resource in Warehouse.CAPACITIES}
+
+        # Start both warehouses full, with the initial stock as free lots of quarter 0
+        for resource, capacity in Warehouse.CAPACITIES.items():
+            self.main_lots[resource].add(capacity["main"], self.quarter, 0.0)
+            self.aux_lots[resource].add(capacity["aux"], self.quarter, 0.0)
+            self._update_stock(resource)
+
+    def _update_stock(self, resource):
+        """
+        Copy the lot totals of a resource into the stock level dictionaries.
+
+        Args:
+            resource (str): Type of resource.
+        """
+        self.main_stock[resource] = float(self.main_lots[resource].total)
+        self.aux_stock[resource] = float(self.aux_lots[resource].total)
+
+    def receive(self, resource, warehouse, amount, unit_cost):
+        """
+        Add a new lot of a resource, up to the warehouse's capacity.
+
+        Args:
+            resource (str): Type of resource.
+            warehouse (str): "main" or "aux".
+            amount (float): Amount delivered.
+            unit_cost (float): Price paid per unit.
+
+        Returns:
+            float: Amount stored (the rest does not fit).
+        """
+        lots = self.main_lots[resource] if warehouse == "main" else self.aux_lots[resource]
+        # Never exceed the capacity of the warehouse
+        amount = min(amount, Warehouse.CAPACITIES[resource][warehouse] - lots.total)
+        lots.add(amount, self.quarter, unit_cost)
+        self._update_stock(resource)
+        return max(0, amount)
+
+    def decay(self, resource, factor):
+        """
+        Multiply every lot of a resource in both warehouses by a factor.
+
+        Args:
+            resource (str): Type of resource.
+            factor (float): Share of the stock that remains.
+        """
+        self.main_lots[resource].decay(factor)
+        self.aux_lots[resource].decay(factor)
+        self._update_stock(resource)
+
+    def advance_quarter(self):
+        """
+        Move on to the next quarter and remove the lots that have passed their shelf life.
+
+        Returns:
+            dict: Amount of each resource spoiled.
+        """
+        self.quarter += 1
+        spoiled = {}
+        for resource, shelf_life in Warehouse.SHELF_LIFE.items():
+            spoiled[resource] = 0.0
+            if shelf_life is None:
+                continue
+            # Lots bought shelf_life or more quarters ago spoil
+            oldest_quarter = self.quarter - shelf_life + 1
+            spoiled[resource] += self.main_lots[resource].expire(oldest_quarter)
+            spoiled[resource] += self.aux_lots[resource].expire(oldest_quarter)
+            self.spoiled[resource] += spoiled[resource]
+            self._update_stock(resource)
+        return spoiled
+
+    def get_lots(self, resource, warehouse="main"):
+        """
+        Retrieve the lots of a resource from oldest to newest.
+
+        Args:
+            resource (str): Type of resource.
+            warehouse (str): "main" or "aux".
+
+        Returns:
+            list of dict: Quarter bought, current amount and unit cost of each lot.
+        """
+        lots = self.main_lots[resource] if warehouse == "main" else self.aux_lots[resource]
+        return lots.lots()
 
     def calculate_depreciation(self):
         """
-        Apply depreciation rates to each resource in both main and auxiliary stocks.
+        Apply depreciation rates to each resource in both main and auxiliary stocks, then
+        age the lots by one quarter and remove those past their shelf life.
 
         Returns:
             tuple: Updated main and auxiliary stock levels after applying depreciation.
@@ -69,15 +168,11 @@ class Warehouse:
             # Get the depreciation rate for the resource
             depreciation_rate = Warehouse.DEPRECIATION_RATES.get(resource, 0)
 
-            # Apply depreciation to main stock
-            depreciated_amount_main = self.main_stock[resource] * (1 - depreciation_rate)
-            # Ensure stock does not go below zero
-            self.main_stock[resource] = max(0, round(depreciated_amount_main))
+            # Apply depreciation to every lot in both warehouses at once
+            self.decay(resource, 1 - depreciation_rate)
 
-            # Apply depreciation to auxiliary stock
-            depreciated_amount_aux = self.aux_stock[resource] * (1 - depreciation_rate)
-            # Ensure stock does not go below zero
-            self.aux_stock[resource] = max(0, round(depreciated_amount_aux))
+        # Age the lots and remove spoiled ones
+        self.advance_quarter()
 
         # Return the updated stock levels
         return self.main_stock, self.aux_stock
@@ -97,16 +192,14 @@ class Warehouse:
         # Calculate the total available stock (main + auxiliary)
         total_available = self.main_stock.get(resource, 0) + self.aux_stock.get(resource, 0)
 
-        # Check if the total available stock is sufficient
-        if total_available >= amount_required:
-            # Deduct from the main stock first
-            if self.main_stock[resource] >= amount_required:
-                self.main_stock[resource] -= amount_required
-            else:
-                # Deduct the remainder from auxiliary stock if main stock is insufficient
-                amount_needed_from_aux = amount_required - self.main_stock[resource]
-                self.main_stock[resource] = 0  # Deplete main stock
-                self.aux_stock[resource] = max(0, self.aux_stock[resource] - amount_needed_from_aux)
+        # Check if the total available stock is sufficient (up to the lots' rounding)
+        if total_available + StockLots.TOLERANCE >= amount_required:
+            # Deduct from the oldest lots of the main stock first
+            taken, cost = self.main_lots[resource].take(amount_required)
+            # Deduct the remainder from auxiliary stock if main stock is insufficient
+            _, aux_cost = self.aux_lots[resource].take(amount_required - taken)
+            self.used_cost[resource] += float(cost + aux_cost)
+            self._update_stock(resource)
             return True
         else:
             # Return details of the shortage if resources are insufficient
@@ -172,7 +265,7 @@ class Warehouse:
 
             # Restock the main warehouse if funds are sufficient
             if available_cash >= cost_main:
-                self.main_stock[resource] = Warehouse.CAPACITIES[resource]["main"]
+                self.receive(resource, "main", main_restock_amount, price_per_unit)
                 total_cost += cost_main
                 available_cash -= cost_main
             else:
@@ -188,7 +281,7 @@ class Warehouse:
 
             # Restock the auxiliary warehouse if funds are sufficient
             if available_cash >= cost_aux:
-                self.aux_stock[resource] = Warehouse.CAPACITIES[resource]["aux"]
+                self.receive(resource, "aux", aux_restock_amount, price_per_unit)
                 total_cost += cost_aux
                 available_cash -= cost_aux
             else:
@@ -0,0 +1,383 @@
+import heapq
+
+from Hatchery import Hatchery
+from Supplier import Supplier
+from Technician import Technician
+from Warehouse import Warehouse
+
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the WeeklyScheduler class, a discrete-event engine that
+runs the hatchery one week at a time instead of treating a quarter as a single step.
+Events (technicians joining or leaving, sales, deliveries, weekly depreciation, stock
+checks that trigger mid-quarter restocks, and the end of each quarter) are kept in a
+heap ordered by week, and all events of a week are processed together as one batch.
+Technicians are paid at the end of each quarter for the weeks they were employed in it,
+including those who left during the quarter.
+"""
+
+
+class WeeklyScheduler:
+    """
+    The WeeklyScheduler class simulates a Hatchery week by week using an event queue.
+
+    Attributes:
+        WEEKS_PER_QUARTER (int): Weeks in a quarter.
+        DEFAULT_QUARTERS (int): Quarters run() simulates when no last week is given (as in main.py).
+        EVENT_ORDER (dict): Processing order of event kinds within the same week.
+        hatchery (Hatchery): Hatchery being simulated.
+        vendor (str): Supplier used for restocking.
+        lead_time (int): Weeks between placing a restock order and its delivery.
+        restock_threshold (float): Fraction of capacity below which a resource is reordered.
+        quarter_end_restock (bool): Whether to also restock to full at the end of each quarter.
+        week (int): Current week (0 is the first week of the first quarter).
+        quarter (int): Current quarter, starting from 1.
+        bankrupt (bool): True once the hatchery could not pay for a restock.
+        log (list of dict): Results of the events processed so far.
+        events_processed (int): Number of events processed so far.
+    """
+    WEEKS_PER_QUARTER = 12
+    DEFAULT_QUARTERS = 8
+    EVENT_ORDER = {
+        "technician": 0,
+        "delivery": 1,
+        "sale": 2,
+        "depreciation": 3,
+        "restock_check": 4,
+        "quarter_end": 5
+    }
+
+    def __init__(self, hatchery=None, vendor="Slippery Lakes", lead_time=1, restock_threshold=0.5,
+                 quarter_end_restock=False):
+        """
+        Initialize the scheduler and queue the recurring events of the first quarter.
+
+        Args:
+            hatchery (Hatchery or None): Hatchery to simulate; a new one is created if None.
+            vendor (str): Supplier used for restocking.
+            lead_time (int): Weeks between placing a restock order and its delivery.
+            restock_threshold (float): Fraction of capacity below which a resource is reordered.
+            quarter_end_restock (bool): Also restock to full at the end of each quarter, as
+                the quarterly simulation in main.py does (deliveries still on the way are
+                then capped at capacity).
+        """
+        # Store the hatchery and the restocking policy
+        self.hatchery = Hatchery() if hatchery is None else hatchery
+        self.vendor = vendor
+        self.lead_time = lead_time
+        self.restock_threshold = restock_threshold
+        self.quarter_end_restock = quarter_end_restock
+
+        # Simulation clock and state
+        self.week = 0
+        self.quarter = 1
+        self.bankrupt = False
+        self.log = []
+        self.events_processed = 0
+
+        # Heap of (week, order, sequence number, kind, data); the sequence number keeps
+        # events of the same week and kind in the order they were scheduled
+        self._queue = []
+        self._sequence = 0
+        self._pending_orders = set()  # Resources with a delivery on the way
+
+        # Wages accrue per week employed: first week of each current technician this
+        # quarter, and the weeks worked by technicians who left during the quarter
+        self._employed_since = {technician: 0 for technician in self.hatchery.technicians}
+        self._leavers = []
+
+        # Event handlers by kind
+        self._handlers = {
+            "technician": self._on_technician,
+            "delivery": self._on_delivery,
+            "sale": self._on_sale,
+            "depreciation": self._on_depreciation,
+            "restock_check": self._on_restock_check,
+            "quarter_end": self._on_quarter_end
+        }
+
+        # Weekly depreciation factors equivalent to the quarterly rates
+        self._weekly_factors = {
+            resource: (1 - rate) ** (1 / WeeklyScheduler.WEEKS_PER_QUARTER)
+            for resource, rate in Warehouse.DEPRECIATION_RATES.items()
+        }
+
+        # Start the first quarter with a fresh labour ledger and its recurring events
+        self.hatchery.start_new_quarter()
+        self._schedule_quarter(0)
+
+    def schedule(self, week, kind, **data):
+        """
+        Add an event to the queue.
+
+        Args:
+            week (int): Week the event happens in.
+            kind (str): Event kind (a key of EVENT_ORDER).
+            **data: Details passed to the event handler.
+        """
+        # Reject unknown event kinds early
+        if kind not in WeeklyScheduler.EVENT_ORDER:
+            raise ValueError(f"Unknown event kind '{kind}'.")
+        self._sequence += 1
+        heapq.heappush(self._queue, (week, WeeklyScheduler.EVENT_ORDER[kind], self._sequence, kind, data))
+
+    def schedule_sale(self, week, fish_type, quantity):
+        """
+        Schedule a sale.
+
+        Args:
+            week (int): Week the sale happens in.
+            fish_type (str): Type of fish to sell.
+            quantity (int): Quantity to sell.
+        """
+        self.schedule(week, "sale", fish_type=fish_type, quantity=quantity)
+
+    def schedule_hire(self, week, name, specialisation=None):
+        """
+        Schedule a technician joining the hatchery.
+
+        Args:
+            week (int): Week the technician starts.
+            name (str): Name of the technician.
+            specialisation (str or None): Fish type the technician specialises in.
+        """
+        self.schedule(week, "technician", action="hire", name=name, specialisation=specialisation)
+
+    def schedule_departure(self, week, name):
+        """
+        Schedule a technician leaving the hatchery.
+
+        Args:
+            week (int): Week the technician leaves.
+            name (str): Name of the technician.
+        """
+        self.schedule(week, "technician", action="leave", name=name)
+
+    def _schedule_quarter(self, first_week):
+        """
+        Queue the recurring weekly events of the quarter starting at first_week.
+
+        Args:
+            first_week (int): First week of the quarter.
+        """
+        # Depreciation and stock checks happen every week; the quarter ends in its last week
+        for week in range(first_week, first_week + WeeklyScheduler.WEEKS_PER_QUARTER):
+            self.schedule(week, "depreciation")
+            self.schedule(week, "restock_check")
+        self.schedule(first_week + WeeklyScheduler.WEEKS_PER_QUARTER - 1, "quarter_end")
+
+    def _record(self, kind, result):
+        """
+        Add an event result to the log.
+
+        Args:
+            kind (str): Event kind.
+            result (dict): Details of what happened.
+        """
+        result["week"] = self.week
+        result["quarter"] = self.quarter
+        result["event"] = kind
+        self.log.append(result)
+
+    def _on_technician(self, action, name, specialisation=None):
+        """
+        Hire or release a technician, adjusting this quarter's labour to the weeks left.
+
+        Args:
+            action (str): "hire" or "leave".
+            name (str): Name of the technician.
+            specialisation (str or None): Fish type the technician specialises in (hire only).
+        """
+        # Share of the quarter still to come, including the current week
+        weeks_left = WeeklyScheduler.WEEKS_PER_QUARTER - self.week % WeeklyScheduler.WEEKS_PER_QUARTER
+        share = weeks_left / WeeklyScheduler.WEEKS_PER_QUARTER
+
+        if action == "hire":
+            hired = self.hatchery.add_technicians([(name, specialisation)])
+            if hired:
+                # A technician joining mid-quarter only provides labour for the weeks left
+                technician = self.hatchery.technicians[-1]
+                self.hatchery.labour_ledger.add_technician(technician, Technician.LABOUR_PER_QUARTER * share)
+                self._employed_since[technician] = self.week
+            self._record("technician", {"action": "hire", "name": name, "status": "success" if hired else "full"})
+        else:
+            # Remove the named technician if the minimum staffing allows it
+            technicians = self.hatchery.technicians
+            position = next((i for i, technician in enumerate(technicians) if technician.name == name), None)
+            if position is None or len(technicians) <= Technician.MIN_TECHNICIANS:
+                self._record("technician", {"action": "leave", "name": name, "status": "refused"})
+                return
+            technician = technicians.pop(position)
+            self.hatchery.labour_ledger.remove_technician(name)
+            # The technician worked the weeks before this one and is paid for them at quarter end
+            weeks = self.week - self._employed_since.pop(technician, self.week)
+            self._leavers.append((technician, weeks))
+            self._record("technician", {"action": "leave", "name": name, "status": "success"})
+        self.hatchery.available_labor = self.hatchery.labour_ledger.total_remaining
+
+    def _on_delivery(self, resource, main, aux, unit_cost):
+        """
+        Receive a restock delivery as new lots, filling each warehouse up to its capacity.
+
+        Args:
+            resource (str): Resource delivered.
+            main (float): Amount ordered for the main warehouse.
+            aux (float): Amount ordered for the auxiliary warehouse.
+            unit_cost (float): Price paid per unit.
+        """
+        # Stock may have been used since the order, but never exceeds capacity
+        warehouse = self.hatchery.warehouse
+        warehouse.receive(resource, "main", main, unit_cost)
+        warehouse.receive(resource, "aux", aux, unit_cost)
+        self._pending_orders.discard(resource)
+        self._record("delivery", {"resource": resource, "main": main, "aux": aux})
+
+    def _on_sale(self, fish_type, quantity):
+        """
+        Attempt a sale using the hatchery's labour ledger and current stock.
+
+        Args:
+            fish_type (str): Type of fish to sell.
+            quantity (int): Quantity to sell.
+        """
+        self._record("sale", dict(self.hatchery.sell_fish(fish_type, quantity)))
+
+    def _on_depreciation(self):
+        """
+        Apply one week of depreciation to both warehouses.
+        """
+        warehouse = self.hatchery.warehouse
+        for resource, factor in self._weekly_factors.items():
+            warehouse.decay(resource, factor)
+
+    def _place_order(self, resource):
+        """
+        Pay for topping a resource up to full capacity and schedule its delivery.
+
+        Args:
+            resource (str): Resource to reorder.
+
+        Returns:
+            bool: False if the hatchery cannot afford the order (bankruptcy).
+        """
+        # Work out the amounts needed to fill both warehouses
+        warehouse = self.hatchery.warehouse
+        main = Warehouse.CAPACITIES[resource]["main"] - warehouse.main_stock[resource]
+        aux = Warehouse.CAPACITIES[resource]["aux"] - warehouse.aux_stock[resource]
+        price = Supplier.get_price(self.vendor, resource)
+        if price is None:
+            return True
+        cost = price * (main + aux)
+
+        if cost > self.hatchery.cash_balance:
+            self.bankrupt = True
+            self._record("restock", {"status": "bankrupt", "resource": resource, "needed": cost,
+                                     "available_cash": self.hatchery.cash_balance})
+            return False
+
+        # Pay when ordering; the stock arrives after the lead time
+        self.hatchery.cash_balance -= cost
+        self._pending_orders.add(resource)
+        self.schedule(self.week + self.lead_time, "delivery", resource=resource, main=main, aux=aux,
+                      unit_cost=price)
+        self._record("restock", {"status": "ordered", "resource": resource, "cost": cost})
+        return True
+
+    def _on_restock_check(self):
+        """
+        Reorder every resource whose total stock has fallen below the threshold.
+        """
+        warehouse = self.hatchery.warehouse
+        for resource, capacity in Warehouse.CAPACITIES.items():
+            total_capacity = capacity["main"] + capacity["aux"]
+            stock = warehouse.main_stock[resource] + warehouse.aux_stock[resource]
+            # Skip resources that are well stocked or already on order
+            if resource in self._pending_orders or stock >= self.restock_threshold * total_capacity:
+                continue
+            if not self._place_order(resource):
+                return
+
+    def _pay_wages(self):
+        """
+        Pay every technician employed during the quarter for the weeks they worked.
+
+        Returns:
+            dict: Total payment and, per technician, the weeks worked and the amount paid.
+        """
+        # Current staff have worked up to and including this (the last) week
+        worked = [(technician, self.week + 1 - since) for technician, since in self._employed_since.items()]
+        payments = [{"name": technician.name, "weeks": weeks, "amount": Technician.WEEKLY_WAGE * weeks}
+                    for technician, weeks in self._leavers + worked]
+        total_payment = sum(payment["amount"] for payment in payments)
+        self.hatchery.cash_balance -= total_payment
+        return {"total_payment": total_payment, "individual_payments": payments}
+
+    def _on_quarter_end(self):
+        """
+        Pay wages, fixed and storage costs, optionally restock to full, then start the next quarter.
+        """
+        hatchery = self.hatchery
+        pay = self._pay_wages()
+        wages = pay["total_payment"]
+        hatchery.cash_balance -= Hatchery.FIXED_QUARTERLY_COST
+        storage = hatchery.calculate_storage_costs()["total_storage_cost"]
+        hatchery.cash_balance -= storage
+
+        # Age the lots by a quarter; depreciation was already applied week by week
+        hatchery.warehouse.advance_quarter()
+
+        result = {"wages": wages, "payments": pay["individual_payments"], "fixed_cost": Hatchery.FIXED_QUARTERLY_COST,
+                  "storage_cost": storage}
+        if self.quarter_end_restock:
+            restock = hatchery.restock_resources(self.vendor)
+            result["restock"] = restock["status"]
+            if restock["status"] == "bankrupt":
+                self.bankrupt = True
+        result["cash_balance"] = hatchery.cash_balance
+        self._record("quarter_end", result)
+
+        if not self.bankrupt:
+            # Begin the next quarter with fresh labour and its recurring events
+            self.quarter += 1
+            hatchery.start_new_quarter()
+            self._employed_since = {technician: self.week + 1 for technician in hatchery.technicians}
+            self._leavers = []
+            self._schedule_quarter(self.week + 1)
+
+    def run(self, until_week=None):
+        """
+        Process events in week order until the given week is reached or the hatchery goes
+        bankrupt.
+
+        Args:
+            until_week (int or None): Last week to simulate (inclusive); None runs to the end
+                of quarter DEFAULT_QUARTERS. Quarters keep being scheduled, so there is
+                always a last week.
+
+        Returns:
+            dict: Final week, quarter, cash balance, bankruptcy flag and events processed.
+        """
+        if until_week is None:
+            until_week = WeeklyScheduler.DEFAULT_QUARTERS * WeeklyScheduler.WEEKS_PER_QUARTER - 1
+        queue = self._queue
+        handlers = self._handlers
+        while queue and not self.bankrupt:
+            week = queue[0][0]
+            if week > until_week:
+                break
+            self.week = week
+
+            # Pop the whole week as one batch; events it schedules for the same week join it
+            while queue and queue[0][0] == week and not self.bankrupt:
+                _, _, _, kind, data = heapq.heappop(queue)
+                handlers[kind](**data)
+                self.events_processed += 1
+
+        return {
+            "week": self.week,
+            "quarter": self.quarter,
+            "cash_balance": self.hatchery.cash_balance,
+            "bankrupt": self.bankrupt,
+            "events_processed": self.events_processed
+        }
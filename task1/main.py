@@ -294,9 +294,9 @@ def main():
                         print(f"\n=== FINAL STATE quarter {quarter + 1} ===")
                         print(f"Hatchery Name: Eastaboga, Cash: {hatchery.cash_balance:.2f}")
                         for resource, amount in hatchery.warehouse.main_stock.items():
-                            print(f"Warehouse Main: {resource.capitalize()}, {amount}")
+                            print(f"Warehouse Main: {resource.capitalize()}, {amount:.2f}")
                         for resource, amount in hatchery.warehouse.aux_stock.items():
-                            print(f"Warehouse Auxiliary: {resource.capitalize()}, {amount}")
+                            print(f"Warehouse Auxiliary: {resource.capitalize()}, {amount:.2f}")
                         for technician in hatchery.technicians:
                             print(f"Technician: {technician.name}, weekly rate={Technician.WEEKLY_WAGE}")
                         bankrupt = True  # Set bankruptcy flag
@@ -322,9 +322,9 @@ def main():
             print(f"Cash Balance: {hatchery.cash_balance:.2f}")  # Display the current cash balance
             print("Warehouse Stock:")
             for resource, amount in hatchery.warehouse.main_stock.items():  # Display main warehouse stock
-                print(f"  {resource.capitalize()}, {amount} (Main Capacity: {Warehouse.CAPACITIES[resource]['main']})")
+                print(f"  {resource.capitalize()}, {amount:.2f} (Main Capacity: {Warehouse.CAPACITIES[resource]['main']})")
             for resource, amount in hatchery.warehouse.aux_stock.items():  # Display auxiliary warehouse stock
-                print(f"  {resource.capitalize()}, {amount} (Aux Capacity: {Warehouse.CAPACITIES[resource]['aux']})")
+                print(f"  {resource.capitalize()}, {amount:.2f} (Aux Capacity: {Warehouse.CAPACITIES[resource]['aux']})")
             print("Technicians:")
             for technician in hatchery.technicians:  # Display details of all employed technicians
                 print(f"  Technician {technician.name}, weekly rate={Technician.WEEKLY_WAGE}")
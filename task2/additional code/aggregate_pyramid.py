@@ -0,0 +1,594 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the aggregate pyramid: daily, weekly, monthly and
+quarterly summaries of every column of a dataset, precomputed and stored next to the
+data. Each period keeps mergeable statistics (first, last, min, max, sum, sum of squares
+and count), from which OHLC bars, total volume, mean return and volatility follow. New
+days are merged into the last stored period and appended, so an update only touches the
+new rows, and a query reads the coarsest level that still gives enough points, so its
+cost does not grow with the length of the history.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from loaders import DATA_DIR, PRICE_FIELDS, price_file_paths, read_price_csv, read_wide_csv
+
+# Folder holding the pyramids (one sub-folder per dataset)
+PYRAMID_DIR = os.path.join(DATA_DIR, ".pyramid")
+
+# Levels from finest to coarsest
+LEVELS = ["daily", "weekly", "monthly", "quarterly"]
+
+# Statistics stored for every column in every period
+STATS = ["first", "last", "min", "max", "sum", "sumsq", "count"]
+FIRST, LAST, MIN, MAX, SUM, SUMSQ, COUNT = range(len(STATS))
+
+# Statistics a query can return
+DERIVED = ["open", "high", "low", "close", "sum", "mean", "std", "count"]
+
+# Points a query returns at most unless told otherwise
+DEFAULT_MAX_POINTS = 500
+
+
+def level_keys(days, level):
+    """
+    Number the periods of a level that a set of days fall into.
+
+    Args:
+        days (np.ndarray): Days since 1970-01-01 (int64).
+        level (str): One of LEVELS.
+
+    Returns:
+        np.ndarray: Period numbers, increasing with time.
+    """
+    if level == "daily":
+        return days
+    if level == "weekly":
+        # 1970-01-01 was a Thursday; weeks start on Mondays
+        return (days + 3) // 7
+    months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    return months if level == "monthly" else months // 3
+
+
+def period_starts(keys, level):
+    """
+    Find the first day of each period.
+
+    Args:
+        keys (np.ndarray): Period numbers from level_keys().
+        level (str): One of LEVELS.
+
+    Returns:
+        np.ndarray: datetime64[D] start dates.
+    """
+    keys = np.asarray(keys, dtype=np.int64)
+    if level == "daily":
+        return keys.astype("datetime64[D]")
+    if level == "weekly":
+        return (keys * 7 - 3).astype("datetime64[D]")
+    months = keys if level == "monthly" else keys * 3
+    return months.astype("datetime64[M]").astype("datetime64[D]")
+
+
+def daily_stats(values):
+    """
+    Turn daily values into one-day statistics records.
+
+    Args:
+        values (np.ndarray): (days, columns) values, NaN where missing.
+
+    Returns:
+        np.ndarray: (days, columns, len(STATS)) statistics.
+    """
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+    stats = np.empty(values.shape + (len(STATS),))
+    for index in (FIRST, LAST, MIN, MAX):
+        stats[..., index] = values
+    stats[..., SUM] = filled
+    stats[..., SUMSQ] = filled * filled
+    stats[..., COUNT] = present
+    return stats
+
+
+def reduce_stats(keys, stats):
+    """
+    Combine consecutive statistics records that share a period.
+
+    Args:
+        keys (np.ndarray): Non-decreasing period number of each record.
+        stats (np.ndarray): (records, columns, len(STATS)) statistics.
+
+    Returns:
+        tuple: (period numbers, combined statistics), one record per period.
+    """
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(keys)) + 1])
+    result = np.empty((starts.size,) + stats.shape[1:])
+    for index in (SUM, SUMSQ, COUNT):
+        result[..., index] = np.add.reduceat(stats[..., index], starts, axis=0)
+    # fmin/fmax ignore missing values, leaving NaN only for periods with no data
+    result[..., MIN] = np.fmin.reduceat(stats[..., MIN], starts, axis=0)
+    result[..., MAX] = np.fmax.reduceat(stats[..., MAX], starts, axis=0)
+
+    # First and last present values: the smallest/largest row index with data per period
+    rows = stats.shape[0]
+    padded_first = np.vstack([stats[..., FIRST], np.full((1, stats.shape[1]), np.nan)])
+    padded_last = np.vstack([stats[..., LAST], np.full((1, stats.shape[1]), np.nan)])
+    position = np.arange(rows)[:, None]
+    first_row = np.minimum.reduceat(np.where(np.isnan(stats[..., FIRST]), rows, position), starts, axis=0)
+    last_row = np.maximum.reduceat(np.where(np.isnan(stats[..., LAST]), -1, position), starts, axis=0)
+    columns = np.arange(stats.shape[1])
+    result[..., FIRST] = padded_first[first_row, columns]
+    result[..., LAST] = padded_last[np.where(last_row < 0, rows, last_row), columns]
+    return keys[starts], result
+
+
+def derive(stats, name):
+    """
+    Compute a returned statistic from stored statistics.
+
+    Args:
+        stats (np.ndarray): (..., len(STATS)) statistics.
+        name (str): One of DERIVED.
+
+    Returns:
+        np.ndarray: The statistic, NaN where it is undefined.
+    """
+    count = stats[..., COUNT]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if name == "open":
+            return stats[..., FIRST]
+        if name == "high":
+            return stats[..., MAX]
+        if name == "low":
+            return stats[..., MIN]
+        if name == "close":
+            return stats[..., LAST]
+        if name == "sum":
+            return np.where(count > 0, stats[..., SUM], np.nan)
+        if name == "count":
+            return count
+        mean = np.where(count > 0, stats[..., SUM] / count, np.nan)
+        if name == "mean":
+            return mean
+        # Sample standard deviation from the sums (needs two values)
+        variance = np.maximum(stats[..., SUMSQ] / count - mean * mean, 0.0) * count / (count - 1)
+        return np.where(count > 1, np.sqrt(variance), np.nan)
+    raise ValueError(f"Unknown statistic '{name}'.")
+
+
+class AggregatePyramid:
+    """
+    The AggregatePyramid class stores every level of summaries of a dataset on disk.
+
+    On-disk layout (one folder per dataset):
+        {level}.keys: Period numbers of the level (int64), one per stored period.
+        {level}.stats: Statistics of every period (float64, columns x len(STATS) each).
+        meta.json: Columns, periods per level, last day stored and the source signature.
+
+    Attributes:
+        META_FILE (str): File name of the metadata.
+        directory (str): Folder holding the pyramid files.
+        meta (dict): Parsed metadata.
+        columns (list of str): Summarised columns.
+    """
+    META_FILE = "meta.json"
+
+    def __init__(self, directory):
+        """
+        Open an existing pyramid.
+
+        Args:
+            directory (str): Folder previously written by build().
+        """
+        self.directory = directory
+        with open(os.path.join(directory, AggregatePyramid.META_FILE)) as handle:
+            self.meta = json.load(handle)
+        self.columns = self.meta["columns"]
+        self._maps = {}  # level -> (keys, stats) memory maps, opened on first use
+
+    @classmethod
+    def build(cls, directory, frame, signature=None):
+        """
+        Create a pyramid from a daily dataset, replacing any existing one.
+
+        Args:
+            directory (str): Folder to write the pyramid into (created if needed).
+            frame (pd.DataFrame): "Date" column followed by numeric columns.
+            signature (list or None): Identifies the source version (see open_pyramid).
+
+        Returns:
+            AggregatePyramid: The new pyramid.
+        """
+        os.makedirs(directory, exist_ok=True)
+        columns = [column for column in frame.columns if column != "Date"]
+        for level in LEVELS:
+            for suffix in ("keys", "stats"):
+                open(os.path.join(directory, f"{level}.{suffix}"), "wb").close()
+        meta = {"columns": columns, "periods": {level: 0 for level in LEVELS}, "last_day": None,
+                "signature": signature, "dirty": False}
+        cls._write_meta(directory, meta)
+        pyramid = cls(directory)
+        pyramid.append(frame, signature)
+        return pyramid
+
+    @classmethod
+    def _write_meta(cls, directory, meta):
+        """
+        Replace the metadata file atomically.
+
+        Args:
+            directory (str): Pyramid folder.
+            meta (dict): Metadata to write.
+        """
+        temp_path = os.path.join(directory, cls.META_FILE + ".tmp")
+        with open(temp_path, "w") as handle:
+            json.dump(meta, handle)
+        os.replace(temp_path, os.path.join(directory, cls.META_FILE))
+
+    def append(self, frame, signature=None):
+        """
+        Add new days to every level, merging them into each level's last period.
+
+        Args:
+            frame (pd.DataFrame): "Date" column and the pyramid's columns, with every
+                date after the last day already stored.
+            signature (list or None): New source signature to record.
+
+        Raises:
+            ValueError: If a date is not after the last stored day.
+        """
+        frame = frame.sort_values("Date")
+        days = frame["Date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+        last_day = self.meta["last_day"]
+        if days.size and last_day is not None and days[0] <= last_day:
+            raise ValueError("Only days after the last stored day can be appended.")
+        if days.size == 0:
+            self.meta["signature"] = signature
+            AggregatePyramid._write_meta(self.directory, self.meta)
+            return
+
+        values = frame.reindex(columns=self.columns).to_numpy(dtype=np.float64)
+        stats = daily_stats(values)
+        record_size = len(self.columns) * len(STATS)
+
+        # Mark the pyramid as being updated, so an interrupted update is rebuilt
+        self.meta["dirty"] = True
+        AggregatePyramid._write_meta(self.directory, self.meta)
+
+        for level in LEVELS:
+            keys, records = reduce_stats(level_keys(days, level), stats)
+            stored = self.meta["periods"][level]
+            position = stored
+            if stored:
+                last_key, last_record = self._last_record(level)
+                if last_key == keys[0]:
+                    # The first new period continues the last stored one: merge and rewrite it
+                    keys, records = reduce_stats(np.concatenate([[last_key], keys]),
+                                                 np.concatenate([last_record[None], records]))
+                    position = stored - 1
+            with open(os.path.join(self.directory, f"{level}.keys"), "r+b") as handle:
+                handle.seek(position * 8)
+                handle.write(keys.astype(np.int64).tobytes())
+                handle.truncate()
+            with open(os.path.join(self.directory, f"{level}.stats"), "r+b") as handle:
+                handle.seek(position * record_size * 8)
+                handle.write(records.astype(np.float64).tobytes())
+                handle.truncate()
+            self.meta["periods"][level] = position + len(keys)
+            # The memory maps of this level still have the old length
+            self._maps.pop(level, None)
+
+        self.meta["last_day"] = int(days[-1])
+        self.meta["signature"] = signature
+        self.meta["dirty"] = False
+        AggregatePyramid._write_meta(self.directory, self.meta)
+
+    def _last_record(self, level):
+        """
+        Read the last stored period of a level.
+
+        Args:
+            level (str): One of LEVELS.
+
+        Returns:
+            tuple: (period number, (columns, len(STATS)) statistics).
+        """
+        keys, stats = self.level_arrays(level)
+        return int(keys[-1]), np.array(stats[-1])
+
+    def level_arrays(self, level):
+        """
+        Memory-map the stored periods of a level.
+
+        Args:
+            level (str): One of LEVELS.
+
+        Returns:
+            tuple: (period numbers, (periods, columns, len(STATS)) statistics), read-only.
+        """
+        if level not in self._maps:
+            periods = self.meta["periods"][level]
+            shape = (periods, len(self.columns), len(STATS))
+            if periods == 0:
+                self._maps[level] = (np.empty(0, dtype=np.int64), np.empty(shape))
+            else:
+                keys = np.memmap(os.path.join(self.directory, f"{level}.keys"), dtype=np.int64, mode="r",
+                                 shape=(periods,))
+                stats = np.memmap(os.path.join(self.directory, f"{level}.stats"), dtype=np.float64, mode="r",
+                                  shape=shape)
+                self._maps[level] = (keys, stats)
+        return self._maps[level]
+
+    def _bounds(self, level, start, end):
+        """
+        Find the stored periods of a level that overlap a date range, by binary search.
+
+        Args:
+            level (str): One of LEVELS.
+            start (str or datetime-like or None): First date.
+            end (str or datetime-like or None): Last date.
+
+        Returns:
+            tuple: (first, stop) positions in the level.
+        """
+        keys, _ = self.level_arrays(level)
+        first, stop = 0, keys.size
+        if start is not None:
+            day = np.array([pd.Timestamp(start).to_datetime64()]).astype("datetime64[D]").astype(np.int64)
+            first = int(np.searchsorted(keys, level_keys(day, level)[0], side="left"))
+        if end is not None:
+            day = np.array([pd.Timestamp(end).to_datetime64()]).astype("datetime64[D]").astype(np.int64)
+            stop = int(np.searchsorted(keys, level_keys(day, level)[0], side="right"))
+        return first, max(first, stop)
+
+    def choose_level(self, start=None, end=None, max_points=DEFAULT_MAX_POINTS):
+        """
+        Pick the finest level that covers a date range in at most max_points periods.
+
+        Args:
+            start (str or datetime-like or None): First date.
+            end (str or datetime-like or None): Last date.
+            max_points (int): Largest number of periods wanted.
+
+        Returns:
+            str: Level name (the coarsest level if none fits).
+        """
+        for level in LEVELS:
+            first, stop = self._bounds(level, start, end)
+            if stop - first <= max_points:
+                return level
+        return LEVELS[-1]
+
+    def query(self, columns=None, start=None, end=None, level=None, max_points=DEFAULT_MAX_POINTS,
+              stats=DERIVED):
+        """
+        Read summaries of some columns over a date range.
+
+        Args:
+            columns (list of str or None): Columns to summarise; defaults to all.
+            start (str or datetime-like or None): First date.
+            end (str or datetime-like or None): Last date.
+            level (str or None): Level to read; by default the finest one with at most
+                max_points periods (see choose_level).
+            max_points (int): Largest number of periods wanted when choosing the level.
+            stats (list of str): Statistics to return, from DERIVED.
+
+        Returns:
+            pd.DataFrame: "Date" (start of each period) and "{column}_{stat}" columns. The
+            level read is stored in the frame's attrs["level"].
+        """
+        columns = self.columns if columns is None else list(columns)
+        missing = [column for column in columns if column not in self.columns]
+        if missing:
+            raise KeyError(f"Columns not in the pyramid: {missing}")
+        level = self.choose_level(start, end, max_points) if level is None else level
+
+        keys, stored = self.level_arrays(level)
+        first, stop = self._bounds(level, start, end)
+        positions = [self.columns.index(column) for column in columns]
+        selected = np.asarray(stored[first:stop][:, positions])
+
+        result = {"Date": period_starts(keys[first:stop], level)}
+        for offset, column in enumerate(columns):
+            for name in stats:
+                result[f"{column}_{name}"] = derive(selected[:, offset], name)
+        frame = pd.DataFrame(result)
+        frame.attrs["level"] = level
+        return frame
+
+
+def _refresh(directory, signature, load):
+    """
+    Open a pyramid, updating it from its source only when the source changed.
+
+    New days after the last stored day are appended; any other change (edited or removed
+    rows, new columns) rebuilds the pyramid.
+
+    Args:
+        directory (str): Pyramid folder.
+        signature (list): Current source signature.
+        load (callable): Returns the source as a daily frame with a "Date" column.
+
+    Returns:
+        AggregatePyramid: Up-to-date pyramid.
+    """
+    try:
+        pyramid = AggregatePyramid(directory)
+    except (OSError, ValueError, KeyError):
+        return AggregatePyramid.build(directory, load(), signature)
+    if pyramid.meta["signature"] == signature and not pyramid.meta["dirty"]:
+        return pyramid
+
+    frame = load()
+    columns = [column for column in frame.columns if column != "Date"]
+    if pyramid.meta["dirty"] or columns != pyramid.columns or pyramid.meta["last_day"] is None:
+        return AggregatePyramid.build(directory, frame, signature)
+
+    # The stored days must be unchanged: recompute their daily records and compare
+    days = frame["Date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    old = days <= pyramid.meta["last_day"]
+    if not old.any():
+        return AggregatePyramid.build(directory, frame, signature)
+    order = np.argsort(days[old], kind="stable")
+    values = frame.loc[old, columns].to_numpy(dtype=np.float64)[order]
+    keys, records = reduce_stats(days[old][order], daily_stats(values))
+    stored_keys, stored_records = pyramid.level_arrays("daily")
+    if (keys.size != stored_keys.size or not np.array_equal(keys, stored_keys)
+            or not np.allclose(records, stored_records, equal_nan=True)):
+        return AggregatePyramid.build(directory, frame, signature)
+    pyramid.append(frame.loc[~old], signature)
+    return pyramid
+
+
+def _signature(paths):
+    """
+    Identify the version of one or more source files.
+
+    Args:
+        paths (list of str): Source files.
+
+    Returns:
+        list: [path, size in bytes, modification time in nanoseconds] per file.
+    """
+    return [[os.path.basename(path), os.stat(path).st_size, os.stat(path).st_mtime_ns] for path in paths]
+
+
+_pyramids = {}  # pyramid folder -> open AggregatePyramid, kept between queries
+
+
+def open_pyramid(path, pyramid_dir=PYRAMID_DIR):
+    """
+    Open the pyramid of a wide CSV file (such as grouped_data.csv), building or
+    updating it when the file changed.
+
+    Args:
+        path (str): Wide CSV file with a "Date" column.
+        pyramid_dir (str): Folder holding the pyramids.
+
+    Returns:
+        AggregatePyramid: Pyramid that matches the current file.
+    """
+    path = os.path.abspath(path)
+    directory = os.path.join(pyramid_dir, os.path.splitext(os.path.basename(path))[0])
+    signature = _signature([path])
+    pyramid = _pyramids.get(directory)
+    if pyramid is None or pyramid.meta["signature"] != signature:
+        pyramid = _refresh(directory, signature, lambda: read_wide_csv(path, schema=False))
+        _pyramids[directory] = pyramid
+    return pyramid
+
+
+def price_frame(data_dir=DATA_DIR):
+    """
+    Combine the raw price files into one daily frame with a daily return per asset.
+
+    Args:
+        data_dir (str): Folder with the raw "*_stock_data.csv"/"*_crypto_data.csv" files.
+
+    Returns:
+        pd.DataFrame: "Date" and "{ticker}_{field}" columns for PRICE_FIELDS (spaces
+        replaced by underscores) plus "{ticker}_Return", the daily Adj Close return.
+    """
+    frames = []
+    for path in price_file_paths(data_dir):
+        ticker, df = read_price_csv(path, schema=False)
+        df = df.astype(np.float64)
+        df["Return"] = df["Adj Close"].pct_change()
+        df.columns = [f"{ticker}_{field.replace(' ', '_')}" for field in PRICE_FIELDS + ["Return"]]
+        frames.append(df)
+    # Stocks have no rows at weekends; those days stay missing and are skipped by the statistics
+    return pd.concat(frames, axis=1).sort_index().rename_axis("Date").reset_index()
+
+
+def open_asset_pyramid(data_dir=DATA_DIR, pyramid_dir=PYRAMID_DIR):
+    """
+    Open the pyramid of the raw price files, building or updating it when they changed.
+
+    Args:
+        data_dir (str): Folder with the raw price files.
+        pyramid_dir (str): Folder holding the pyramids.
+
+    Returns:
+        AggregatePyramid: Pyramid with the "{ticker}_{field}" columns of price_frame().
+    """
+    directory = os.path.join(pyramid_dir, "assets")
+    signature = _signature(price_file_paths(data_dir))
+    pyramid = _pyramids.get(directory)
+    if pyramid is None or pyramid.meta["signature"] != signature:
+        pyramid = _refresh(directory, signature, lambda: price_frame(data_dir))
+        _pyramids[directory] = pyramid
+    return pyramid
+
+
+def asset_bars(ticker, start=None, end=None, max_points=DEFAULT_MAX_POINTS, level=None, data_dir=DATA_DIR):
+    """
+    Read OHLC bars, total volume, mean return and volatility of one asset.
+
+    Args:
+        ticker (str): Ticker such as "AAPL" or "BTC-USD".
+        start (str or datetime-like or None): First date.
+        end (str or datetime-like or None): Last date.
+        max_points (int): Largest number of bars wanted when choosing the level.
+        level (str or None): Level to read instead of choosing one.
+        data_dir (str): Folder with the raw price files.
+
+    Returns:
+        pd.DataFrame: Date, Open, High, Low, Close, Volume, Mean_Return and Volatility
+        (standard deviation of the daily returns) per period; attrs["level"] is the level.
+    """
+    pyramid = open_asset_pyramid(data_dir)
+    fields = {"Open": ("Open", "open"), "High": ("High", "high"), "Low": ("Low", "low"),
+              "Close": ("Close", "close"), "Volume": ("Volume", "sum"),
+              "Mean_Return": ("Return", "mean"), "Volatility": ("Return", "std")}
+    return _select(pyramid, ticker, fields, start, end, max_points, level)
+
+
+def group_bars(group, path=os.path.join(DATA_DIR, "grouped_data.csv"), start=None, end=None,
+               max_points=DEFAULT_MAX_POINTS, level=None):
+    """
+    Read the mean return, mean volatility and total volume of one group per period.
+
+    Args:
+        group (str): Group name such as "Stocks" or "Cryptos".
+        path (str): Grouped CSV file with "{group}_{metric}" columns.
+        start (str or datetime-like or None): First date.
+        end (str or datetime-like or None): Last date.
+        max_points (int): Largest number of periods wanted when choosing the level.
+        level (str or None): Level to read instead of choosing one.
+
+    Returns:
+        pd.DataFrame: Date, Avg_Return, Return_Std, Avg_Volatility and Total_Volume per
+        period; attrs["level"] is the level read.
+    """
+    pyramid = open_pyramid(path)
+    fields = {"Avg_Return": ("Avg_Return", "mean"), "Return_Std": ("Avg_Return", "std"),
+              "Avg_Volatility": ("Avg_Volatility", "mean"), "Total_Volume": ("Total_Volume", "sum")}
+    return _select(pyramid, group, fields, start, end, max_points, level)
+
+
+def _select(pyramid, prefix, fields, start, end, max_points, level):
+    """
+    Query the columns of one asset or group and rename the statistics.
+
+    Args:
+        pyramid (AggregatePyramid): Pyramid to read.
+        prefix (str): Asset or group name.
+        fields (dict): Output name mapped to (column suffix, statistic).
+        start, end, max_points, level: As for AggregatePyramid.query.
+
+    Returns:
+        pd.DataFrame: "Date" and the output columns.
+    """
+    columns = sorted({f"{prefix}_{suffix}" for suffix, _ in fields.values()})
+    frame = pyramid.query(columns, start, end, level, max_points)
+    result = pd.DataFrame({"Date": frame["Date"]})
+    for name, (suffix, statistic) in fields.items():
+        result[name] = frame[f"{prefix}_{suffix}_{statistic}"]
+    result.attrs["level"] = frame.attrs["level"]
+    return result
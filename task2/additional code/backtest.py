@@ -0,0 +1,309 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the portfolio backtester for the cleaned daily-return
+dataset. Weight configurations are evaluated together: per-period asset growth is
+computed once and multiplied by the (configs x assets) weight matrix, so thousands of
+strategies cost one matrix product rather than one loop each. Fixed weights, stock/crypto
+mixes and volatility targeting are supported, transaction costs are modelled from the
+traded fraction of each asset's daily dollar volume, and parameter grids can be split
+across a process pool.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from features import PERIODS_PER_YEAR, extract_field_matrix
+from loaders import read_wide_csv
+from rolling_stats import rolling_std
+
+# Default transaction cost model
+FEE_RATE = 0.0005  # Commission/spread paid on every unit traded (5 basis points)
+IMPACT_COEFFICIENT = 0.1  # Square-root market impact coefficient
+CAPITAL = 1_000_000  # Portfolio size used to compare trades with traded volume
+
+
+def load_backtest_data(path):
+    """
+    Load the returns, volumes and prices the backtester needs from a wide dataset.
+
+    Args:
+        path (str): Wide CSV file such as reordered_cleaned_data.csv.
+
+    Returns:
+        dict: "dates", "tickers" and (dates x assets) "returns", "volumes" and "prices".
+    """
+    df = read_wide_csv(path)
+    tickers, returns = extract_field_matrix(df, "Adj_Close_Daily_Return")
+    _, volumes = extract_field_matrix(df, "Volume", tickers)
+    _, prices = extract_field_matrix(df, "Adj_Close", tickers)
+    return {"dates": df["Date"].to_numpy(), "tickers": tickers,
+            "returns": returns, "volumes": volumes, "prices": prices}
+
+
+def fixed_weights(weights, n_assets=None):
+    """
+    Build a (configs x assets) weight matrix from one or more weight vectors.
+
+    Args:
+        weights (array-like): One weight vector or a list of them.
+        n_assets (int or None): Expected number of assets, checked if given.
+
+    Returns:
+        np.ndarray: Weight matrix of shape (configs, assets).
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    if n_assets is not None and weights.shape[1] != n_assets:
+        raise ValueError(f"Expected {n_assets} weights per configuration, got {weights.shape[1]}.")
+    return weights
+
+
+def stock_crypto_mix(tickers, crypto_fractions, cryptos=("BTC-USD", "ETH-USD")):
+    """
+    Build weight configurations splitting capital between the stock and crypto groups.
+
+    Within each group the capital is split equally between its assets.
+
+    Args:
+        tickers (list of str): Tickers in column order.
+        crypto_fractions (array-like): Fraction of capital in cryptocurrencies, one per
+            configuration (e.g. np.linspace(0, 1, 101)).
+        cryptos (iterable of str): Tickers belonging to the crypto group.
+
+    Returns:
+        np.ndarray: Weight matrix of shape (configs, assets).
+    """
+    is_crypto = np.array([ticker in set(cryptos) for ticker in tickers])
+    fractions = np.asarray(crypto_fractions, dtype=np.float64).reshape(-1, 1)
+    crypto_share = np.where(is_crypto, 1.0 / max(is_crypto.sum(), 1), 0.0)
+    stock_share = np.where(is_crypto, 0.0, 1.0 / max((~is_crypto).sum(), 1))
+    return fractions * crypto_share + (1 - fractions) * stock_share
+
+
+def transaction_costs(trades, volumes, prices, capital=CAPITAL, fee_rate=FEE_RATE,
+                      impact=IMPACT_COEFFICIENT):
+    """
+    Calculate the cost of trades as a fraction of portfolio value.
+
+    Each asset pays a flat fee plus square-root market impact, which grows with the
+    traded notional relative to the asset's dollar volume that day:
+        cost = |trade| * (fee_rate + impact * sqrt(|trade| * capital / (volume * price)))
+
+    Args:
+        trades (np.ndarray): Weight changes of shape (..., configs, assets).
+        volumes (np.ndarray): Traded volume of shape (..., 1, assets) broadcastable to trades.
+        prices (np.ndarray): Prices with the same shape as volumes.
+        capital (float): Portfolio value used to size trades.
+        fee_rate (float): Flat cost per unit of weight traded.
+        impact (float): Square-root impact coefficient.
+
+    Returns:
+        np.ndarray: Cost of shape (..., configs).
+    """
+    size = np.abs(trades)
+    dollar_volume = volumes * prices
+    with np.errstate(divide="ignore", invalid="ignore"):
+        participation = np.where(dollar_volume > 0, size * capital / dollar_volume, 0.0)
+    return (size * (fee_rate + impact * np.sqrt(participation))).sum(axis=-1)
+
+
+def _performance_summary(returns, periods_per_year=PERIODS_PER_YEAR):
+    """
+    Summarise the net return series of every configuration.
+
+    Args:
+        returns (np.ndarray): Net returns of shape (dates, configs).
+        periods_per_year (int): Periods used to annualise.
+
+    Returns:
+        pd.DataFrame: One row per configuration.
+    """
+    equity = np.cumprod(1 + returns, axis=0)
+    mean = returns.mean(axis=0)
+    vol = returns.std(axis=0, ddof=1)
+    drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = mean / vol * np.sqrt(periods_per_year)
+    return pd.DataFrame({
+        "total_return": equity[-1] - 1,
+        "annual_return": mean * periods_per_year,
+        "annual_volatility": vol * np.sqrt(periods_per_year),
+        "sharpe": sharpe,
+        "max_drawdown": drawdown.min(axis=0),
+    })
+
+
+def backtest(returns, weights, volumes=None, prices=None, rebalance_every=21, capital=CAPITAL,
+             fee_rate=FEE_RATE, impact=IMPACT_COEFFICIENT):
+    """
+    Backtest many weight configurations at once with periodic rebalancing.
+
+    Between rebalances the holdings drift with the market. Each asset's growth since the
+    last rebalance is computed once for all configurations, so the portfolio growth of
+    every configuration is a single (dates x assets) @ (assets x configs) product.
+
+    Args:
+        returns (np.ndarray): Daily returns of shape (dates, assets); NaN counts as 0.
+        weights (np.ndarray): Weight matrix of shape (configs, assets).
+        volumes (np.ndarray or None): Daily volumes, needed for transaction costs.
+        prices (np.ndarray or None): Daily prices, needed for transaction costs.
+        rebalance_every (int): Rows between rebalances (1 for daily, 21 for monthly).
+        capital (float): Portfolio value used to size trades in the cost model.
+        fee_rate (float): Flat cost per unit of weight traded.
+        impact (float): Square-root impact coefficient.
+
+    Returns:
+        dict: "returns" (net, dates x configs), "costs" (dates x configs), "turnover"
+        (dates x configs), "equity" (dates x configs) and a per-configuration "summary".
+    """
+    returns = np.nan_to_num(np.asarray(returns, dtype=np.float64))
+    weights = fixed_weights(weights, returns.shape[1])
+    n_dates = returns.shape[0]
+
+    # Log growth of every asset, and its value at the start of each holding period
+    log_growth = np.cumsum(np.log1p(returns), axis=0)
+    period_start = (np.arange(n_dates) // rebalance_every) * rebalance_every
+    before_start = np.vstack([np.zeros((1, returns.shape[1])), log_growth])[period_start]
+    growth = np.exp(log_growth - before_start)  # Growth of 1 unit since the last rebalance
+
+    # Portfolio value since the last rebalance for every configuration at once
+    portfolio = growth @ weights.T
+    previous = np.ones_like(portfolio)
+    previous[1:] = portfolio[:-1]
+    previous[period_start == np.arange(n_dates)] = 1.0  # Value resets at each rebalance
+    gross = portfolio / previous - 1
+
+    # Trades at each rebalance: target weights minus the weights drifted from the last one
+    rebalance_rows = np.arange(0, n_dates, rebalance_every)
+    drifted = np.zeros((rebalance_rows.size, weights.shape[0], weights.shape[1]))
+    ends = rebalance_rows[1:] - 1
+    if ends.size:
+        drifted[1:] = weights[None] * growth[ends][:, None, :] / portfolio[ends][:, :, None]
+    trades = weights[None] - drifted
+
+    turnover = np.zeros_like(gross)
+    costs = np.zeros_like(gross)
+    turnover[rebalance_rows] = np.abs(trades).sum(axis=2)
+    if volumes is not None and prices is not None:
+        costs[rebalance_rows] = transaction_costs(
+            trades, np.asarray(volumes, dtype=np.float64)[rebalance_rows][:, None, :],
+            np.asarray(prices, dtype=np.float64)[rebalance_rows][:, None, :], capital, fee_rate, impact)
+
+    net = gross - costs
+    return {"returns": net, "costs": costs, "turnover": turnover,
+            "equity": np.cumprod(1 + net, axis=0), "summary": _performance_summary(net)}
+
+
+def volatility_target(returns, weights, target_volatility, window=30, max_leverage=2.0,
+                      volumes=None, prices=None, capital=CAPITAL, fee_rate=FEE_RATE,
+                      impact=IMPACT_COEFFICIENT, periods_per_year=PERIODS_PER_YEAR):
+    """
+    Backtest daily-rebalanced portfolios scaled to a target annualised volatility.
+
+    Exposure on each day is target / realised volatility of the base portfolio over the
+    previous window (so no future data is used), capped at max_leverage; the rest of the
+    capital is held in cash earning nothing.
+
+    Args:
+        returns (np.ndarray): Daily returns of shape (dates, assets).
+        weights (np.ndarray): Base weight matrix of shape (configs, assets).
+        target_volatility (float or array-like): Annualised target, one value for all
+            configurations or one per configuration.
+        window (int): Rows used to estimate realised volatility.
+        max_leverage (float): Cap on the exposure multiplier.
+        volumes (np.ndarray or None): Daily volumes, needed for transaction costs.
+        prices (np.ndarray or None): Daily prices, needed for transaction costs.
+        capital (float): Portfolio value used to size trades.
+        fee_rate (float): Flat cost per unit of weight traded.
+        impact (float): Square-root impact coefficient.
+        periods_per_year (int): Periods used to annualise volatility.
+
+    Returns:
+        dict: Same keys as backtest, plus the daily "leverage" (dates x configs).
+    """
+    returns = np.nan_to_num(np.asarray(returns, dtype=np.float64))
+    weights = fixed_weights(weights, returns.shape[1])
+
+    # Base portfolio returns for every configuration in one product
+    base = returns @ weights.T
+
+    # Realised volatility known at the start of each day (previous window only)
+    realised = np.full(base.shape, np.nan)
+    realised[1:] = rolling_std(base, window)[:-1] * np.sqrt(periods_per_year)
+    target = np.broadcast_to(np.asarray(target_volatility, dtype=np.float64), (base.shape[1],))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        leverage = np.minimum(target / realised, max_leverage)
+    # Stay fully invested at the base weights until a volatility estimate exists
+    leverage = np.where(np.isfinite(leverage), leverage, 1.0)
+
+    # Exposure changes are traded across the assets in proportion to the base weights
+    exposure_change = np.diff(leverage, axis=0, prepend=0.0)
+    trades = exposure_change[:, :, None] * weights[None]
+    turnover = np.abs(trades).sum(axis=2)
+    costs = np.zeros_like(base)
+    if volumes is not None and prices is not None:
+        costs = transaction_costs(trades, np.asarray(volumes, dtype=np.float64)[:, None, :],
+                                  np.asarray(prices, dtype=np.float64)[:, None, :], capital, fee_rate, impact)
+
+    net = leverage * base - costs
+    return {"returns": net, "costs": costs, "turnover": turnover, "leverage": leverage,
+            "equity": np.cumprod(1 + net, axis=0),
+            "summary": _performance_summary(net, periods_per_year)}
+
+
+def _run_chunk(job):
+    """
+    Run one chunk of weight configurations (executed inside a worker process).
+
+    Args:
+        job (tuple): (data dict, weight chunk, keyword arguments for backtest).
+
+    Returns:
+        pd.DataFrame: Summary of the chunk.
+    """
+    data, weights, options = job
+    result = backtest(data["returns"], weights, data.get("volumes"), data.get("prices"), **options)
+    return result["summary"]
+
+
+def run_grid(data, weights, rebalance_periods=(1, 5, 21), n_jobs=None, chunk_size=1000, **options):
+    """
+    Evaluate every weight configuration for every rebalancing period in parallel.
+
+    The work is split into chunks of configurations; each chunk is still evaluated as
+    one vectorised backtest inside its worker.
+
+    Args:
+        data (dict): Output of load_backtest_data.
+        weights (np.ndarray): Weight matrix of shape (configs, assets).
+        rebalance_periods (iterable of int): Rebalancing periods to try.
+        n_jobs (int or None): Number of worker processes (None uses all cores, 1 runs
+            in the current process).
+        chunk_size (int): Configurations per chunk.
+        **options: Extra keyword arguments for backtest (capital, fee_rate, impact).
+
+    Returns:
+        pd.DataFrame: One summary row per (rebalance period, configuration).
+    """
+    weights = fixed_weights(weights)
+    jobs = []
+    keys = []
+    for period in rebalance_periods:
+        for first in range(0, weights.shape[0], chunk_size):
+            chunk = weights[first:first + chunk_size]
+            jobs.append((data, chunk, dict(options, rebalance_every=period)))
+            keys.append((period, first))
+
+    if n_jobs == 1:
+        summaries = list(map(_run_chunk, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            summaries = list(pool.map(_run_chunk, jobs))
+
+    # Label every row with its rebalancing period and configuration number
+    for (period, first), summary in zip(keys, summaries):
+        summary.insert(0, "config", np.arange(first, first + len(summary)))
+        summary.insert(0, "rebalance_every", period)
+    return pd.concat(summaries, ignore_index=True)
@@ -0,0 +1,245 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the calendar-aware alignment module. The notebook merges
+every asset onto one frame and fills gaps with df.interpolate(method="linear"), which
+invents stock prices for weekends and holidays when cryptocurrencies trade every day.
+Here each asset keeps its own native calendar, and alignment onto a target calendar is
+done lazily, only for the assets and fields requested, using vectorised index maps
+(one binary search per asset) with a per-asset-class fill policy: none, ffill or linear.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from loaders import PRICE_FIELDS, price_file_paths, read_price_csv
+
+# Fill policies available for dates missing from an asset's native calendar
+FILL_METHODS = ("none", "ffill", "linear")
+
+# Default policy per asset class: stocks do not trade on those days, so leave them empty
+DEFAULT_FILL = {"stock": "none", "crypto": "ffill"}
+
+
+def asset_class_from_path(path):
+    """
+    Infer the asset class from a raw price file name.
+
+    Args:
+        path (str): File such as "AAPL_stock_data.csv" or "BTC-USD_crypto_data.csv".
+
+    Returns:
+        str: "stock" or "crypto".
+    """
+    return "crypto" if os.path.basename(path).endswith("_crypto_data.csv") else "stock"
+
+
+class CalendarAligner:
+    """
+    The CalendarAligner class stores each asset on its native calendar and aligns
+    assets onto a target calendar on demand.
+
+    Attributes:
+        fill (dict): Asset class mapped to its default fill method.
+        assets (dict): Ticker mapped to {"class", "dates", "values", "fields"}, where
+            dates is a sorted datetime64[ns] array and values is (native dates x fields).
+    """
+
+    def __init__(self, fill=None):
+        """
+        Initialise an empty aligner.
+
+        Args:
+            fill (dict or None): Asset class -> fill method; defaults to DEFAULT_FILL.
+        """
+        self.fill = dict(DEFAULT_FILL if fill is None else fill)
+        self.assets = {}
+        self._index_maps = {}  # (ticker, calendar key) -> (position, exact, weight)
+
+    @classmethod
+    def from_price_files(cls, paths=None, fill=None):
+        """
+        Build an aligner from raw yfinance price files.
+
+        Args:
+            paths (list of str or None): Files to load; defaults to loaders.price_file_paths().
+            fill (dict or None): Asset class -> fill method.
+
+        Returns:
+            CalendarAligner: Aligner holding every file's asset on its own calendar.
+        """
+        aligner = cls(fill)
+        for path in price_file_paths() if paths is None else paths:
+            ticker, df = read_price_csv(path)
+            aligner.add_asset(ticker, df, asset_class_from_path(path))
+        return aligner
+
+    def add_asset(self, ticker, df, asset_class="stock"):
+        """
+        Register one asset on its native calendar.
+
+        Args:
+            ticker (str): Ticker symbol.
+            df (pd.DataFrame): Data indexed by date (e.g. the PRICE_FIELDS columns).
+            asset_class (str): Asset class used to pick the fill method.
+        """
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        self.assets[ticker] = {
+            "class": asset_class,
+            "dates": df.index.values.astype("datetime64[ns]"),
+            "values": df.to_numpy(dtype=np.float64),
+            "fields": list(df.columns),
+        }
+        # Any cached index maps for this ticker are now stale
+        self._index_maps = {key: value for key, value in self._index_maps.items() if key[0] != ticker}
+
+    def calendar(self, how="union", tickers=None):
+        """
+        Build a target calendar from the registered assets.
+
+        Args:
+            how (str): "union" (every date any asset traded), "intersection" (dates all
+                assets traded) or a ticker whose native calendar is used.
+            tickers (list of str or None): Assets to combine; defaults to all.
+
+        Returns:
+            np.ndarray: Sorted datetime64[ns] dates.
+        """
+        if how in self.assets:
+            return self.assets[how]["dates"]
+        tickers = list(self.assets) if tickers is None else tickers
+        calendars = [self.assets[ticker]["dates"] for ticker in tickers]
+        if how == "union":
+            return np.unique(np.concatenate(calendars))
+        if how == "intersection":
+            result = calendars[0]
+            for dates in calendars[1:]:
+                result = np.intersect1d(result, dates, assume_unique=True)
+            return result
+        raise ValueError(f"Unknown calendar '{how}'.")
+
+    def _index_map(self, ticker, target):
+        """
+        Map every target date to the asset's native calendar with one binary search.
+
+        Args:
+            ticker (str): Ticker symbol.
+            target (np.ndarray): Sorted datetime64[ns] target dates.
+
+        Returns:
+            tuple: (position of the last native date <= target date (-1 if none),
+            True where the target date is a native date, linear interpolation weight
+            of the next native date).
+        """
+        key = (ticker, target.size, hash(target.tobytes()))
+        if key in self._index_maps:
+            return self._index_maps[key]
+
+        native = self.assets[ticker]["dates"]
+        position = np.searchsorted(native, target, side="right") - 1
+        valid = position >= 0
+        exact = valid & (native[np.maximum(position, 0)] == target)
+
+        # Fraction of the way from the previous native date to the next one
+        weight = np.full(target.shape, np.nan)
+        inside = valid & (position < native.size - 1)
+        previous = native[position[inside]].astype(np.int64)
+        following = native[position[inside] + 1].astype(np.int64)
+        weight[inside] = (target[inside].astype(np.int64) - previous) / (following - previous)
+
+        self._index_maps[key] = (position, exact, weight)
+        return position, exact, weight
+
+    def align(self, ticker, target, fields=None, method=None, limit=None):
+        """
+        Align one asset onto a target calendar.
+
+        Args:
+            ticker (str): Ticker symbol.
+            target (np.ndarray): Sorted target dates (e.g. from calendar()).
+            fields (list of str or None): Fields to align; defaults to all of the asset's fields.
+            method (str or None): "none", "ffill" or "linear"; defaults to the asset class policy.
+            limit (int or None): For "ffill", the largest number of target dates a value
+                may be carried over.
+
+        Returns:
+            np.ndarray: Array of shape (target dates, fields).
+        """
+        asset = self.assets[ticker]
+        method = self.fill.get(asset["class"], "none") if method is None else method
+        if method not in FILL_METHODS:
+            raise ValueError(f"Unknown fill method '{method}'.")
+        fields = asset["fields"] if fields is None else fields
+        columns = [asset["fields"].index(field) for field in fields]
+        values = asset["values"][:, columns]
+        target = np.asarray(target, dtype="datetime64[ns]")
+
+        position, exact, weight = self._index_map(ticker, target)
+        safe = np.maximum(position, 0)
+        result = np.full((target.size, len(columns)), np.nan)
+
+        if method == "none":
+            result[exact] = values[safe[exact]]
+        elif method == "ffill":
+            carried = position >= 0
+            if limit is not None:
+                # Count how many target dates have passed since the last native date
+                run_start = np.maximum.accumulate(np.where(exact, np.arange(target.size), -1))
+                carried &= exact | ((np.arange(target.size) - run_start <= limit) & (run_start >= 0))
+            result[carried] = values[safe[carried]]
+        else:
+            # Exact dates are copied; dates between two native dates are interpolated in time
+            result[exact] = values[safe[exact]]
+            between = ~exact & ~np.isnan(weight)
+            lower = values[position[between]]
+            upper = values[position[between] + 1]
+            result[between] = lower + weight[between, None] * (upper - lower)
+        return result
+
+    def frame(self, tickers=None, fields=("Adj Close",), calendar="union", methods=None):
+        """
+        Align several assets onto one calendar and return a wide DataFrame.
+
+        Only the requested assets and fields are touched, and the output is allocated
+        once, so hundreds of assets never pass through a sparse intermediate frame.
+
+        Args:
+            tickers (list of str or None): Assets to include; defaults to all.
+            fields (iterable of str): Fields to include (raw names such as "Adj Close").
+            calendar (str or array-like): Calendar name for calendar() or explicit dates.
+            methods (dict or None): Per-ticker fill method overrides.
+
+        Returns:
+            pd.DataFrame: "{ticker}_{field}" columns (spaces replaced by underscores, as
+            in the notebook's merged files) indexed by Date.
+        """
+        tickers = list(self.assets) if tickers is None else list(tickers)
+        fields = list(fields)
+        methods = {} if methods is None else methods
+        target = self.calendar(calendar, tickers) if isinstance(calendar, str) else np.asarray(
+            calendar, dtype="datetime64[ns]")
+
+        block = np.empty((target.size, len(tickers) * len(fields)))
+        columns = []
+        for i, ticker in enumerate(tickers):
+            block[:, i * len(fields):(i + 1) * len(fields)] = self.align(ticker, target, fields, methods.get(ticker))
+            columns.extend(f"{ticker}_{field.replace(' ', '_')}" for field in fields)
+        return pd.DataFrame(block, index=pd.DatetimeIndex(target, name="Date"), columns=columns)
+
+
+def load_aligned(fields=PRICE_FIELDS, calendar="union", fill=None, paths=None):
+    """
+    Load the raw price files and align them in one call.
+
+    Args:
+        fields (iterable of str): Fields to include.
+        calendar (str): "union", "intersection" or a ticker.
+        fill (dict or None): Asset class -> fill method.
+        paths (list of str or None): Files to load; defaults to loaders.price_file_paths().
+
+    Returns:
+        pd.DataFrame: Wide aligned data indexed by Date.
+    """
+    return CalendarAligner.from_price_files(paths, fill).frame(fields=fields, calendar=calendar)
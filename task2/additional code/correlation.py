@@ -0,0 +1,271 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the pairwise rolling correlation/covariance engine. It
+computes the full rolling covariance and correlation matrices across all assets of a
+(dates x assets) return array, either in batch with blocked matrix maths or
+incrementally one row at a time. Only the upper triangle of each matrix is stored,
+optionally in float32, so memory scales to large universes of tickers.
+"""
+
+import numpy as np
+
+from features import extract_field_matrix
+from loaders import read_wide_csv
+
+
+def triangle_indices(n_assets, diagonal=True):
+    """
+    List the (row, column) positions of the packed upper triangle.
+
+    Args:
+        n_assets (int): Number of assets.
+        diagonal (bool): Include the diagonal (variances); correlation matrices omit it
+            because it is always 1.
+
+    Returns:
+        tuple: (row indices, column indices) in packing order.
+    """
+    return np.triu_indices(n_assets, k=0 if diagonal else 1)
+
+
+def unpack(packed, n_assets, diagonal=True):
+    """
+    Rebuild full symmetric matrices from packed upper triangles.
+
+    Args:
+        packed (np.ndarray): Array of shape (..., pairs) from one of the engines.
+        n_assets (int): Number of assets.
+        diagonal (bool): Whether packed includes the diagonal. If not, the diagonal is
+            filled with 1 (the correlation of an asset with itself).
+
+    Returns:
+        np.ndarray: Array of shape (..., n_assets, n_assets).
+    """
+    rows, cols = triangle_indices(n_assets, diagonal)
+    full = np.zeros(packed.shape[:-1] + (n_assets, n_assets), dtype=packed.dtype)
+    full[..., rows, cols] = packed
+    full[..., cols, rows] = packed
+    if not diagonal:
+        full[..., np.arange(n_assets), np.arange(n_assets)] = 1
+    return full
+
+
+def load_returns(path, field="Adj_Close_Daily_Return"):
+    """
+    Load the per-asset daily returns of a wide dataset.
+
+    Args:
+        path (str): Wide CSV file such as reordered_cleaned_data.csv.
+        field (str): Column suffix holding the returns.
+
+    Returns:
+        tuple: (dates, list of tickers, (dates x assets) return array).
+    """
+    df = read_wide_csv(path)
+    tickers, returns = extract_field_matrix(df, field)
+    return df["Date"].to_numpy(), tickers, returns
+
+
+def _window_sums(values, window):
+    """
+    Sum every trailing window along the first axis using cumulative sums.
+
+    Args:
+        values (np.ndarray): Array of shape (dates, ...).
+        window (int): Window length.
+
+    Returns:
+        np.ndarray: Array of shape (dates - window + 1, ...).
+    """
+    cumulative = np.cumsum(values, axis=0)
+    sums = cumulative[window - 1:].copy()
+    sums[1:] -= cumulative[:-window]
+    return sums
+
+
+def rolling_covariance(returns, window, block_size=128, dtype=np.float64, correlation=False):
+    """
+    Calculate the rolling covariance (or correlation) of every pair of assets.
+
+    Assets are processed in blocks so the temporary (dates x block x block) arrays stay
+    bounded, and each block pair is reduced with cumulative sums so every window costs
+    O(1). A window is NaN for a pair when either asset has a missing value in it.
+
+    Args:
+        returns (np.ndarray): Return array of shape (dates, assets).
+        window (int): Window length in rows (at least 2).
+        block_size (int): Number of assets per block.
+        dtype (np.dtype): Output dtype; np.float32 halves the memory used.
+        correlation (bool): Return correlations (packed without the diagonal) instead
+            of covariances (packed with the diagonal).
+
+    Returns:
+        np.ndarray: Array of shape (dates, pairs) in triangle_indices order. Rows before
+        the first full window are NaN.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    n_dates, n_assets = returns.shape
+    rows, cols = triangle_indices(n_assets, diagonal=not correlation)
+    output = np.full((n_dates, rows.size), np.nan, dtype=dtype)
+    if n_dates < window or window < 2:
+        return output
+
+    # Covariance is unaffected by shifting each column, and demeaning limits rounding error
+    present = ~np.isnan(returns)
+    centred = np.where(present, returns - np.nanmean(returns, axis=0), 0.0)
+
+    # Position of each (row, col) pair within the packed output
+    pair_position = np.full((n_assets, n_assets), -1)
+    pair_position[rows, cols] = np.arange(rows.size)
+
+    starts = range(0, n_assets, block_size)
+    for first_i in starts:
+        block_i = slice(first_i, min(first_i + block_size, n_assets))
+        for first_j in starts:
+            if first_j < first_i:
+                continue  # Lower-triangle blocks are never needed
+            block_j = slice(first_j, min(first_j + block_size, n_assets))
+
+            # Window sums of x, y, x*y and joint counts for every pair in the block
+            x = centred[:, block_i, None]
+            y = centred[:, None, block_j]
+            both = present[:, block_i, None] & present[:, None, block_j]
+            count = _window_sums(both.astype(np.float64), window)
+            sum_x = _window_sums(np.where(both, x, 0.0), window)
+            sum_y = _window_sums(np.where(both, y, 0.0), window)
+            sum_xy = _window_sums(x * y, window)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                covariance = (sum_xy - sum_x * sum_y / count) / (count - 1)
+                if correlation:
+                    sum_xx = _window_sums(np.where(both, x * x, 0.0), window)
+                    sum_yy = _window_sums(np.where(both, y * y, 0.0), window)
+                    var_x = (sum_xx - sum_x * sum_x / count) / (count - 1)
+                    var_y = (sum_yy - sum_y * sum_y / count) / (count - 1)
+                    covariance = np.clip(covariance / np.sqrt(var_x * var_y), -1.0, 1.0)
+            # Only complete windows are reported, as in pandas' rolling().cov()
+            covariance[count < window] = np.nan
+
+            # Scatter the upper-triangle pairs of this block into the packed output
+            positions = pair_position[block_i, block_j]
+            keep = positions >= 0
+            output[window - 1:, positions[keep]] = covariance[:, keep]
+    return output
+
+
+def rolling_correlation(returns, window, block_size=128, dtype=np.float64):
+    """
+    Calculate the rolling correlation of every pair of assets.
+
+    Args:
+        returns (np.ndarray): Return array of shape (dates, assets).
+        window (int): Window length in rows.
+        block_size (int): Number of assets per block.
+        dtype (np.dtype): Output dtype.
+
+    Returns:
+        np.ndarray: Array of shape (dates, pairs) packed without the diagonal.
+    """
+    return rolling_covariance(returns, window, block_size, dtype, correlation=True)
+
+
+class IncrementalCovariance:
+    """
+    The IncrementalCovariance class maintains the covariance matrix of the last `window`
+    return vectors, updating it with one rank-one Welford step per added or evicted row
+    instead of recomputing the window. Only the packed upper triangle is stored.
+
+    Rows pushed must be complete (no NaN); fill or drop missing returns first.
+
+    Attributes:
+        n_assets (int): Number of assets.
+        window (int): Window length.
+        dtype (np.dtype): Dtype of the returned matrices.
+    """
+
+    def __init__(self, n_assets, window, dtype=np.float64):
+        """
+        Initialise an empty window.
+
+        Args:
+            n_assets (int): Number of assets.
+            window (int): Window length.
+            dtype (np.dtype): Dtype of the returned matrices.
+        """
+        self.n_assets = n_assets
+        self.window = window
+        self.dtype = dtype
+        self._rows, self._cols = triangle_indices(n_assets)
+        self._diagonal = self._rows == self._cols
+
+        # Ring buffer of the rows currently in the window
+        self._buffer = np.zeros((window, n_assets))
+        self._count = 0
+        self._next = 0
+        self._mean = np.zeros(n_assets)
+        self._comoment = np.zeros(self._rows.size)  # Packed sum of co-deviations
+
+    def _update(self, row, sign):
+        """
+        Add (sign=1) or remove (sign=-1) one row from the running co-moments.
+
+        Args:
+            row (np.ndarray): Return vector.
+            sign (int): 1 to add, -1 to remove.
+        """
+        if self._count == 0:
+            self._mean[:] = 0.0
+            self._comoment[:] = 0.0
+            return
+        delta = row - self._mean
+        self._mean += sign * delta / self._count
+        # Packed version of the outer product delta x (row - new mean)
+        self._comoment += sign * delta[self._rows] * (row - self._mean)[self._cols]
+
+    def push(self, row):
+        """
+        Add one return vector, evicting the oldest once the window is full.
+
+        Args:
+            row (array-like): Returns of every asset for one period.
+        """
+        row = np.asarray(row, dtype=np.float64)
+        if np.isnan(row).any():
+            raise ValueError("Rows pushed to IncrementalCovariance must not contain NaN.")
+
+        # Evict the oldest row first so the window never exceeds its length
+        if self._count == self.window:
+            old = self._buffer[self._next].copy()
+            self._count -= 1
+            self._update(old, -1)
+
+        self._buffer[self._next] = row
+        self._next = (self._next + 1) % self.window
+        self._count += 1
+        self._update(row, 1)
+
+    def covariance(self):
+        """
+        Retrieve the packed covariance of the current window.
+
+        Returns:
+            np.ndarray: Packed upper triangle (with diagonal), NaN with fewer than two rows.
+        """
+        if self._count < 2:
+            return np.full(self._rows.size, np.nan, dtype=self.dtype)
+        return (self._comoment / (self._count - 1)).astype(self.dtype)
+
+    def correlation(self):
+        """
+        Retrieve the packed correlation of the current window.
+
+        Returns:
+            np.ndarray: Packed upper triangle without the diagonal.
+        """
+        covariance = self.covariance().astype(np.float64)
+        std = np.sqrt(np.maximum(covariance[self._diagonal], 0.0))
+        off_diagonal = ~self._diagonal
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = covariance[off_diagonal] / (std[self._rows[off_diagonal]] * std[self._cols[off_diagonal]])
+        return np.clip(corr, -1.0, 1.0).astype(self.dtype)
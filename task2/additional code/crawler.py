@@ -0,0 +1,412 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the crawler layer that replaces the notebook's serial
+yf.download loop. Tickers are fetched concurrently with rate limiting and retries, every
+response is cached on disk by (ticker, interval, date range) so only missing ranges are
+re-fetched, and the network backend is pluggable: LocalFileBackend replays the CSV
+files in task2/data so tests and benchmarks can run without network access.
+"""
+
+import glob
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from loaders import DATA_DIR, PRICE_FIELDS, price_file_paths, read_price_csv, read_ticker, write_price_csv
+
+
+class YFinanceBackend:
+    """
+    The YFinanceBackend class fetches price data from Yahoo Finance. yfinance is only
+    imported when the first request is made.
+    """
+
+    def fetch(self, ticker, start, end, interval="1d"):
+        """
+        Download price data for one ticker.
+
+        Args:
+            ticker (str): Ticker symbol (e.g. "AAPL").
+            start (pd.Timestamp): First date to include.
+            end (pd.Timestamp): First date to exclude.
+            interval (str): Bar interval understood by yfinance (e.g. "1d", "1h").
+
+        Returns:
+            pd.DataFrame: Price data indexed by Date with the PRICE_FIELDS columns
+            (intraday times in UTC, without a time zone).
+        """
+        import yfinance as yf
+
+        df = yf.download(ticker, start=start, end=end, interval=interval,
+                         auto_adjust=False, progress=False)
+        # Recent yfinance versions return (field, ticker) column pairs
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(0)
+        # Intraday bars come in the exchange's time zone; the cache compares naive times
+        if getattr(df.index, "tz", None) is not None:
+            df.index = df.index.tz_convert("UTC").tz_localize(None)
+        df.index.name = "Date"
+        return df.reindex(columns=PRICE_FIELDS)
+
+
+class LocalFileBackend:
+    """
+    The LocalFileBackend class is an offline stand-in for YFinanceBackend. It replays the
+    raw price files in a data folder (task2/data by default), returning the requested
+    date range exactly as a download would.
+
+    Attributes:
+        paths (dict): Ticker symbol mapped to the path of its price file.
+        calls (int): Number of fetch calls made, useful for checking cache hits.
+    """
+
+    def __init__(self, data_dir=DATA_DIR):
+        """
+        Index the price files of a data folder by ticker.
+
+        Args:
+            data_dir (str): Folder containing "*_stock_data.csv" and "*_crypto_data.csv" files.
+        """
+        self.paths = {read_ticker(path): path for path in price_file_paths(data_dir)}
+        self.calls = 0
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, ticker, start, end, interval="1d"):
+        """
+        Replay price data for one ticker from its local file.
+
+        Args:
+            ticker (str): Ticker symbol.
+            start (pd.Timestamp): First date to include.
+            end (pd.Timestamp): First date to exclude.
+            interval (str): Only "1d" is available locally.
+
+        Returns:
+            pd.DataFrame: Price data indexed by Date with the PRICE_FIELDS columns.
+        """
+        if ticker not in self.paths:
+            raise KeyError(f"No local data for {ticker}.")
+        if interval != "1d":
+            raise ValueError(f"Local data is daily only, not '{interval}'.")
+
+        with self._lock:
+            self.calls += 1
+            # Parse each file once, at full precision, and keep it for later requests
+            if ticker not in self._frames:
+                self._frames[ticker] = read_price_csv(self.paths[ticker], schema=False)[1]
+            df = self._frames[ticker]
+        return df[(df.index >= start) & (df.index < end)]
+
+
+class RateLimiter:
+    """
+    The RateLimiter class is a thread-safe token bucket limiting how many requests are
+    started per second across all worker threads.
+
+    Attributes:
+        rate (float): Requests allowed per second.
+        capacity (float): Maximum burst size.
+    """
+
+    def __init__(self, rate, capacity=1.0):
+        """
+        Initialise a full bucket.
+
+        Args:
+            rate (float): Requests allowed per second (0 or None disables limiting).
+            capacity (float): Maximum number of requests that may start back to back.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a request may be started.
+        """
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                # Refill the bucket for the time elapsed since the last call
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class CrawlCache:
+    """
+    The CrawlCache class stores fetched data on disk, one file per fetched
+    (ticker, interval, date range) segment, and works out which parts of a requested
+    range are not yet covered.
+
+    Segments live in "{cache_dir}/{interval}/{ticker}/{start}_{end}.csv" using
+    half-open [start, end) ranges, in the raw yfinance CSV layout. Range bounds are
+    written down to the second so intraday segments of the same day stay distinct, and
+    intraday bars are stored with their time of day.
+
+    Attributes:
+        cache_dir (str): Root folder of the cache.
+    """
+    DATE_FORMAT = "%Y%m%dT%H%M%S"
+
+    def __init__(self, cache_dir):
+        """
+        Initialise the cache.
+
+        Args:
+            cache_dir (str): Root folder of the cache (created if needed).
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _folder(self, ticker, interval):
+        """
+        Retrieve the folder holding the segments of one ticker and interval.
+
+        Args:
+            ticker (str): Ticker symbol.
+            interval (str): Bar interval.
+
+        Returns:
+            str: Folder path.
+        """
+        return os.path.join(self.cache_dir, interval, ticker)
+
+    def segments(self, ticker, interval):
+        """
+        List the cached segments of one ticker and interval.
+
+        Args:
+            ticker (str): Ticker symbol.
+            interval (str): Bar interval.
+
+        Returns:
+            list of tuple: (start, end, path) sorted by start date.
+        """
+        found = []
+        for path in glob.glob(os.path.join(self._folder(ticker, interval), "*.csv")):
+            start, end = os.path.splitext(os.path.basename(path))[0].split("_")
+            found.append((pd.Timestamp(start), pd.Timestamp(end), path))
+        return sorted(found)
+
+    def missing_ranges(self, ticker, interval, start, end):
+        """
+        Work out which parts of [start, end) are not covered by cached segments.
+
+        Args:
+            ticker (str): Ticker symbol.
+            interval (str): Bar interval.
+            start (pd.Timestamp): First date requested.
+            end (pd.Timestamp): First date not requested.
+
+        Returns:
+            list of tuple: Uncovered (start, end) ranges in date order.
+        """
+        gaps = []
+        cursor = start
+        for seg_start, seg_end, _ in self.segments(ticker, interval):
+            if seg_end <= cursor:
+                continue
+            if seg_start >= end:
+                break
+            if seg_start > cursor:
+                gaps.append((cursor, seg_start))
+            cursor = max(cursor, seg_end)
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def store(self, ticker, interval, start, end, df):
+        """
+        Save one fetched segment. Empty segments are stored too, so that ranges without
+        data (e.g. weekends for stocks) are not fetched again.
+
+        Args:
+            ticker (str): Ticker symbol.
+            interval (str): Bar interval.
+            start (pd.Timestamp): First date of the fetched range.
+            end (pd.Timestamp): First date after the fetched range.
+            df (pd.DataFrame): Fetched data.
+        """
+        folder = self._folder(ticker, interval)
+        os.makedirs(folder, exist_ok=True)
+        name = f"{start.strftime(CrawlCache.DATE_FORMAT)}_{end.strftime(CrawlCache.DATE_FORMAT)}.csv"
+        # Write to a temporary file first so a crash never leaves a partial segment
+        temp_path = os.path.join(folder, name + ".tmp")
+        write_price_csv(temp_path, ticker, df)
+        os.replace(temp_path, os.path.join(folder, name))
+
+    def load(self, ticker, interval, start, end):
+        """
+        Combine the cached segments overlapping [start, end).
+
+        Args:
+            ticker (str): Ticker symbol.
+            interval (str): Bar interval.
+            start (pd.Timestamp): First date to include.
+            end (pd.Timestamp): First date to exclude.
+
+        Returns:
+            pd.DataFrame: Cached data for the range, sorted by date without duplicates.
+        """
+        frames = [read_price_csv(path, schema=False)[1] for seg_start, seg_end, path in self.segments(ticker, interval)
+                  if seg_start < end and seg_end > start]
+        if not frames:
+            return pd.DataFrame(columns=PRICE_FIELDS, index=pd.DatetimeIndex([], name="Date"))
+        df = pd.concat(frames).sort_index()
+        df = df[~df.index.duplicated(keep="last")]
+        return df[(df.index >= start) & (df.index < end)]
+
+
+class Crawler:
+    """
+    The Crawler class fetches many tickers concurrently through a pluggable backend,
+    re-fetching only the date ranges missing from the cache.
+
+    Attributes:
+        backend: Object with a fetch(ticker, start, end, interval) method.
+        cache (CrawlCache): On-disk cache of fetched segments.
+        max_workers (int): Number of concurrent fetch threads.
+        limiter (RateLimiter): Shared limit on requests per second.
+        retries (int): Number of extra attempts after a failed fetch.
+        backoff (float): Initial retry delay in seconds, doubled after every failure.
+    """
+
+    def __init__(self, backend, cache, max_workers=4, rate=2.0, retries=3, backoff=1.0):
+        """
+        Initialise the crawler.
+
+        Args:
+            backend: YFinanceBackend, LocalFileBackend or any object with the same fetch method.
+            cache (CrawlCache): On-disk cache.
+            max_workers (int): Number of concurrent fetch threads.
+            rate (float): Requests allowed per second across all threads (0 disables limiting).
+            retries (int): Number of extra attempts after a failed fetch.
+            backoff (float): Initial retry delay in seconds.
+        """
+        self.backend = backend
+        self.cache = cache
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(rate)
+        self.retries = retries
+        self.backoff = backoff
+
+    def _fetch_with_retries(self, ticker, start, end, interval):
+        """
+        Fetch one range, retrying with exponential backoff.
+
+        Args:
+            ticker (str): Ticker symbol.
+            start (pd.Timestamp): First date to include.
+            end (pd.Timestamp): First date to exclude.
+            interval (str): Bar interval.
+
+        Returns:
+            pd.DataFrame: Fetched data.
+        """
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            try:
+                return self.backend.fetch(ticker, start, end, interval)
+            except (KeyError, ValueError):
+                # Unknown tickers or unsupported intervals will not succeed on retry
+                raise
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(delay)
+                delay *= 2
+
+    def fetch(self, ticker, start, end, interval="1d"):
+        """
+        Fetch one ticker, using the cache for every range already downloaded.
+
+        Args:
+            ticker (str): Ticker symbol.
+            start (str or datetime-like): First date to include.
+            end (str or datetime-like): First date to exclude (as in yf.download).
+            interval (str): Bar interval.
+
+        Returns:
+            pd.DataFrame: Price data for [start, end). Only ranges ending before today are cached.
+        """
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end)
+        # Bars from today onwards may still change or not exist yet, so they are returned but never cached
+        today = pd.Timestamp.now().normalize()
+        fresh = []
+        for gap_start, gap_end in self.cache.missing_ranges(ticker, interval, start, end):
+            df = self._fetch_with_retries(ticker, gap_start, gap_end, interval)
+            complete_end = min(gap_end, max(gap_start, today))
+            if complete_end > gap_start:
+                self.cache.store(ticker, interval, gap_start, complete_end, df[df.index < complete_end])
+            if complete_end < gap_end and not df.empty:
+                fresh.append(df[df.index >= complete_end])
+        df = self.cache.load(ticker, interval, start, end)
+        if not fresh:
+            return df
+        df = pd.concat([df, *fresh]) if not df.empty else pd.concat(fresh)
+        df = df.sort_index()
+        return df[~df.index.duplicated(keep="last")]
+
+    def fetch_many(self, tickers, start, end, interval="1d"):
+        """
+        Fetch several tickers concurrently.
+
+        Args:
+            tickers (list of str): Ticker symbols.
+            start (str or datetime-like): First date to include.
+            end (str or datetime-like): First date to exclude.
+            interval (str): Bar interval.
+
+        Returns:
+            tuple: (dict of ticker -> DataFrame for successful fetches,
+            dict of ticker -> exception for failed fetches).
+        """
+        results = {}
+        failures = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {ticker: pool.submit(self.fetch, ticker, start, end, interval) for ticker in tickers}
+            for ticker, future in futures.items():
+                try:
+                    results[ticker] = future.result()
+                except Exception as error:
+                    failures[ticker] = error
+        return results, failures
+
+    def save_all(self, results, output_dir, crypto_tickers=()):
+        """
+        Write fetched data with the notebook's file names ("{ticker}_stock_data.csv" or
+        "{ticker}_crypto_data.csv") into an output folder.
+
+        Args:
+            results (dict): Ticker mapped to its DataFrame, as returned by fetch_many.
+            output_dir (str): Folder to write to (created if needed).
+            crypto_tickers (iterable of str): Tickers saved with the "crypto" suffix.
+
+        Returns:
+            list of str: Paths written.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        crypto_tickers = set(crypto_tickers)
+        written = []
+        for ticker, df in results.items():
+            kind = "crypto" if ticker in crypto_tickers else "stock"
+            path = os.path.join(output_dir, f"{ticker}_{kind}_data.csv")
+            write_price_csv(path, ticker, df)
+            written.append(path)
+        return written
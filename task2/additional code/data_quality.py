@@ -0,0 +1,348 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the data-quality validator for the raw price files
+("*_stock_data.csv" and "*_crypto_data.csv"), run before cleaning. Every rule (bad,
+duplicate or out-of-order dates, missing values, High below Low, Open/Close outside the
+day's range, zero or negative volume, missing stretches of dates and Adj Close diverging
+from Close) is evaluated in one vectorised pass over each chunk of a file, giving one
+bit per rule per row. A batch of files is validated in a process pool and reported as a
+compact per-file summary, and the per-row flags can be saved for the cleaning stage.
+
+Usage:
+    python data_quality.py --masks ../data/.quality_masks
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from loaders import DATA_DIR, PRICE_FIELDS, price_file_paths, read_ticker
+
+# Rules in bit order: a row's flags have bit i set when it breaks RULES[i]
+RULES = [
+    "bad_date",  # Date could not be parsed
+    "duplicate_date",  # Date already seen earlier in the file
+    "out_of_order",  # Date before a date seen earlier in the file
+    "missing_value",  # Any price field or the volume is missing
+    "high_below_low",
+    "close_outside_range",  # Close below Low or above High
+    "open_outside_range",  # Open below Low or above High
+    "nonpositive_volume",
+    "gap_before",  # More days since the previous row than the market's calendar allows
+    "adj_close_divergence",  # Adj Close/Close ratio invalid or jumping between rows
+]
+RULE_BITS = {rule: np.uint16(1 << bit) for bit, rule in enumerate(RULES)}
+
+# Rules whose rows the cleaning stage drops by default (gaps and divergence are reported only)
+DROP_RULES = ["bad_date", "duplicate_date", "out_of_order", "missing_value", "high_below_low",
+              "close_outside_range", "open_outside_range", "nonpositive_volume"]
+
+# Longest gap between consecutive rows, in calendar days (stocks: long weekends)
+MAX_GAP_DAYS = {"stock": 4, "crypto": 1}
+
+# Relative slack for price comparisons, since yfinance rounds prices to float32
+PRICE_TOLERANCE = 1e-6
+
+# Largest change of the Adj Close/Close ratio between rows (dividends move it by well
+# under 1%; splits adjust both columns) and slack above 1 for the ratio itself
+RATIO_JUMP = 0.05
+RATIO_SLACK = 1e-3
+
+# Rows parsed and checked at a time
+CHUNK_ROWS = 100_000
+
+# Day number given to rows whose date could not be parsed
+INVALID_DAY = np.iinfo(np.int64).min
+
+
+def market_of(path):
+    """
+    Work out whether a price file holds a stock or a cryptocurrency.
+
+    Args:
+        path (str): Path to a "*_stock_data.csv" or "*_crypto_data.csv" file.
+
+    Returns:
+        str: "stock" or "crypto".
+    """
+    return "crypto" if os.path.basename(path).endswith("_crypto_data.csv") else "stock"
+
+
+def new_state():
+    """
+    Create the state carried between the chunks of one file.
+
+    Returns:
+        dict: "max_day"/"min_day" (latest/earliest valid date so far), "seen" (sorted
+        unique days so far), "ratio" (last valid Adj Close/Close ratio) and
+        "longest_gap" (longest step forward between dates, in days).
+    """
+    return {"max_day": INVALID_DAY, "min_day": np.iinfo(np.int64).max, "seen": np.empty(0, dtype=np.int64),
+            "ratio": np.nan, "longest_gap": 0}
+
+
+def check_chunk(days, prices, state, max_gap):
+    """
+    Evaluate every rule on a chunk of rows at once.
+
+    Args:
+        days (np.ndarray): Days since 1970-01-01 (int64), with INVALID_DAY where the date
+            could not be parsed.
+        prices (np.ndarray): (rows, 6) float64 values in PRICE_FIELDS order.
+        state (dict): Carried between chunks of a file (see new_state()); updated in place.
+        max_gap (int): Longest allowed gap between consecutive dates, in days.
+
+    Returns:
+        np.ndarray: uint16 flags per row (see RULE_BITS).
+    """
+    adj_close, close, high, low, open_, volume = prices.T
+    flags = np.zeros(days.size, dtype=np.uint16)
+
+    def mark(rule, mask):
+        flags[mask] |= RULE_BITS[rule]
+
+    # Dates: compare each row with the latest date of all rows before it
+    valid = days != INVALID_DAY
+    mark("bad_date", ~valid)
+    previous_max = np.maximum.accumulate(np.concatenate([[state["max_day"]], days]))[:-1]
+    mark("out_of_order", valid & (days < previous_max))
+    _, first_rows = np.unique(days, return_index=True)
+    repeated = np.ones(days.size, dtype=bool)
+    repeated[first_rows] = False
+    seen = np.isin(days, state["seen"])
+    mark("duplicate_date", valid & (repeated | seen))
+    steps = np.where(valid & (previous_max != INVALID_DAY), days - previous_max, 0)
+    mark("gap_before", steps > max_gap)
+
+    # Values: NaN compares as False, so missing values only raise missing_value
+    mark("missing_value", np.isnan(prices).any(axis=1))
+    mark("high_below_low", high < low * (1 - PRICE_TOLERANCE))
+    slack_low, slack_high = low * (1 - PRICE_TOLERANCE), high * (1 + PRICE_TOLERANCE)
+    mark("close_outside_range", (close < slack_low) | (close > slack_high))
+    mark("open_outside_range", (open_ < slack_low) | (open_ > slack_high))
+    mark("nonpositive_volume", volume <= 0)
+
+    # Adj Close/Close ratio: in (0, 1] and stepping only slightly from one row to the next
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = adj_close / close
+    usable = np.isfinite(ratio)
+    bad_ratio = usable & ((ratio <= 0) | (ratio > 1 + RATIO_SLACK))
+    good = usable & ~bad_ratio
+    # Previous good ratio of each row, carried forward over the rows that are not good
+    last_good = np.maximum.accumulate(np.where(good, np.arange(days.size), -1))
+    previous_index = np.concatenate([[-1], last_good[:-1]])
+    previous_ratio = np.where(previous_index >= 0, ratio[np.maximum(previous_index, 0)], state["ratio"])
+    with np.errstate(invalid="ignore"):
+        jump = good & (np.abs(ratio / previous_ratio - 1) > RATIO_JUMP)
+    mark("adj_close_divergence", bad_ratio | jump)
+
+    # Carry the state into the next chunk
+    if valid.any():
+        state["max_day"] = max(state["max_day"], int(days.max()))
+        state["min_day"] = min(state["min_day"], int(days[valid].min()))
+        state["seen"] = np.union1d(state["seen"], days[valid])
+        state["longest_gap"] = max(state["longest_gap"], int(steps.max()))
+    if good.any():
+        state["ratio"] = float(ratio[last_good[-1]])
+    return flags
+
+
+def validate_file(path, chunk_rows=CHUNK_ROWS):
+    """
+    Check every row of a raw price file.
+
+    Args:
+        path (str): Path to a "*_stock_data.csv" or "*_crypto_data.csv" file.
+        chunk_rows (int): Rows parsed and checked at a time.
+
+    Returns:
+        tuple: (summary dict, uint16 flags per row in file order). The summary holds the
+        file name, ticker, market, rows, first/last date, one count per rule, the longest
+        gap in days, the rows flagged by any rule and the rows the cleaning stage drops.
+    """
+    market = market_of(path)
+    state = new_state()
+    chunks = []
+
+    # Skip the "Ticker" and "Date" header lines; the first ("Price") column holds the dates
+    reader = pd.read_csv(path, header=0, skiprows=[1, 2], usecols=["Price"] + PRICE_FIELDS, chunksize=chunk_rows)
+    for chunk in reader:
+        # Values that are not numbers become missing values (only text columns need converting)
+        values = chunk[PRICE_FIELDS]
+        text = [column for column in PRICE_FIELDS if not pd.api.types.is_numeric_dtype(values[column])]
+        if len(text):
+            values = values.assign(**{column: pd.to_numeric(values[column], errors="coerce") for column in text})
+        prices = values.to_numpy(dtype=np.float64)
+        # Only the day is checked, so parse the "YYYY-MM-DD" part (also of timestamps)
+        # with an explicit format, which every supported pandas version accepts
+        day_text = chunk["Price"].astype(str).str.slice(0, 10)
+        dates = pd.to_datetime(day_text, format="%Y-%m-%d", errors="coerce").to_numpy()
+        days = dates.astype("datetime64[D]").astype(np.int64)
+        days[np.isnat(dates)] = INVALID_DAY
+        chunks.append(check_chunk(days, prices, state, MAX_GAP_DAYS[market]))
+
+    flags = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.uint16)
+    summary = {
+        "file": os.path.basename(path),
+        "ticker": read_ticker(path),
+        "market": market,
+        "rows": int(flags.size),
+        "first_date": None if state["max_day"] == INVALID_DAY else str(np.datetime64(state["min_day"], "D")),
+        "last_date": None if state["max_day"] == INVALID_DAY else str(np.datetime64(state["max_day"], "D")),
+    }
+    for rule in RULES:
+        summary[rule] = int(np.count_nonzero(flags & RULE_BITS[rule]))
+    summary["longest_gap_days"] = state["longest_gap"]
+    summary["flagged_rows"] = int(np.count_nonzero(flags))
+    summary["dropped_rows"] = int(np.count_nonzero(~keep_mask(flags)))
+    return summary, flags
+
+
+def keep_mask(flags, rules=DROP_RULES):
+    """
+    Turn row flags into the mask of rows the cleaning stage keeps.
+
+    Args:
+        flags (np.ndarray): uint16 flags from validate_file().
+        rules (list of str): Rules whose rows are dropped.
+
+    Returns:
+        np.ndarray: True for rows breaking none of the rules.
+    """
+    drop = np.uint16(0)
+    for rule in rules:
+        drop |= RULE_BITS[rule]
+    return (flags & drop) == 0
+
+
+def rule_masks(flags):
+    """
+    Expand row flags into one boolean column per rule.
+
+    Args:
+        flags (np.ndarray): uint16 flags from validate_file().
+
+    Returns:
+        pd.DataFrame: One column per rule in RULES.
+    """
+    return pd.DataFrame({rule: (flags & RULE_BITS[rule]) != 0 for rule in RULES})
+
+
+def mask_path(mask_dir, path):
+    """
+    Build the path of the saved flags of a price file.
+
+    Args:
+        mask_dir (str): Folder holding the saved flags.
+        path (str): Price file.
+
+    Returns:
+        str: "{mask_dir}/{file name without .csv}.npy".
+    """
+    return os.path.join(mask_dir, os.path.splitext(os.path.basename(path))[0] + ".npy")
+
+
+def load_flags(mask_dir, path):
+    """
+    Read the flags saved for a price file by validate_batch().
+
+    Args:
+        mask_dir (str): Folder holding the saved flags.
+        path (str): Price file.
+
+    Returns:
+        np.ndarray: uint16 flags per row in file order.
+    """
+    return np.load(mask_path(mask_dir, path))
+
+
+def _validate_job(job):
+    """
+    Validate one file and optionally save its flags (executed inside a worker process).
+
+    Args:
+        job (tuple): (path, mask folder or None, chunk_rows).
+
+    Returns:
+        tuple: (summary dict, flags or None if they were saved).
+    """
+    path, mask_dir, chunk_rows = job
+    summary, flags = validate_file(path, chunk_rows)
+    if mask_dir is None:
+        return summary, flags
+    # Write to a temporary file first so an interrupted batch never leaves broken flags
+    target = mask_path(mask_dir, path)
+    with open(target + ".tmp", "wb") as handle:
+        np.save(handle, flags)
+    os.replace(target + ".tmp", target)
+    return summary, None
+
+
+def validate_batch(paths=None, workers=None, mask_dir=None, chunk_rows=CHUNK_ROWS):
+    """
+    Validate many price files in parallel.
+
+    Args:
+        paths (list of str or None): Files to check; defaults to the raw files in DATA_DIR.
+        workers (int or None): Number of worker processes (None uses all cores, 1 runs
+            in the current process).
+        mask_dir (str or None): Folder to save each file's flags in (see load_flags);
+            when None the flags are returned instead.
+        chunk_rows (int): Rows parsed and checked at a time.
+
+    Returns:
+        tuple: (pd.DataFrame with one summary row per file, dict of file path to flags,
+        empty if the flags were saved to mask_dir).
+    """
+    paths = price_file_paths() if paths is None else list(paths)
+    if mask_dir is not None:
+        os.makedirs(mask_dir, exist_ok=True)
+    jobs = [(path, mask_dir, chunk_rows) for path in paths]
+
+    if workers == 1 or len(jobs) <= 1:
+        results = list(map(_validate_job, jobs))
+    else:
+        # Small files are sent to the workers in batches to keep the overhead low
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            batch = max(1, len(jobs) // (4 * (workers or os.cpu_count())))
+            results = list(pool.map(_validate_job, jobs, chunksize=batch))
+
+    summary = pd.DataFrame([result[0] for result in results],
+                           columns=["file", "ticker", "market", "rows", "first_date", "last_date"] + RULES
+                           + ["longest_gap_days", "flagged_rows", "dropped_rows"])
+    flags = {path: result[1] for path, result in zip(paths, results) if result[1] is not None}
+    return summary, flags
+
+
+def main(argv=None):
+    """
+    Command-line entry point: validate price files and print the per-file summary.
+
+    Args:
+        argv (list of str or None): Arguments; defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Check raw price files before cleaning.")
+    parser.add_argument("paths", nargs="*", help="price files (default: the raw files in the data folder)")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="folder searched when no paths are given")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--masks", default=None, metavar="DIR", help="save each file's row flags here")
+    parser.add_argument("--all", action="store_true", help="list every file, not only those with issues")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or price_file_paths(args.data_dir)
+    summary, _ = validate_batch(paths, args.workers, args.masks)
+    shown = summary if args.all else summary[summary["flagged_rows"] > 0]
+    # Only show the rules that were broken somewhere
+    columns = ["file", "rows"] + [rule for rule in RULES if summary[rule].any()] + ["longest_gap_days", "dropped_rows"]
+    print(f"Checked {len(summary)} file(s), {int(summary['rows'].sum())} rows; "
+          f"{int((summary['flagged_rows'] > 0).sum())} file(s) with issues.")
+    if len(shown):
+        print(shown[columns].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the feature engine for the stock and cryptocurrency
+analysis. It computes daily returns, log returns, High-Low volatility and rolling
+mean/std/Sharpe statistics for every asset at once on a 2-D (dates x assets) NumPy
+array, and emits the results as a single block instead of inserting one column at a time.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Number of trading periods used to annualise the rolling Sharpe ratio
+PERIODS_PER_YEAR = 252
+
+
+def extract_field_matrix(df, field, tickers=None):
+    """
+    Extract one field (e.g. "Adj_Close") for every asset of a wide DataFrame as a 2-D array.
+
+    Args:
+        df (pd.DataFrame): Wide DataFrame with "{ticker}_{field}" columns (e.g. "AAPL_High").
+        field (str): Field name to extract (e.g. "Adj_Close", "High", "Low").
+        tickers (list of str or None): Tickers to extract, in order. If None, every ticker
+            that has a "{ticker}_{field}" column is used, in column order.
+
+    Returns:
+        tuple: (list of tickers, np.ndarray of shape (dates, assets) with dtype float64).
+    """
+    # Discover the tickers from the column names if they were not provided
+    if tickers is None:
+        tickers = []
+        for col in df.columns:
+            # Tickers never contain underscores, so split on the first one only
+            ticker, _, col_field = col.partition("_")
+            if col_field == field:
+                tickers.append(ticker)
+
+    # Select all the columns in one go so pandas builds a single 2-D block
+    columns = [f"{ticker}_{field}" for ticker in tickers]
+    matrix = df[columns].to_numpy(dtype=np.float64)
+    return list(tickers), matrix
+
+
+def _shifted_ratio(values):
+    """
+    Divide every row by the previous row, leaving the first row as NaN.
+
+    Args:
+        values (np.ndarray): 2-D array of shape (dates, assets).
+
+    Returns:
+        np.ndarray: Array of the same shape holding values[t] / values[t - 1].
+    """
+    ratio = np.full(values.shape, np.nan)
+    # Suppress divide-by-zero warnings; the resulting inf/NaN values are left as-is
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio[1:] = values[1:] / values[:-1]
+    return ratio
+
+
+def rolling_mean_std(values, window):
+    """
+    Calculate the rolling mean and sample standard deviation of every column at once.
+
+    Uses cumulative sums so each window costs O(1) regardless of its length. A window
+    containing a NaN produces NaN, matching pandas' rolling(window).mean()/std().
+
+    Args:
+        values (np.ndarray): 2-D array of shape (dates, assets).
+        window (int): Number of rows in each window.
+
+    Returns:
+        tuple: (rolling mean, rolling standard deviation), both of shape (dates, assets).
+    """
+    n_rows = values.shape[0]
+    mean = np.full(values.shape, np.nan)
+    std = np.full(values.shape, np.nan)
+    if window < 1 or n_rows < window:
+        return mean, std
+
+    # Replace NaNs with zeros for the running sums and count the valid values separately
+    missing = np.isnan(values)
+    clean = np.where(missing, 0.0, values)
+
+    # Prepend a row of zeros so that window sums are simple differences
+    zeros = np.zeros((1, values.shape[1]))
+    sum_1 = np.concatenate([zeros, np.cumsum(clean, axis=0)])
+    sum_2 = np.concatenate([zeros, np.cumsum(clean * clean, axis=0)])
+    count = np.concatenate([zeros, np.cumsum(~missing, axis=0)])
+
+    # Window sums for every window ending at rows window-1 ... n_rows-1
+    window_sum = sum_1[window:] - sum_1[:-window]
+    window_sq = sum_2[window:] - sum_2[:-window]
+    window_count = count[window:] - count[:-window]
+    full = window_count == window
+
+    # Mean and sample variance from the running sums (ddof=1, as pandas does)
+    window_mean = window_sum / window
+    mean[window - 1:] = np.where(full, window_mean, np.nan)
+    if window > 1:
+        variance = (window_sq - window * window_mean * window_mean) / (window - 1)
+        # Rounding can push a zero variance slightly negative
+        variance = np.maximum(variance, 0.0)
+        std[window - 1:] = np.where(full, np.sqrt(variance), np.nan)
+    return mean, std
+
+
+def compute_features(close, high=None, low=None, window=30, periods_per_year=PERIODS_PER_YEAR):
+    """
+    Compute every feature for all assets in one vectorised pass.
+
+    Args:
+        close (np.ndarray): Closing (or adjusted closing) prices, shape (dates, assets).
+        high (np.ndarray or None): Daily high prices with the same shape as close.
+        low (np.ndarray or None): Daily low prices with the same shape as close.
+        window (int): Rolling window length in rows (30 in the notebook).
+        periods_per_year (int): Periods used to annualise the rolling Sharpe ratio.
+
+    Returns:
+        dict: Feature name mapped to a 2-D array of shape (dates, assets). Keys are
+        "Daily_Return", "Log_Return", "Rolling_Mean", "Rolling_Std", "Rolling_Sharpe"
+        and, if high and low are given, "Volatility" (the High - Low range).
+    """
+    close = np.asarray(close, dtype=np.float64)
+    ratio = _shifted_ratio(close)
+
+    # Simple and logarithmic daily returns
+    daily_return = ratio - 1.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_return = np.log(ratio)
+
+    # Rolling statistics of the daily returns
+    rolling_mean, rolling_std = rolling_mean_std(daily_return, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rolling_sharpe = rolling_mean / rolling_std * np.sqrt(periods_per_year)
+    # A flat window has no risk, so leave its Sharpe ratio undefined
+    rolling_sharpe[~np.isfinite(rolling_sharpe)] = np.nan
+
+    features = {
+        "Daily_Return": daily_return,
+        "Log_Return": log_return,
+        "Rolling_Mean": rolling_mean,
+        "Rolling_Std": rolling_std,
+        "Rolling_Sharpe": rolling_sharpe,
+    }
+
+    # The notebook defines volatility as the daily High - Low range
+    if high is not None and low is not None:
+        features["Volatility"] = np.asarray(high, dtype=np.float64) - np.asarray(low, dtype=np.float64)
+    return features
+
+
+def features_to_frame(features, tickers, index=None, field="Adj_Close"):
+    """
+    Assemble the feature arrays into one DataFrame built from a single contiguous block.
+
+    Column names follow the notebook: "{ticker}_{field}_Daily_Return" for return-based
+    features and "{ticker}_Volatility" for the High - Low range.
+
+    Args:
+        features (dict): Output of compute_features.
+        tickers (list of str): Ticker for each column of the feature arrays.
+        index (pd.Index or None): Row index for the resulting DataFrame.
+        field (str): Price field the returns were computed from.
+
+    Returns:
+        pd.DataFrame: One column per (feature, ticker) pair.
+    """
+    blocks = []
+    columns = []
+    for name, values in features.items():
+        blocks.append(values)
+        # Volatility is a property of the asset, not of a particular price field
+        if name == "Volatility":
+            columns.extend(f"{ticker}_Volatility" for ticker in tickers)
+        else:
+            columns.extend(f"{ticker}_{field}_{name}" for ticker in tickers)
+
+    # Concatenate once so the DataFrame is backed by a single block
+    data = np.concatenate(blocks, axis=1) if blocks else np.empty((0, 0))
+    return pd.DataFrame(data, index=index, columns=columns)
+
+
+def add_features(df, field="Adj_Close", window=30, periods_per_year=PERIODS_PER_YEAR):
+    """
+    Append every feature for every asset of a wide DataFrame in a single concatenation.
+
+    Args:
+        df (pd.DataFrame): Wide DataFrame with "{ticker}_{field}", "{ticker}_High" and
+            "{ticker}_Low" columns, such as merged_stock_crypto_data_reduced.csv.
+        field (str): Price field used for the returns.
+        window (int): Rolling window length in rows.
+        periods_per_year (int): Periods used to annualise the rolling Sharpe ratio.
+
+    Returns:
+        pd.DataFrame: The original columns followed by the feature block.
+    """
+    tickers, close = extract_field_matrix(df, field)
+
+    # High/Low are optional; volatility is only produced when every ticker has both
+    high = low = None
+    if all(f"{t}_High" in df.columns and f"{t}_Low" in df.columns for t in tickers):
+        _, high = extract_field_matrix(df, "High", tickers)
+        _, low = extract_field_matrix(df, "Low", tickers)
+
+    features = compute_features(close, high, low, window, periods_per_year)
+    block = features_to_frame(features, tickers, index=df.index, field=field)
+    return pd.concat([df, block], axis=1)
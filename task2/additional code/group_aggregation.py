@@ -0,0 +1,255 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the grouped-aggregation engine that produces the
+"{group}_Avg_Return", "{group}_Avg_Volatility" and "{group}_Total_Volume" columns of
+grouped_data.csv. Groups are defined by an asset -> group mapping (stocks/cryptos by
+default, but sectors or exchanges work the same way). Data is streamed in date chunks,
+each chunk is reduced with a single matrix product against a one-hot group matrix, and
+whole-period statistics are kept in accumulators that can be combined across chunks.
+"""
+
+import numpy as np
+import pandas as pd
+
+from schema import read_dtypes
+
+# Default grouping used throughout the notebook
+DEFAULT_GROUPS = {
+    "AAPL": "Stocks",
+    "TSLA": "Stocks",
+    "AMZN": "Stocks",
+    "BTC-USD": "Cryptos",
+    "ETH-USD": "Cryptos",
+}
+
+# Output metric name mapped to (per-asset column suffix, aggregation)
+DEFAULT_METRICS = {
+    "Avg_Return": ("Adj_Close_Daily_Return", "mean"),
+    "Avg_Volatility": ("Volatility", "mean"),
+    "Total_Volume": ("Volume", "sum"),
+}
+
+
+class GroupTotals:
+    """
+    The GroupTotals class accumulates whole-period statistics of each group metric.
+    Accumulators from different chunks (or different workers) can be combined, so the
+    result does not depend on how the data was split.
+
+    Attributes:
+        columns (list of str): Output column names, e.g. "Stocks_Avg_Return".
+        count (np.ndarray): Number of non-missing rows per column.
+        total (np.ndarray): Sum of the values per column.
+        total_sq (np.ndarray): Sum of the squared values per column.
+        minimum (np.ndarray): Smallest value per column.
+        maximum (np.ndarray): Largest value per column.
+    """
+
+    def __init__(self, columns):
+        """
+        Initialise empty accumulators.
+
+        Args:
+            columns (list of str): Output column names.
+        """
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.count = np.zeros(size)
+        self.total = np.zeros(size)
+        self.total_sq = np.zeros(size)
+        self.minimum = np.full(size, np.inf)
+        self.maximum = np.full(size, -np.inf)
+
+    def update(self, values):
+        """
+        Add one chunk of aggregated rows.
+
+        Args:
+            values (np.ndarray): Array of shape (rows, columns); NaNs are ignored.
+        """
+        present = ~np.isnan(values)
+        clean = np.where(present, values, 0.0)
+        self.count += present.sum(axis=0)
+        self.total += clean.sum(axis=0)
+        self.total_sq += (clean * clean).sum(axis=0)
+        if values.shape[0]:
+            # fmin/fmax ignore NaNs as long as one side is a number
+            self.minimum = np.fmin(self.minimum, np.nanmin(np.where(present, values, np.inf), axis=0))
+            self.maximum = np.fmax(self.maximum, np.nanmax(np.where(present, values, -np.inf), axis=0))
+
+    def combine(self, other):
+        """
+        Merge the accumulators of another GroupTotals with the same columns.
+
+        Args:
+            other (GroupTotals): Accumulators to merge into this one.
+
+        Returns:
+            GroupTotals: This instance, for chaining.
+        """
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.minimum = np.fmin(self.minimum, other.minimum)
+        self.maximum = np.fmax(self.maximum, other.maximum)
+        return self
+
+    def summary(self):
+        """
+        Summarise the accumulated statistics.
+
+        Returns:
+            pd.DataFrame: One row per output column with count, mean, std, min, max and sum.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = self.total / self.count
+            # Sample variance (ddof=1), matching pandas' describe()
+            variance = (self.total_sq - self.count * mean * mean) / (self.count - 1)
+        return pd.DataFrame({
+            "count": self.count,
+            "mean": mean,
+            "std": np.sqrt(np.maximum(variance, 0.0)),
+            "min": np.where(self.count > 0, self.minimum, np.nan),
+            "max": np.where(self.count > 0, self.maximum, np.nan),
+            "sum": self.total,
+        }, index=self.columns)
+
+
+class GroupAggregator:
+    """
+    The GroupAggregator class reduces per-asset columns to per-group columns for every
+    date, one chunk of dates at a time.
+
+    Attributes:
+        asset_groups (dict): Asset ticker mapped to its group name.
+        metrics (dict): Output metric mapped to (column suffix, "mean" or "sum").
+        groups (list of str): Group names in first-seen order.
+        assets (list of str): Asset tickers in mapping order.
+        membership (np.ndarray): One-hot (assets x groups) matrix.
+        columns (list of str): Output column names, metric-major ("Stocks_Avg_Return",
+            "Cryptos_Avg_Return", "Stocks_Avg_Volatility", ...), as in grouped_data.csv.
+    """
+
+    def __init__(self, asset_groups=None, metrics=None):
+        """
+        Initialise the aggregator.
+
+        Args:
+            asset_groups (dict or None): Asset -> group mapping; defaults to DEFAULT_GROUPS.
+            metrics (dict or None): Metric definitions; defaults to DEFAULT_METRICS.
+        """
+        self.asset_groups = dict(DEFAULT_GROUPS if asset_groups is None else asset_groups)
+        self.metrics = dict(DEFAULT_METRICS if metrics is None else metrics)
+        self.assets = list(self.asset_groups)
+        self.groups = list(dict.fromkeys(self.asset_groups.values()))
+
+        # One-hot membership matrix so that group sums become one matrix product
+        group_pos = {group: i for i, group in enumerate(self.groups)}
+        self.membership = np.zeros((len(self.assets), len(self.groups)))
+        for i, asset in enumerate(self.assets):
+            self.membership[i, group_pos[self.asset_groups[asset]]] = 1.0
+
+        self.columns = [f"{group}_{metric}" for metric in self.metrics for group in self.groups]
+
+    def input_columns(self):
+        """
+        List the per-asset columns needed from the input data.
+
+        Returns:
+            list of str: Column names such as "AAPL_Volume".
+        """
+        return [f"{asset}_{suffix}" for suffix, _ in self.metrics.values() for asset in self.assets]
+
+    def aggregate_values(self, chunk):
+        """
+        Aggregate one chunk of rows.
+
+        Args:
+            chunk (pd.DataFrame): Rows containing every column from input_columns().
+
+        Returns:
+            np.ndarray: Array of shape (rows, len(columns)).
+        """
+        blocks = []
+        for suffix, how in self.metrics.values():
+            values = chunk[[f"{asset}_{suffix}" for asset in self.assets]].to_numpy(dtype=np.float64)
+            present = ~np.isnan(values)
+
+            # Group sums and counts of the non-missing values
+            sums = np.where(present, values, 0.0) @ self.membership
+            if how == "sum":
+                blocks.append(sums)
+            elif how == "mean":
+                counts = present.astype(np.float64) @ self.membership
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    blocks.append(np.where(counts > 0, sums / counts, np.nan))
+            else:
+                raise ValueError(f"Unsupported aggregation '{how}'.")
+        return np.concatenate(blocks, axis=1)
+
+    def aggregate_frame(self, df, date_column="Date"):
+        """
+        Aggregate an in-memory DataFrame.
+
+        Args:
+            df (pd.DataFrame): Wide per-asset data, e.g. reordered_cleaned_data.csv.
+            date_column (str): Name of the date column to carry over.
+
+        Returns:
+            pd.DataFrame: Date column followed by the group columns.
+        """
+        grouped = pd.DataFrame(self.aggregate_values(df), index=df.index, columns=self.columns)
+        grouped.insert(0, date_column, df[date_column].to_numpy())
+        return grouped
+
+    def aggregate_chunks(self, chunks, date_column="Date", totals=None):
+        """
+        Aggregate an iterator of DataFrame chunks lazily.
+
+        Args:
+            chunks (iterable of pd.DataFrame): Chunks of consecutive dates.
+            date_column (str): Name of the date column to carry over.
+            totals (GroupTotals or None): Accumulators updated with every chunk.
+
+        Yields:
+            pd.DataFrame: Aggregated rows for each chunk.
+        """
+        for chunk in chunks:
+            grouped = self.aggregate_frame(chunk, date_column)
+            if totals is not None:
+                totals.update(grouped[self.columns].to_numpy(dtype=np.float64))
+            yield grouped
+
+    def aggregate_csv(self, input_path, output_path=None, chunksize=100_000, date_column="Date"):
+        """
+        Stream a wide CSV file through the aggregator with bounded memory.
+
+        Only the needed columns are parsed, and at most one chunk is held at a time.
+
+        Args:
+            input_path (str): Wide per-asset CSV file.
+            output_path (str or None): File to write the grouped rows to. If None, the
+                grouped rows are concatenated and returned instead.
+            chunksize (int): Number of rows per chunk.
+            date_column (str): Name of the date column.
+
+        Returns:
+            tuple: (GroupTotals for the whole file, grouped DataFrame or None if written
+            to output_path).
+        """
+        totals = GroupTotals(self.columns)
+        columns = [date_column] + self.input_columns()
+        # Parse the measurement columns straight into their compact schema dtypes
+        chunks = pd.read_csv(input_path, usecols=columns, dtype=read_dtypes(columns), chunksize=chunksize)
+        results = self.aggregate_chunks(chunks, date_column, totals)
+
+        if output_path is None:
+            parts = list(results)
+            grouped = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=[date_column] + self.columns)
+            return totals, grouped
+
+        # Append each chunk to the output file, writing the header only once
+        for i, grouped in enumerate(results):
+            grouped.to_csv(output_path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+        return totals, None
@@ -0,0 +1,431 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the hypothesis tests used to compare the return and
+volatility series of two groups (e.g. Stocks_Avg_Return vs Cryptos_Avg_Return), going
+beyond the medians and quartiles shown in the notebook's boxplots. It provides a
+moving-block bootstrap (which keeps the serial dependence of daily series), a
+permutation test, Welch's t-test and the Mann-Whitney U test. Resampling draws every
+index of a chunk as one array, and chunks run in a process pool, each with its own
+random stream spawned from one seed, so results do not depend on the number of workers.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from loaders import DATA_DIR, read_wide_csv
+
+
+def _mean(values):
+    """
+    Mean along the last axis (one value per resample row).
+
+    Args:
+        values (np.ndarray): Array of observations.
+
+    Returns:
+        np.ndarray: Statistic with the last axis removed.
+    """
+    return values.mean(axis=-1)
+
+
+def _median(values):
+    """
+    Median along the last axis (one value per resample row).
+
+    Args:
+        values (np.ndarray): Array of observations.
+
+    Returns:
+        np.ndarray: Statistic with the last axis removed.
+    """
+    return np.median(values, axis=-1)
+
+
+def _std(values):
+    """
+    Sample standard deviation (ddof=1) along the last axis (one value per resample row).
+
+    Args:
+        values (np.ndarray): Array of observations.
+
+    Returns:
+        np.ndarray: Statistic with the last axis removed.
+    """
+    return values.std(axis=-1, ddof=1)
+
+
+# Statistics compared by the resampling tests, applied along the last axis
+STATISTICS = {"mean": _mean, "median": _median, "std": _std}
+
+DEFAULT_RESAMPLES = 10_000
+CHUNK_SIZE = 2_000  # Resamples generated per chunk (bounds the index array size)
+
+
+def _beta_continued_fraction(a, b, x):
+    """
+    Evaluate the continued fraction of the regularised incomplete beta function
+    (modified Lentz's method).
+
+    Args:
+        a (float): First shape parameter.
+        b (float): Second shape parameter.
+        x (float): Point in [0, 1].
+
+    Returns:
+        float: Value of the continued fraction.
+    """
+    tiny = 1e-300
+    c = 1.0
+    d = 1.0 - (a + b) * x / (a + 1.0)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, 300):
+        # Even step
+        numerator = m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m))
+        d = 1.0 + numerator * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + numerator / c
+        c = c if abs(c) > tiny else tiny
+        result *= d * c
+        # Odd step
+        numerator = -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))
+        d = 1.0 + numerator * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + numerator / c
+        c = c if abs(c) > tiny else tiny
+        step = d * c
+        result *= step
+        if abs(step - 1.0) < 1e-14:
+            break
+    return result
+
+
+def incomplete_beta(a, b, x):
+    """
+    Compute the regularised incomplete beta function I_x(a, b).
+
+    Args:
+        a (float): First shape parameter.
+        b (float): Second shape parameter.
+        x (float): Point in [0, 1].
+
+    Returns:
+        float: I_x(a, b).
+    """
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    log_front = (math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                 + a * math.log(x) + b * math.log1p(-x))
+    # The continued fraction converges quickly on one side of the mean; use symmetry otherwise
+    if x < (a + 1.0) / (a + b + 2.0):
+        return math.exp(log_front) * _beta_continued_fraction(a, b, x) / a
+    return 1.0 - math.exp(log_front) * _beta_continued_fraction(b, a, 1.0 - x) / b
+
+
+def t_two_sided_p(statistic, dof):
+    """
+    Two-sided p-value of a Student t statistic.
+
+    Args:
+        statistic (float): t statistic.
+        dof (float): Degrees of freedom (need not be an integer).
+
+    Returns:
+        float: P(|T| >= |statistic|).
+    """
+    if not np.isfinite(statistic):
+        return 0.0 if np.isinf(statistic) else float("nan")
+    return incomplete_beta(dof / 2.0, 0.5, dof / (dof + statistic * statistic))
+
+
+def normal_two_sided_p(z):
+    """
+    Two-sided p-value of a standard normal statistic.
+
+    Args:
+        z (float): z statistic.
+
+    Returns:
+        float: P(|Z| >= |z|).
+    """
+    return math.erfc(abs(z) / math.sqrt(2.0))
+
+
+def _clean(values):
+    """
+    Convert a series to a float64 array without missing values.
+
+    Args:
+        values (array-like): Observations.
+
+    Returns:
+        np.ndarray: Finite observations.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    return values[np.isfinite(values)]
+
+
+def welch_test(x, y):
+    """
+    Welch's unequal-variance t-test for a difference in means.
+
+    Args:
+        x (array-like): First sample.
+        y (array-like): Second sample.
+
+    Returns:
+        dict: "statistic", "dof", "p_value" and "difference" (mean of x minus mean of y).
+    """
+    x, y = _clean(x), _clean(y)
+    var_x = x.var(ddof=1) / x.size
+    var_y = y.var(ddof=1) / y.size
+    difference = x.mean() - y.mean()
+    statistic = difference / math.sqrt(var_x + var_y)
+    # Welch-Satterthwaite degrees of freedom
+    dof = (var_x + var_y) ** 2 / (var_x ** 2 / (x.size - 1) + var_y ** 2 / (y.size - 1))
+    return {"statistic": statistic, "dof": dof, "p_value": t_two_sided_p(statistic, dof),
+            "difference": difference}
+
+
+def mann_whitney_test(x, y):
+    """
+    Mann-Whitney U test (normal approximation with tie and continuity corrections).
+
+    Args:
+        x (array-like): First sample.
+        y (array-like): Second sample.
+
+    Returns:
+        dict: "statistic" (U of x), "z", "p_value" and "effect" (probability that a value
+        of x exceeds a value of y, counting ties as one half).
+    """
+    x, y = _clean(x), _clean(y)
+    n_x, n_y = x.size, y.size
+    pooled = np.concatenate([x, y])
+    total = pooled.size
+
+    # Average ranks of tied values, computed from the sorted unique values
+    _, inverse, counts = np.unique(pooled, return_inverse=True, return_counts=True)
+    upper = np.cumsum(counts)
+    ranks = (upper - (counts - 1) / 2.0)[inverse]
+
+    u_x = ranks[:n_x].sum() - n_x * (n_x + 1) / 2.0
+    mean_u = n_x * n_y / 2.0
+    tie_term = (counts ** 3 - counts).sum() / (total * (total - 1))
+    sigma = math.sqrt(n_x * n_y / 12.0 * ((total + 1) - tie_term))
+    z = (u_x - mean_u - 0.5 * np.sign(u_x - mean_u)) / sigma if sigma > 0 else 0.0
+    return {"statistic": u_x, "z": z, "p_value": normal_two_sided_p(z), "effect": u_x / (n_x * n_y)}
+
+
+def block_indices(rng, n, size, block_length):
+    """
+    Draw moving-block bootstrap indices for several resamples as one array.
+
+    Blocks wrap around the end of the series (circular bootstrap), so every observation
+    is equally likely to be drawn.
+
+    Args:
+        rng (np.random.Generator): Random stream.
+        n (int): Length of the series.
+        size (int): Number of resamples.
+        block_length (int): Observations per block.
+
+    Returns:
+        np.ndarray: Integer array of shape (size, n).
+    """
+    blocks = -(-n // block_length)
+    starts = rng.integers(0, n, size=(size, blocks, 1))
+    indices = (starts + np.arange(block_length)) % n
+    return indices.reshape(size, blocks * block_length)[:, :n]
+
+
+def _resample_chunk(job):
+    """
+    Compute the resampled statistic differences of one chunk (run inside a worker).
+
+    Args:
+        job (tuple): (kind, x, y, size, seed sequence, statistic name, block length).
+
+    Returns:
+        np.ndarray: One statistic difference per resample.
+    """
+    kind, x, y, size, seed, statistic, block_length = job
+    rng = np.random.default_rng(seed)
+    function = STATISTICS[statistic]
+    if kind == "bootstrap":
+        # The same indices are used for both series, keeping their cross-dependence
+        indices = block_indices(rng, x.size, size, block_length)
+        return function(x[indices]) - function(y[indices])
+
+    # Permutation: ranking random keys gives one random ordering per row
+    pooled = np.concatenate([x, y])
+    order = np.argsort(rng.random((size, pooled.size)), axis=1)
+    shuffled = pooled[order]
+    return function(shuffled[:, :x.size]) - function(shuffled[:, x.size:])
+
+
+def _resample(kind, x, y, n_resamples, statistic, block_length, seed, n_jobs, chunk_size):
+    """
+    Split resampling into chunks with independent seeded streams and run them.
+
+    Args:
+        kind (str): "bootstrap" or "permutation".
+        x (np.ndarray): First sample.
+        y (np.ndarray): Second sample.
+        n_resamples (int): Total number of resamples.
+        statistic (str): Key of STATISTICS.
+        block_length (int or None): Bootstrap block length.
+        seed (int or None): Seed of the parent random stream.
+        n_jobs (int or None): Number of worker processes (None uses all cores, 1 runs in
+            the current process).
+        chunk_size (int): Resamples per chunk.
+
+    Returns:
+        np.ndarray: All resampled statistic differences, in chunk order.
+    """
+    if statistic not in STATISTICS:
+        raise ValueError(f"Unknown statistic '{statistic}'.")
+    sizes = [min(chunk_size, n_resamples - first) for first in range(0, n_resamples, chunk_size)]
+    # One child stream per chunk, so the result is the same for any number of workers
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(kind, x, y, size, child, statistic, block_length) for size, child in zip(sizes, seeds)]
+
+    if n_jobs == 1 or len(jobs) == 1:
+        results = list(map(_resample_chunk, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs or os.cpu_count()) as pool:
+            results = list(pool.map(_resample_chunk, jobs))
+    return np.concatenate(results)
+
+
+def block_bootstrap_test(x, y, statistic="mean", n_resamples=DEFAULT_RESAMPLES, block_length=None,
+                         confidence=0.95, seed=None, n_jobs=None, chunk_size=CHUNK_SIZE):
+    """
+    Moving-block bootstrap test for a difference in a statistic of two aligned series.
+
+    Both series are resampled with the same blocks of dates, so autocorrelation within
+    each series and correlation between them are preserved. The p-value comes from the
+    bootstrap distribution centred on the observed difference.
+
+    Args:
+        x (array-like): First series (e.g. Stocks_Avg_Return).
+        y (array-like): Second series on the same dates (e.g. Cryptos_Avg_Return).
+        statistic (str): "mean", "median" or "std".
+        n_resamples (int): Number of bootstrap resamples.
+        block_length (int or None): Observations per block; defaults to n ** (1/3).
+        confidence (float): Confidence level of the percentile interval.
+        seed (int or None): Seed for reproducible results.
+        n_jobs (int or None): Number of worker processes.
+        chunk_size (int): Resamples per chunk.
+
+    Returns:
+        dict: "statistic" (observed difference), "p_value", "ci_low", "ci_high",
+        "block_length" and "n_resamples".
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if x.shape != y.shape:
+        raise ValueError("The block bootstrap needs two series on the same dates.")
+    # Keep the dates where both series are present
+    both = np.isfinite(x) & np.isfinite(y)
+    x, y = x[both], y[both]
+    block_length = max(1, round(x.size ** (1 / 3))) if block_length is None else block_length
+
+    if statistic not in STATISTICS:
+        raise ValueError(f"Unknown statistic '{statistic}'.")
+    observed = STATISTICS[statistic](x) - STATISTICS[statistic](y)
+    boot = _resample("bootstrap", x, y, n_resamples, statistic, block_length, seed, n_jobs, chunk_size)
+
+    tail = (1 - confidence) / 2
+    ci_low, ci_high = np.quantile(boot, [tail, 1 - tail])
+    p_value = (1 + np.count_nonzero(np.abs(boot - observed) >= abs(observed))) / (1 + boot.size)
+    return {"statistic": observed, "p_value": p_value, "ci_low": ci_low, "ci_high": ci_high,
+            "block_length": block_length, "n_resamples": n_resamples}
+
+
+def permutation_test(x, y, statistic="mean", n_resamples=DEFAULT_RESAMPLES, seed=None, n_jobs=None,
+                     chunk_size=CHUNK_SIZE):
+    """
+    Two-sample permutation test for a difference in a statistic.
+
+    Observations are treated as exchangeable, so serial dependence is ignored; use
+    block_bootstrap_test when that matters.
+
+    Args:
+        x (array-like): First sample.
+        y (array-like): Second sample.
+        statistic (str): "mean", "median" or "std".
+        n_resamples (int): Number of random permutations.
+        seed (int or None): Seed for reproducible results.
+        n_jobs (int or None): Number of worker processes.
+        chunk_size (int): Permutations per chunk.
+
+    Returns:
+        dict: "statistic" (observed difference), "p_value" and "n_resamples".
+    """
+    x, y = _clean(x), _clean(y)
+    if statistic not in STATISTICS:
+        raise ValueError(f"Unknown statistic '{statistic}'.")
+    observed = STATISTICS[statistic](x) - STATISTICS[statistic](y)
+    permuted = _resample("permutation", x, y, n_resamples, statistic, None, seed, n_jobs, chunk_size)
+    p_value = (1 + np.count_nonzero(np.abs(permuted) >= abs(observed))) / (1 + permuted.size)
+    return {"statistic": observed, "p_value": p_value, "n_resamples": n_resamples}
+
+
+def compare_series(x, y, n_resamples=DEFAULT_RESAMPLES, seed=None, n_jobs=None):
+    """
+    Run every test on a pair of aligned series and summarise the results.
+
+    Args:
+        x (array-like): First series.
+        y (array-like): Second series on the same dates.
+        n_resamples (int): Resamples for the bootstrap and permutation tests.
+        seed (int or None): Seed for reproducible results.
+        n_jobs (int or None): Number of worker processes.
+
+    Returns:
+        pd.DataFrame: One row per test with its statistic and p-value.
+    """
+    results = {
+        "welch_t": welch_test(x, y),
+        "mann_whitney_u": mann_whitney_test(x, y),
+        "permutation_mean": permutation_test(x, y, "mean", n_resamples, seed, n_jobs),
+        "block_bootstrap_mean": block_bootstrap_test(x, y, "mean", n_resamples, seed=seed, n_jobs=n_jobs),
+        "block_bootstrap_median": block_bootstrap_test(x, y, "median", n_resamples, seed=seed, n_jobs=n_jobs),
+    }
+    return pd.DataFrame({name: {"statistic": result["statistic"], "p_value": result["p_value"]}
+                         for name, result in results.items()}).T
+
+
+def compare_groups(path=os.path.join(DATA_DIR, "cleaned_grouped_data.csv"), groups=("Stocks", "Cryptos"),
+                   metrics=("Avg_Return", "Avg_Volatility"), n_resamples=DEFAULT_RESAMPLES, seed=None,
+                   n_jobs=None):
+    """
+    Compare two groups on each metric of the grouped dataset.
+
+    Args:
+        path (str): Grouped CSV file with "{group}_{metric}" columns.
+        groups (tuple of str): The two groups to compare.
+        metrics (iterable of str): Metrics to compare.
+        n_resamples (int): Resamples for the bootstrap and permutation tests.
+        seed (int or None): Seed for reproducible results.
+        n_jobs (int or None): Number of worker processes.
+
+    Returns:
+        pd.DataFrame: Test results indexed by (metric, test).
+    """
+    first, second = groups
+    df = read_wide_csv(path)
+    tables = {}
+    for metric in metrics:
+        x = df[f"{first}_{metric}"].to_numpy(dtype=np.float64)
+        y = df[f"{second}_{metric}"].to_numpy(dtype=np.float64)
+        tables[metric] = compare_series(x, y, n_resamples, seed, n_jobs)
+    return pd.concat(tables, names=["metric", "test"])
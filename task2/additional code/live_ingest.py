@@ -0,0 +1,477 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the live ingestion mode. Ticks for the same assets as the
+daily files (AAPL, TSLA, AMZN, BTC-USD, ETH-USD) are read from a pluggable source (a
+local socket, a tailed file, or an in-memory replay), aggregated into OHLCV bars, and
+every closed bar updates the bar-to-bar return, the High-Low volatility used in the notebook
+and the stock/crypto group metrics incrementally. The reader and the aggregator are
+separate asyncio tasks joined by a bounded queue, so a slow consumer pauses the source
+(backpressure) instead of letting memory grow.
+
+Tick format: one "timestamp,ticker,price,size" line per trade, with the timestamp in
+seconds since the epoch.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from collections import deque
+
+from group_aggregation import DEFAULT_GROUPS
+
+BAR_SECONDS = 60
+QUEUE_SIZE = 64  # Batches of ticks held between the reader and the aggregator
+BATCH_SIZE = 1024  # Ticks read per batch
+
+
+def parse_ticks(lines):
+    """
+    Parse raw tick lines, skipping blank or malformed lines.
+
+    Args:
+        lines (iterable of str or bytes): Lines in "timestamp,ticker,price,size" format.
+
+    Returns:
+        list of tuple: (timestamp, ticker, price, size) ticks.
+    """
+    ticks = []
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode()
+        parts = line.strip().split(",")
+        if len(parts) != 4:
+            continue
+        try:
+            ticks.append((float(parts[0]), parts[1], float(parts[2]), float(parts[3])))
+        except ValueError:
+            # Header lines and corrupt records are dropped
+            continue
+    return ticks
+
+
+class ReplaySource:
+    """
+    The ReplaySource class replays tick lines held in memory (useful for tests and
+    benchmarks).
+
+    Attributes:
+        lines (list of str): Tick lines to replay.
+        batch_size (int): Lines per batch.
+    """
+
+    def __init__(self, lines, batch_size=BATCH_SIZE):
+        """
+        Initialise the source.
+
+        Args:
+            lines (iterable of str): Tick lines to replay.
+            batch_size (int): Lines per batch.
+        """
+        self.lines = list(lines)
+        self.batch_size = batch_size
+
+    async def batches(self):
+        """
+        Yield the lines in batches.
+
+        Yields:
+            list of str: One batch of lines.
+        """
+        for first in range(0, len(self.lines), self.batch_size):
+            yield self.lines[first:first + self.batch_size]
+            # Give the aggregator a chance to run between batches
+            await asyncio.sleep(0)
+
+
+class FileTailSource:
+    """
+    The FileTailSource class follows a file that another process appends ticks to, like
+    "tail -f".
+
+    Attributes:
+        path (str): File to follow.
+        from_start (bool): Read the existing contents first instead of only new lines.
+        poll_interval (float): Seconds to wait when no new data is available.
+        idle_timeout (float or None): Stop after this many seconds without new data.
+        batch_size (int): Maximum lines per batch.
+    """
+
+    def __init__(self, path, from_start=True, poll_interval=0.1, idle_timeout=None, batch_size=BATCH_SIZE):
+        """
+        Initialise the source.
+
+        Args:
+            path (str): File to follow.
+            from_start (bool): Read the existing contents first.
+            poll_interval (float): Seconds to wait when no new data is available.
+            idle_timeout (float or None): Stop after this many idle seconds; None follows forever.
+            batch_size (int): Maximum lines per batch.
+        """
+        self.path = path
+        self.from_start = from_start
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.batch_size = batch_size
+
+    async def batches(self):
+        """
+        Yield complete lines as they are appended to the file. When idle_timeout
+        expires, a last line without a newline is yielded before stopping.
+
+        Yields:
+            list of str: One batch of lines.
+        """
+        with open(self.path) as handle:
+            if not self.from_start:
+                handle.seek(0, os.SEEK_END)
+            partial = ""
+            idle = 0.0
+            while True:
+                lines = handle.readlines(self.batch_size * 64)
+                if not lines:
+                    if self.idle_timeout is not None and idle >= self.idle_timeout:
+                        # The writer has stopped, so an unterminated last line is complete
+                        if partial:
+                            yield [partial]
+                        return
+                    await asyncio.sleep(self.poll_interval)
+                    idle += self.poll_interval
+                    continue
+                idle = 0.0
+                # A line without a newline is still being written; keep it for the next read
+                lines[0] = partial + lines[0]
+                partial = "" if lines[-1].endswith("\n") else lines.pop()
+                if lines:
+                    yield lines
+
+
+class SocketSource:
+    """
+    The SocketSource class reads tick lines from a TCP feed (e.g. a local socket that a
+    market-data process writes to).
+
+    Attributes:
+        host (str): Host of the feed.
+        port (int): Port of the feed.
+        batch_size (int): Maximum lines per batch.
+    """
+
+    def __init__(self, host="127.0.0.1", port=9999, batch_size=BATCH_SIZE):
+        """
+        Initialise the source.
+
+        Args:
+            host (str): Host of the feed.
+            port (int): Port of the feed.
+            batch_size (int): Maximum lines per batch.
+        """
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+
+    async def batches(self):
+        """
+        Yield lines from the connection until the feed closes it.
+
+        Reading stops while the pipeline queue is full, so TCP flow control slows the
+        sender down.
+
+        Yields:
+            list of bytes: One batch of lines.
+        """
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            partial = b""
+            while True:
+                data = await reader.read(self.batch_size * 64)
+                if not data:
+                    break
+                lines = (partial + data).split(b"\n")
+                partial = lines.pop()
+                if lines:
+                    yield lines
+            if partial:
+                yield [partial]
+        finally:
+            writer.close()
+
+
+class BarAggregator:
+    """
+    The BarAggregator class turns ticks into OHLCV bars of a fixed length per ticker.
+
+    Attributes:
+        bar_seconds (float): Length of a bar in seconds.
+        open_bars (dict): Ticker mapped to its bar in progress.
+    """
+
+    def __init__(self, bar_seconds=BAR_SECONDS):
+        """
+        Initialise the aggregator.
+
+        Args:
+            bar_seconds (float): Length of a bar in seconds (86400 gives daily bars).
+        """
+        self.bar_seconds = bar_seconds
+        self.open_bars = {}
+
+    def update(self, ticks):
+        """
+        Add a batch of ticks.
+
+        Ticks older than a ticker's bar in progress are folded into that bar.
+
+        Args:
+            ticks (list of tuple): (timestamp, ticker, price, size) ticks.
+
+        Returns:
+            list of dict: Bars closed by this batch, in closing order.
+        """
+        closed = []
+        open_bars = self.open_bars
+        bar_seconds = self.bar_seconds
+        for timestamp, ticker, price, size in ticks:
+            start = timestamp - timestamp % bar_seconds
+            bar = open_bars.get(ticker)
+            if bar is None or start > bar["Start"]:
+                if bar is not None:
+                    closed.append(bar)
+                open_bars[ticker] = {"Ticker": ticker, "Start": start, "Open": price, "High": price,
+                                     "Low": price, "Close": price, "Volume": size}
+                continue
+            if price > bar["High"]:
+                bar["High"] = price
+            elif price < bar["Low"]:
+                bar["Low"] = price
+            bar["Close"] = price
+            bar["Volume"] += size
+        return closed
+
+    def flush(self):
+        """
+        Close every bar in progress (e.g. when the source ends).
+
+        Returns:
+            list of dict: The bars that were open.
+        """
+        closed = sorted(self.open_bars.values(), key=lambda bar: bar["Start"])
+        self.open_bars = {}
+        return closed
+
+
+class LiveMetrics:
+    """
+    The LiveMetrics class updates per-asset and per-group metrics from closed bars.
+
+    Each asset keeps its latest return ("Close" over the previous bar's close, minus
+    one), High-Low volatility and volume. Group sums are adjusted by the change in the
+    updated asset's values, so a bar costs the same whatever the number of assets.
+
+    Attributes:
+        asset_groups (dict): Asset ticker mapped to its group name.
+        latest (dict): Ticker mapped to its latest "Close", "Return", "Volatility" and "Volume".
+        groups (dict): Group name mapped to running sums and counts of the latest values.
+    """
+
+    def __init__(self, asset_groups=None):
+        """
+        Initialise empty metrics.
+
+        Args:
+            asset_groups (dict or None): Asset -> group mapping; defaults to
+                group_aggregation.DEFAULT_GROUPS.
+        """
+        self.asset_groups = dict(DEFAULT_GROUPS if asset_groups is None else asset_groups)
+        self.latest = {}
+        self.groups = {group: {"return_sum": 0.0, "return_count": 0, "volatility_sum": 0.0,
+                               "volatility_count": 0, "volume": 0.0}
+                       for group in dict.fromkeys(self.asset_groups.values())}
+
+    def update(self, bar):
+        """
+        Update the metrics with one closed bar.
+
+        Args:
+            bar (dict): Bar from BarAggregator.
+
+        Returns:
+            dict: Asset metrics of the bar and the current metrics of its group, named
+            as in grouped_data.csv ("{group}_Avg_Return", "{group}_Avg_Volatility",
+            "{group}_Total_Volume").
+        """
+        ticker = bar["Ticker"]
+        previous = self.latest.get(ticker)
+        current = {
+            "Close": bar["Close"],
+            "Return": bar["Close"] / previous["Close"] - 1.0 if previous else None,
+            "Volatility": bar["High"] - bar["Low"],
+            "Volume": bar["Volume"],
+        }
+        self.latest[ticker] = current
+
+        result = dict(bar, Return=current["Return"], Volatility=current["Volatility"])
+        group = self.asset_groups.get(ticker)
+        if group is None:
+            return result
+
+        # Replace the asset's old contribution to the group sums with the new one
+        sums = self.groups[group]
+        if previous is not None:
+            if previous["Return"] is not None:
+                sums["return_sum"] -= previous["Return"]
+                sums["return_count"] -= 1
+            sums["volatility_sum"] -= previous["Volatility"]
+            sums["volatility_count"] -= 1
+            sums["volume"] -= previous["Volume"]
+        if current["Return"] is not None:
+            sums["return_sum"] += current["Return"]
+            sums["return_count"] += 1
+        sums["volatility_sum"] += current["Volatility"]
+        sums["volatility_count"] += 1
+        sums["volume"] += current["Volume"]
+
+        result[f"{group}_Avg_Return"] = sums["return_sum"] / sums["return_count"] if sums["return_count"] else None
+        result[f"{group}_Avg_Volatility"] = sums["volatility_sum"] / sums["volatility_count"]
+        result[f"{group}_Total_Volume"] = sums["volume"]
+        return result
+
+
+class LivePipeline:
+    """
+    The LivePipeline class runs a source, the bar aggregator and the metrics as asyncio
+    tasks connected by a bounded queue.
+
+    Attributes:
+        source: Object with an async batches() generator yielding lists of tick lines.
+        aggregator (BarAggregator): Bar builder.
+        metrics (LiveMetrics): Incremental metrics.
+        on_bar (callable or None): Called (or awaited, if it is a coroutine function) with
+            the metrics of every closed bar.
+        queue_size (int): Maximum number of batches waiting for the aggregator.
+        history (collections.deque): The most recent bar results.
+        ticks (int): Number of ticks processed.
+        bars (int): Number of bars closed.
+    """
+
+    def __init__(self, source, bar_seconds=BAR_SECONDS, asset_groups=None, on_bar=None,
+                 queue_size=QUEUE_SIZE, history=10_000):
+        """
+        Initialise the pipeline.
+
+        Args:
+            source: Tick source (ReplaySource, FileTailSource, SocketSource or similar).
+            bar_seconds (float): Length of a bar in seconds.
+            asset_groups (dict or None): Asset -> group mapping.
+            on_bar (callable or None): Callback for every closed bar.
+            queue_size (int): Maximum number of batches waiting for the aggregator.
+            history (int): Number of recent bar results to keep.
+        """
+        self.source = source
+        self.aggregator = BarAggregator(bar_seconds)
+        self.metrics = LiveMetrics(asset_groups)
+        self.on_bar = on_bar
+        self.queue_size = queue_size
+        self.history = deque(maxlen=history)
+        self.ticks = 0
+        self.bars = 0
+
+    async def _read(self, queue):
+        """
+        Move parsed batches from the source into the queue.
+
+        Args:
+            queue (asyncio.Queue): Bounded queue; put() waits while it is full.
+        """
+        try:
+            async for lines in self.source.batches():
+                ticks = parse_ticks(lines)
+                if ticks:
+                    await queue.put(ticks)
+        finally:
+            # None tells the aggregator that the source has ended
+            await queue.put(None)
+
+    async def _emit(self, bars):
+        """
+        Update the metrics with closed bars and pass the results on.
+
+        Args:
+            bars (list of dict): Closed bars.
+        """
+        for bar in bars:
+            result = self.metrics.update(bar)
+            self.history.append(result)
+            self.bars += 1
+            if self.on_bar is not None:
+                outcome = self.on_bar(result)
+                if asyncio.iscoroutine(outcome):
+                    await outcome
+
+    async def _aggregate(self, queue):
+        """
+        Consume batches from the queue until the source ends.
+
+        Args:
+            queue (asyncio.Queue): Queue filled by _read.
+        """
+        while True:
+            ticks = await queue.get()
+            if ticks is None:
+                break
+            self.ticks += len(ticks)
+            await self._emit(self.aggregator.update(ticks))
+        await self._emit(self.aggregator.flush())
+
+    async def run(self):
+        """
+        Run the pipeline until the source ends.
+
+        Returns:
+            dict: "ticks", "bars", "seconds" and "ticks_per_second".
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        began = time.perf_counter()
+        reader = asyncio.create_task(self._read(queue))
+        try:
+            await self._aggregate(queue)
+        finally:
+            if not reader.done():
+                reader.cancel()
+        await asyncio.gather(reader, return_exceptions=True)
+        seconds = time.perf_counter() - began
+        return {"ticks": self.ticks, "bars": self.bars, "seconds": seconds,
+                "ticks_per_second": self.ticks / seconds if seconds > 0 else float("inf")}
+
+
+def main(argv=None):
+    """
+    Command-line entry point for live ingestion.
+
+    Args:
+        argv (list of str or None): Arguments; defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Aggregate live ticks into bars and group metrics.")
+    parser.add_argument("--file", help="tick file to follow (timestamp,ticker,price,size lines)")
+    parser.add_argument("--host", default="127.0.0.1", help="host of a TCP tick feed")
+    parser.add_argument("--port", type=int, default=None, help="port of a TCP tick feed")
+    parser.add_argument("--bar-seconds", type=float, default=BAR_SECONDS, help="bar length in seconds")
+    parser.add_argument("--idle-timeout", type=float, default=None, help="stop following the file after this many idle seconds")
+    args = parser.parse_args(argv)
+
+    if args.port is not None:
+        source = SocketSource(args.host, args.port)
+    elif args.file:
+        source = FileTailSource(args.file, idle_timeout=args.idle_timeout)
+    else:
+        parser.error("give --file or --port")
+
+    pipeline = LivePipeline(source, args.bar_seconds, on_bar=print)
+    stats = asyncio.run(pipeline.run())
+    print(f"Processed {stats['ticks']} tick(s) into {stats['bars']} bar(s) "
+          f"({stats['ticks_per_second']:.0f} ticks/s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the shared loaders for the task 2 datasets. It reads the
+raw yfinance price files (which carry a three-line "Price/Ticker/Date" header) and the
+wide merged/cleaned CSV files produced by the notebook. Every loader applies the
+compact dtypes defined in schema.py at read time unless asked not to.
+"""
+
+import glob
+import os
+
+import pandas as pd
+
+from schema import apply_schema, read_dtypes
+
+# Folder holding the CSV files produced by the notebook
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+# Price fields stored by yfinance, in file order
+PRICE_FIELDS = ["Adj Close", "Close", "High", "Low", "Open", "Volume"]
+
+
+def price_file_paths(data_dir=DATA_DIR):
+    """
+    List the raw per-asset price files in a data folder.
+
+    Args:
+        data_dir (str): Folder containing "*_stock_data.csv" and "*_crypto_data.csv" files.
+
+    Returns:
+        list of str: Sorted paths, stocks first and cryptocurrencies second.
+    """
+    stocks = sorted(glob.glob(os.path.join(data_dir, "*_stock_data.csv")))
+    cryptos = sorted(glob.glob(os.path.join(data_dir, "*_crypto_data.csv")))
+    return stocks + cryptos
+
+
+def read_ticker(path):
+    """
+    Read the ticker symbol from the second header line of a raw price file.
+
+    Args:
+        path (str): Path to a raw yfinance CSV file.
+
+    Returns:
+        str: Ticker symbol (e.g. "AAPL" or "BTC-USD").
+    """
+    with open(path) as handle:
+        handle.readline()  # Skip the "Price,Adj Close,..." line
+        # The second line is "Ticker,AAPL,AAPL,..."
+        return handle.readline().strip().split(",")[1]
+
+
+def read_header(path):
+    """
+    Read the column names from the first line of a CSV file.
+
+    Args:
+        path (str): Path to a CSV file.
+
+    Returns:
+        list of str: Column names.
+    """
+    with open(path) as handle:
+        return handle.readline().strip().split(",")
+
+
+def read_price_csv(path, schema=True, return_report=False):
+    """
+    Load a raw yfinance price file.
+
+    Args:
+        path (str): Path to a file such as "AAPL_stock_data.csv".
+        schema (bool): Apply the compact schema dtypes (float32 prices, uint64 volume).
+        return_report (bool): Also return the schema validation report.
+
+    Returns:
+        tuple: (ticker, pd.DataFrame indexed by Date with the PRICE_FIELDS columns),
+        followed by the validation report if return_report is True.
+    """
+    ticker = read_ticker(path)
+    # Skip the "Ticker" and "Date" header lines; the first column holds the dates
+    # The precision report compares against the float64 values, so only parse straight
+    # to float32 when no report is wanted
+    dtypes = read_dtypes(PRICE_FIELDS) if schema and not return_report else None
+    df = pd.read_csv(path, header=0, skiprows=[1, 2], index_col=0, parse_dates=True, dtype=dtypes)
+    df.index.name = "Date"
+    df = df[PRICE_FIELDS]
+
+    report = None
+    if schema:
+        df, report = apply_schema(df)
+    return (ticker, df, report) if return_report else (ticker, df)
+
+
+def read_wide_csv(path, schema=True, return_report=False, usecols=None):
+    """
+    Load a wide dataset (one "{ticker}_{field}" column per asset and field).
+
+    Args:
+        path (str): Path to a file such as "final_cleaned_enriched_data.csv".
+        schema (bool): Apply the compact schema dtypes.
+        return_report (bool): Also return the schema validation report.
+        usecols (list of str or None): Columns to read; defaults to all.
+
+    Returns:
+        pd.DataFrame: Data with the "Date" column parsed as datetimes, followed by the
+        validation report if return_report is True.
+    """
+    columns = read_header(path) if usecols is None else usecols
+    dtypes = read_dtypes(columns) if schema and not return_report else None
+    df = pd.read_csv(path, parse_dates=["Date"], dtype=dtypes, usecols=usecols)
+
+    report = None
+    if schema:
+        df, report = apply_schema(df)
+    return (df, report) if return_report else df
+
+
+def write_price_csv(path, ticker, df):
+    """
+    Save price data in the raw yfinance layout read by read_price_csv and the notebook.
+
+    Daily data keeps the "YYYY-MM-DD" dates of the downloaded files; data with a time of
+    day (intraday bars) is written with full ISO timestamps so the bars stay distinct.
+
+    Args:
+        path (str): Destination file (e.g. "AAPL_stock_data.csv").
+        ticker (str): Ticker symbol written on the "Ticker" header line.
+        df (pd.DataFrame): Price data indexed by date with the PRICE_FIELDS columns.
+    """
+    intraday = (df.index != df.index.normalize()).any() if len(df) else False
+    date_format = "%Y-%m-%dT%H:%M:%S" if intraday else "%Y-%m-%d"
+    with open(path, "w", newline="") as handle:
+        # Recreate the three header lines written by yfinance
+        handle.write(",".join(["Price"] + PRICE_FIELDS) + "\n")
+        handle.write(",".join(["Ticker"] + [ticker] * len(PRICE_FIELDS)) + "\n")
+        handle.write("Date" + "," * len(PRICE_FIELDS) + "\n")
+        df[PRICE_FIELDS].to_csv(handle, header=False, date_format=date_format)
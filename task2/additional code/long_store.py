@@ -0,0 +1,354 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the long-format (tidy) store for the task 2 datasets.
+The notebook keeps one set of "{ticker}_{field}" columns per asset, so adding a ticker
+means rewriting every file and selecting an asset means matching column names. Here the
+rows are stored once per (ticker, date), sorted by ticker and then date, with a sparse
+index holding the first row of every ticker. A ticker/date range is found with one
+binary search, new tickers are appended without rewriting existing rows, and data can be
+converted to and from the wide layout.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from schema import LABEL_DTYPE
+
+
+def split_wide_columns(columns, fields=None):
+    """
+    Group wide "{ticker}_{field}" column names by ticker.
+
+    Tickers never contain underscores ("AAPL", "BTC-USD"), so everything after the first
+    underscore is the field ("Adj_Close_Daily_Return").
+
+    Args:
+        columns (iterable of str): Wide column names; "Date" is skipped.
+        fields (list of str or None): Fields to keep; defaults to every field found.
+
+    Returns:
+        tuple: (dict of ticker -> {field: column} in first-seen order, list of fields in
+        first-seen order).
+    """
+    by_ticker = {}
+    found = []
+    for col in columns:
+        ticker, _, field = col.partition("_")
+        if not field or (fields is not None and field not in fields):
+            continue
+        by_ticker.setdefault(ticker, {})[field] = col
+        if field not in found:
+            found.append(field)
+    return by_ticker, (found if fields is None else list(fields))
+
+
+def wide_to_long(df, fields=None, date_column="Date"):
+    """
+    Convert a wide DataFrame into long format.
+
+    Rows where every field of a ticker is missing are dropped, so each ticker keeps only
+    the dates it actually has data for.
+
+    Args:
+        df (pd.DataFrame): Wide data such as reordered_cleaned_data.csv.
+        fields (list of str or None): Fields to keep; defaults to every field found.
+        date_column (str): Name of the date column.
+
+    Returns:
+        pd.DataFrame: "Ticker" (categorical), "Date" and one column per field, sorted by
+        ticker (first-seen order) and date.
+    """
+    by_ticker, fields = split_wide_columns(df.columns, fields)
+    dates = pd.to_datetime(df[date_column]).to_numpy()
+
+    parts = []
+    for ticker, columns in by_ticker.items():
+        frame = pd.DataFrame({field: df[columns[field]].to_numpy() if field in columns else np.nan
+                              for field in fields})
+        frame.insert(0, "Date", dates)
+        frame.insert(0, "Ticker", ticker)
+        parts.append(frame[frame[fields].notna().any(axis=1)].sort_values("Date", kind="stable"))
+
+    long_df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=["Ticker", "Date"] + fields)
+    long_df["Ticker"] = pd.Categorical(long_df["Ticker"], categories=list(by_ticker))
+    return long_df
+
+
+def long_to_wide(long_df, fields=None, date_column="Date"):
+    """
+    Convert long-format data back into the wide "{ticker}_{field}" layout.
+
+    Args:
+        long_df (pd.DataFrame): Data with "Ticker", date and field columns.
+        fields (list of str or None): Fields to include; defaults to every non-key column.
+        date_column (str): Name of the date column.
+
+    Returns:
+        pd.DataFrame: Date column followed by ticker-major "{ticker}_{field}" columns on
+        the union of all dates.
+    """
+    fields = [col for col in long_df.columns if col not in ("Ticker", date_column)] if fields is None else list(fields)
+    tickers = long_df["Ticker"].astype(LABEL_DTYPE).cat.categories
+    tickers = [ticker for ticker in tickers if (long_df["Ticker"] == ticker).any()]
+
+    dates = np.unique(pd.to_datetime(long_df[date_column]).to_numpy())
+    block = np.full((dates.size, len(tickers) * len(fields)), np.nan)
+    columns = []
+    for i, ticker in enumerate(tickers):
+        rows = long_df[long_df["Ticker"] == ticker]
+        positions = np.searchsorted(dates, pd.to_datetime(rows[date_column]).to_numpy())
+        block[positions, i * len(fields):(i + 1) * len(fields)] = rows[fields].to_numpy(dtype=np.float64)
+        columns.extend(f"{ticker}_{field}" for field in fields)
+
+    wide = pd.DataFrame(block, columns=columns)
+    wide.insert(0, date_column, dates)
+    return wide
+
+
+class LongStore:
+    """
+    The LongStore class keeps long-format rows on disk, sorted by (ticker, date), with a
+    sparse per-ticker row index.
+
+    On-disk layout (one folder per store):
+        dates.bin: int64 day numbers (datetime64[D]), one per row, append-only.
+        values.bin: float64 array of shape (rows, fields), row-major, append-only.
+        index.json: Fields, tickers in storage order and the row offset of every ticker.
+
+    Tickers are stored in the order they were added, so appending a ticker only writes
+    new rows at the end of the files. The index is replaced atomically after the rows are
+    written, and anything beyond its last offset (e.g. from an interrupted append) is
+    ignored and overwritten by the next append.
+
+    Attributes:
+        DATES_FILE (str): File name of the date column.
+        VALUES_FILE (str): File name of the value rows.
+        INDEX_FILE (str): File name of the ticker index.
+        directory (str): Folder holding the store files.
+        fields (list of str): Field for each value column.
+        tickers (list of str): Tickers in storage order.
+        offsets (np.ndarray): Row offset of each ticker, plus the total row count at the end.
+    """
+    DATES_FILE = "dates.bin"
+    VALUES_FILE = "values.bin"
+    INDEX_FILE = "index.json"
+
+    def __init__(self, directory):
+        """
+        Open an existing store.
+
+        Args:
+            directory (str): Folder previously written by create() or from_wide_frame().
+        """
+        self.directory = directory
+        with open(os.path.join(directory, LongStore.INDEX_FILE)) as handle:
+            index = json.load(handle)
+        self.fields = index["fields"]
+        self.tickers = index["tickers"]
+        self.offsets = np.asarray(index["offsets"], dtype=np.int64)
+        self._ticker_pos = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self._map()
+
+    def _map(self):
+        """
+        Memory-map the date and value files up to the last indexed row.
+        """
+        rows = int(self.offsets[-1])
+        if rows == 0:
+            self.dates = np.empty(0, dtype="datetime64[D]")
+            self.values = np.empty((0, len(self.fields)))
+            return
+        self.dates = np.memmap(os.path.join(self.directory, LongStore.DATES_FILE), dtype="datetime64[D]",
+                               mode="r", shape=(rows,))
+        self.values = np.memmap(os.path.join(self.directory, LongStore.VALUES_FILE), dtype=np.float64,
+                                mode="r", shape=(rows, len(self.fields)))
+
+    @classmethod
+    def create(cls, directory, fields):
+        """
+        Create an empty store.
+
+        Args:
+            directory (str): Folder to write the store into (created if needed).
+            fields (list of str): Value columns, e.g. ["Adj_Close", "Volume"].
+
+        Returns:
+            LongStore: The new, empty store.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in (cls.DATES_FILE, cls.VALUES_FILE):
+            open(os.path.join(directory, name), "wb").close()
+        cls._write_index(directory, {"fields": list(fields), "tickers": [], "offsets": [0]})
+        return cls(directory)
+
+    @staticmethod
+    def _write_index(directory, index):
+        """
+        Replace the index file atomically.
+
+        Args:
+            directory (str): Store folder.
+            index (dict): Fields, tickers and offsets.
+        """
+        path = os.path.join(directory, LongStore.INDEX_FILE)
+        with open(path + ".tmp", "w") as handle:
+            json.dump(index, handle)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def from_wide_frame(cls, directory, df, fields=None, date_column="Date"):
+        """
+        Build a store from a wide DataFrame.
+
+        Args:
+            directory (str): Folder to write the store into.
+            df (pd.DataFrame): Wide data such as reordered_cleaned_data.csv.
+            fields (list of str or None): Fields to keep; defaults to every field found.
+            date_column (str): Name of the date column.
+
+        Returns:
+            LongStore: The new store.
+        """
+        by_ticker, fields = split_wide_columns(df.columns, fields)
+        store = cls.create(directory, fields)
+        dates = pd.to_datetime(df[date_column])
+        for ticker, columns in by_ticker.items():
+            frame = pd.DataFrame({field: df[columns[field]].to_numpy() if field in columns else np.nan
+                                  for field in fields})
+            frame.index = dates
+            store.append(ticker, frame.dropna(how="all"))
+        return store
+
+    def __len__(self):
+        """
+        Retrieve the number of stored rows.
+
+        Returns:
+            int: Row count over all tickers.
+        """
+        return int(self.offsets[-1])
+
+    def append(self, ticker, df):
+        """
+        Append the rows of a new ticker to the end of the store.
+
+        Args:
+            ticker (str): Ticker symbol not yet in the store.
+            df (pd.DataFrame): Data indexed by date; missing fields are stored as NaN.
+        """
+        if ticker in self._ticker_pos:
+            raise ValueError(f"Ticker '{ticker}' is already stored; the store is append-only.")
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        dates = df.index.values.astype("datetime64[D]")
+        values = np.ascontiguousarray(df.reindex(columns=self.fields).to_numpy(dtype=np.float64))
+
+        # Write from the last indexed row, dropping any rows left by an interrupted append
+        rows = len(self)
+        with open(os.path.join(self.directory, LongStore.DATES_FILE), "r+b") as handle:
+            handle.truncate(rows * dates.itemsize)
+            handle.seek(0, os.SEEK_END)
+            handle.write(dates.tobytes())
+        with open(os.path.join(self.directory, LongStore.VALUES_FILE), "r+b") as handle:
+            handle.truncate(rows * len(self.fields) * values.itemsize)
+            handle.seek(0, os.SEEK_END)
+            handle.write(values.tobytes())
+
+        self.tickers.append(ticker)
+        self._ticker_pos[ticker] = len(self.tickers) - 1
+        self.offsets = np.append(self.offsets, rows + len(dates))
+        LongStore._write_index(self.directory, {"fields": self.fields, "tickers": self.tickers,
+                                                "offsets": self.offsets.tolist()})
+        self._map()
+
+    def row_bounds(self, ticker, start=None, end=None):
+        """
+        Find the rows of one ticker within an inclusive date range.
+
+        The ticker's block comes from the sparse index and the dates inside it are found
+        by binary search, so the cost is O(log n) whatever the store size.
+
+        Args:
+            ticker (str): Ticker symbol.
+            start (str or datetime-like or None): First date to include.
+            end (str or datetime-like or None): Last date to include.
+
+        Returns:
+            tuple: (first row, one past the last row).
+        """
+        position = self._ticker_pos[ticker]
+        first, last = int(self.offsets[position]), int(self.offsets[position + 1])
+        block = self.dates[first:last]
+        lower, upper = 0, last - first
+        if start is not None:
+            lower = int(np.searchsorted(block, pd.Timestamp(start).to_datetime64().astype(block.dtype), side="left"))
+        if end is not None:
+            upper = int(np.searchsorted(block, pd.Timestamp(end).to_datetime64().astype(block.dtype), side="right"))
+        return first + lower, first + upper
+
+    def select(self, ticker, start=None, end=None, fields=None):
+        """
+        Slice one ticker by date range without copying.
+
+        Args:
+            ticker (str): Ticker symbol.
+            start (str or datetime-like or None): First date to include.
+            end (str or datetime-like or None): Last date to include.
+            fields (list of str or None): Fields to select; None keeps every field as a view.
+
+        Returns:
+            tuple: (dates of the selected rows, (rows x fields) values).
+        """
+        first, last = self.row_bounds(ticker, start, end)
+        values = self.values[first:last]
+        if fields is not None:
+            values = values[:, [self.fields.index(field) for field in fields]]
+        return self.dates[first:last], values
+
+    def to_frame(self, tickers=None, start=None, end=None, fields=None):
+        """
+        Copy a ticker/date range into a long-format DataFrame.
+
+        Args:
+            tickers (list of str or None): Tickers to include; defaults to all.
+            start (str or datetime-like or None): First date to include.
+            end (str or datetime-like or None): Last date to include.
+            fields (list of str or None): Fields to include; defaults to all.
+
+        Returns:
+            pd.DataFrame: "Ticker" (categorical), "Date" and one column per field.
+        """
+        tickers = self.tickers if tickers is None else list(tickers)
+        fields = self.fields if fields is None else list(fields)
+        bounds = [self.row_bounds(ticker, start, end) for ticker in tickers]
+        counts = [last - first for first, last in bounds]
+
+        dates = np.concatenate([self.dates[first:last] for first, last in bounds]) if bounds else self.dates[:0]
+        columns = [self.fields.index(field) for field in fields]
+        values = np.concatenate([self.values[first:last][:, columns] for first, last in bounds]) if bounds else \
+            np.empty((0, len(fields)))
+
+        long_df = pd.DataFrame(values, columns=fields)
+        long_df.insert(0, "Date", pd.to_datetime(dates))
+        # Integer codes repeated per block avoid building one string per row
+        codes = np.repeat(np.arange(len(tickers)), counts)
+        long_df.insert(0, "Ticker", pd.Categorical.from_codes(codes, categories=tickers))
+        return long_df
+
+    def to_wide(self, tickers=None, start=None, end=None, fields=None):
+        """
+        Convert a ticker/date range back into the wide "{ticker}_{field}" layout.
+
+        Args:
+            tickers (list of str or None): Tickers to include; defaults to all.
+            start (str or datetime-like or None): First date to include.
+            end (str or datetime-like or None): Last date to include.
+            fields (list of str or None): Fields to include; defaults to all.
+
+        Returns:
+            pd.DataFrame: Date column followed by "{ticker}_{field}" columns.
+        """
+        return long_to_wide(self.to_frame(tickers, start, end, fields), fields)
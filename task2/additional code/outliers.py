@@ -0,0 +1,325 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the outlier module for the stock and cryptocurrency
+analysis. Unlike the notebook's remove_outliers, which filters the whole DataFrame once
+per Volume column (copying it each time and computing later bounds on already-filtered
+data), every column's bounds are computed from the same data in one pass and combined
+into a single boolean mask. Policies are IQR, MAD and rolling z-score, and a t-digest
+quantile sketch allows IQR/MAD bounds to be computed out-of-core from CSV chunks.
+"""
+
+import numpy as np
+import pandas as pd
+
+from features import rolling_mean_std
+
+# Supported outlier policies and their default multipliers
+DEFAULT_K = {
+    "iqr": 1.5,  # Tukey fences, as used in the notebook
+    "mad": 3.5,  # Modified z-score threshold
+    "zscore": 3.0,  # Rolling z-score threshold
+}
+
+# Scales the MAD so it estimates the standard deviation of normally distributed data
+MAD_SCALE = 1.4826
+
+
+class TDigest:
+    """
+    The TDigest class is a mergeable quantile sketch for one column of data. It keeps a
+    bounded number of weighted centroids, small near the tails and larger in the middle,
+    so extreme quantiles stay accurate while memory is independent of the data size.
+
+    Attributes:
+        compression (int): Controls the number of centroids (roughly 2 x compression).
+        means (np.ndarray): Centroid means, sorted.
+        weights (np.ndarray): Number of values summarised by each centroid.
+        min_value (float): Smallest value seen.
+        max_value (float): Largest value seen.
+    """
+
+    def __init__(self, compression=200):
+        """
+        Initialise an empty digest.
+
+        Args:
+            compression (int): Accuracy/size trade-off; higher values keep more centroids.
+        """
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min_value = np.inf
+        self.max_value = -np.inf
+
+    @property
+    def count(self):
+        """
+        Retrieve the number of values added to the digest.
+
+        Returns:
+            float: Total weight of all centroids.
+        """
+        return float(self.weights.sum())
+
+    def update(self, values):
+        """
+        Add a batch of values (NaNs are ignored) and re-compress the centroids.
+
+        Args:
+            values (array-like): Values to add.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self.min_value = min(self.min_value, float(values.min()))
+        self.max_value = max(self.max_value, float(values.max()))
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(values.size)]))
+
+    def merge(self, other):
+        """
+        Merge another digest (e.g. one built from a different chunk) into this one.
+
+        Args:
+            other (TDigest): Digest to merge.
+        """
+        if other.weights.size == 0:
+            return
+        self.min_value = min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+
+    def _compress(self, means, weights):
+        """
+        Merge sorted points into centroids using the arcsine scale function.
+
+        Points are grouped by the integer part of k(q) = compression / pi * asin(2q - 1),
+        where q is each point's quantile, so every centroid spans at most one unit of k.
+
+        Args:
+            means (np.ndarray): Centroid means and raw values to merge.
+            weights (np.ndarray): Weights matching means.
+        """
+        order = np.argsort(means, kind="mergesort")
+        means = means[order]
+        weights = weights[order]
+
+        # Quantile at the centre of each point, then its bucket on the k scale
+        total = weights.sum()
+        q_mid = (np.cumsum(weights) - weights / 2) / total
+        buckets = np.floor(self.compression / np.pi * np.arcsin(2 * q_mid - 1)).astype(np.int64)
+
+        # Points in the same bucket are adjacent after sorting, so reduce runs of buckets
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        new_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / new_weights
+        self.weights = new_weights
+
+    def quantile(self, q):
+        """
+        Estimate one or more quantiles.
+
+        Args:
+            q (float or array-like): Quantile(s) between 0 and 1.
+
+        Returns:
+            float or np.ndarray: Estimated quantile value(s), NaN if the digest is empty.
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if self.weights.size == 0:
+            return np.full(q.shape, np.nan) if q.ndim else np.nan
+
+        # Interpolate between centroid centres, pinned to the exact min and max
+        total = self.weights.sum()
+        centres = np.cumsum(self.weights) - self.weights / 2
+        positions = np.r_[0.0, centres, total]
+        values = np.r_[self.min_value, self.means, self.max_value]
+        return np.interp(q * total, positions, values)
+
+
+def _as_matrix(data, columns):
+    """
+    Extract the given columns as a float64 (rows x columns) array.
+
+    Args:
+        data (pd.DataFrame or np.ndarray): Input data.
+        columns (list of str or None): Columns to use when data is a DataFrame.
+
+    Returns:
+        np.ndarray: 2-D float64 array.
+    """
+    if isinstance(data, pd.DataFrame):
+        return data[columns].to_numpy(dtype=np.float64)
+    values = np.asarray(data, dtype=np.float64)
+    return values.reshape(-1, 1) if values.ndim == 1 else values
+
+
+def volume_columns(df):
+    """
+    List the Volume columns of a wide DataFrame, as the notebook's outlier cell does.
+
+    Args:
+        df (pd.DataFrame): Wide data with "{ticker}_Volume" columns.
+
+    Returns:
+        list of str: Column names containing "Volume".
+    """
+    return [col for col in df.columns if "Volume" in col]
+
+
+def compute_bounds(values, policy="iqr", k=None):
+    """
+    Compute lower and upper bounds for every column in one pass.
+
+    Args:
+        values (np.ndarray): 2-D array of shape (rows, columns).
+        policy (str): "iqr" (Q1 - k*IQR, Q3 + k*IQR) or "mad" (median +/- k*1.4826*MAD).
+        k (float or None): Multiplier; defaults to DEFAULT_K[policy].
+
+    Returns:
+        tuple: (lower bounds, upper bounds), one entry per column.
+    """
+    k = DEFAULT_K[policy] if k is None else k
+    if policy == "iqr":
+        # Both quartiles of every column from one partial sort per column
+        q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+        iqr = q3 - q1
+        return q1 - k * iqr, q3 + k * iqr
+    if policy == "mad":
+        median = np.nanmedian(values, axis=0)
+        mad = np.nanmedian(np.abs(values - median), axis=0) * MAD_SCALE
+        return median - k * mad, median + k * mad
+    raise ValueError(f"Bounds are not defined for policy '{policy}'.")
+
+
+def outlier_mask(data, columns=None, policy="iqr", k=None, window=30, bounds=None):
+    """
+    Flag outliers in every column without modifying the data.
+
+    All bounds are computed from the same (unfiltered) data, so the result does not
+    depend on the order of the columns.
+
+    Args:
+        data (pd.DataFrame or np.ndarray): Input data.
+        columns (list of str or None): Columns to check; defaults to the Volume columns
+            when data is a DataFrame.
+        policy (str): "iqr", "mad" or "zscore" (rolling z-score).
+        k (float or None): Policy multiplier; defaults to DEFAULT_K[policy].
+        window (int): Window length for the rolling z-score policy.
+        bounds (tuple or None): Precomputed (lower, upper) bounds, e.g. from
+            stream_bounds, used instead of computing them from data.
+
+    Returns:
+        np.ndarray: Boolean array of shape (rows, columns), True where a value is an outlier.
+    """
+    if isinstance(data, pd.DataFrame) and columns is None:
+        columns = volume_columns(data)
+    values = _as_matrix(data, columns)
+
+    if policy == "zscore":
+        k = DEFAULT_K[policy] if k is None else k
+        # Compare each value against the statistics of the preceding window only
+        mean, std = rolling_mean_std(values, window)
+        prior_mean = np.full(values.shape, np.nan)
+        prior_std = np.full(values.shape, np.nan)
+        prior_mean[1:] = mean[:-1]
+        prior_std[1:] = std[:-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = np.abs(values - prior_mean) / prior_std
+        # Rows without a full preceding window (z is NaN) are never flagged
+        return z > k
+
+    lower, upper = compute_bounds(values, policy, k) if bounds is None else bounds
+    # NaN values compare False on both sides, so they are never flagged
+    return (values < lower) | (values > upper)
+
+
+def remove_outliers(df, columns=None, policy="iqr", k=None, window=30):
+    """
+    Drop every row that is an outlier in any of the columns, using one combined mask.
+
+    Args:
+        df (pd.DataFrame): Input data.
+        columns (list of str or None): Columns to check; defaults to the Volume columns.
+        policy (str): "iqr", "mad" or "zscore".
+        k (float or None): Policy multiplier.
+        window (int): Window length for the rolling z-score policy.
+
+    Returns:
+        pd.DataFrame: Rows with no outliers (a single filtered copy).
+    """
+    mask = outlier_mask(df, columns, policy, k, window)
+    return df[~mask.any(axis=1)]
+
+
+def mark_outliers(df, columns=None, policy="iqr", k=None, window=30):
+    """
+    Add "{column}_Outlier" flags and an overall "Is_Outlier" flag without dropping rows.
+
+    Args:
+        df (pd.DataFrame): Input data.
+        columns (list of str or None): Columns to check; defaults to the Volume columns.
+        policy (str): "iqr", "mad" or "zscore".
+        k (float or None): Policy multiplier.
+        window (int): Window length for the rolling z-score policy.
+
+    Returns:
+        pd.DataFrame: The original data followed by the boolean flag columns.
+    """
+    columns = volume_columns(df) if columns is None else list(columns)
+    mask = outlier_mask(df, columns, policy, k, window)
+
+    # Build all flag columns as one block and attach them in a single concatenation
+    flags = pd.DataFrame(mask, index=df.index, columns=[f"{col}_Outlier" for col in columns])
+    flags["Is_Outlier"] = mask.any(axis=1)
+    return pd.concat([df, flags], axis=1)
+
+
+def stream_bounds(chunk_source, columns, policy="iqr", k=None, compression=200):
+    """
+    Compute IQR or MAD bounds for data too large to load, using one t-digest per column.
+
+    IQR bounds need one pass over the chunks. MAD bounds need a second pass to sketch
+    the absolute deviations from the median, so chunk_source must be re-iterable.
+
+    Args:
+        chunk_source (callable): Function returning a fresh iterator of DataFrame chunks,
+            e.g. lambda: pd.read_csv(path, usecols=columns, chunksize=100_000).
+        columns (list of str): Columns to compute bounds for.
+        policy (str): "iqr" or "mad".
+        k (float or None): Policy multiplier; defaults to DEFAULT_K[policy].
+        compression (int): t-digest compression.
+
+    Returns:
+        tuple: (lower bounds, upper bounds) as arrays, one entry per column, ready to be
+        passed to outlier_mask(..., bounds=...) chunk by chunk.
+    """
+    k = DEFAULT_K[policy] if k is None else k
+    if policy not in ("iqr", "mad"):
+        raise ValueError(f"Streaming bounds are not defined for policy '{policy}'.")
+
+    # First pass: one digest per column
+    digests = [TDigest(compression) for _ in columns]
+    for chunk in chunk_source():
+        values = _as_matrix(chunk, columns)
+        for i, digest in enumerate(digests):
+            digest.update(values[:, i])
+
+    if policy == "iqr":
+        quartiles = np.array([digest.quantile([0.25, 0.75]) for digest in digests])
+        q1, q3 = quartiles[:, 0], quartiles[:, 1]
+        iqr = q3 - q1
+        return q1 - k * iqr, q3 + k * iqr
+
+    # Second pass: sketch the absolute deviations from each column's median
+    median = np.array([digest.quantile(0.5) for digest in digests])
+    deviation_digests = [TDigest(compression) for _ in columns]
+    for chunk in chunk_source():
+        deviations = np.abs(_as_matrix(chunk, columns) - median)
+        for i, digest in enumerate(deviation_digests):
+            digest.update(deviations[:, i])
+    mad = np.array([digest.quantile(0.5) for digest in deviation_digests]) * MAD_SCALE
+    return median - k * mad, median + k * mad
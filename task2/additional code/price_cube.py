@@ -0,0 +1,260 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the PriceCube class, which stores Adj Close, Close, High,
+Low, Open and Volume for every ticker as one contiguous memory-mapped NumPy array of
+shape (dates, assets, fields). A date index and a ticker/field index are kept alongside
+the array so analysis code can slice any asset, field or date range without re-parsing
+the CSV files and without copying data.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from loaders import PRICE_FIELDS, read_price_csv
+
+
+class PriceCube:
+    """
+    The PriceCube class gives zero-copy access to a (dates x assets x fields) price array
+    saved on disk.
+
+    On-disk layout (one folder per cube):
+        prices.npy: float64 array of shape (dates, assets, fields), memory-mapped on open.
+        dates.npy: datetime64 array holding the sorted date index.
+        index.json: Ticker and field names, in array order.
+
+    Attributes:
+        PRICES_FILE (str): File name of the price array.
+        DATES_FILE (str): File name of the date index.
+        INDEX_FILE (str): File name of the ticker/field sidecar.
+        directory (str): Folder holding the cube files.
+        values (np.memmap): The memory-mapped price array.
+        dates (np.ndarray): Sorted datetime64 date index.
+        tickers (list of str): Ticker for each position along the asset axis.
+        fields (list of str): Field for each position along the field axis.
+    """
+    PRICES_FILE = "prices.npy"
+    DATES_FILE = "dates.npy"
+    INDEX_FILE = "index.json"
+
+    def __init__(self, directory, mode="r"):
+        """
+        Open an existing cube.
+
+        Args:
+            directory (str): Folder previously written by one of the build methods.
+            mode (str): Memory-map mode, "r" for read-only or "r+" to allow updates.
+        """
+        self.directory = directory
+
+        # Map the price array without reading it into memory
+        self.values = np.load(os.path.join(directory, PriceCube.PRICES_FILE), mmap_mode=mode)
+        # The date index is small, so it is loaded fully for fast binary searches
+        self.dates = np.load(os.path.join(directory, PriceCube.DATES_FILE))
+
+        with open(os.path.join(directory, PriceCube.INDEX_FILE)) as handle:
+            index = json.load(handle)
+        self.tickers = index["tickers"]
+        self.fields = index["fields"]
+
+        # Lookup tables from names to array positions
+        self._ticker_pos = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self._field_pos = {field: i for i, field in enumerate(self.fields)}
+
+    @classmethod
+    def build(cls, directory, frames, fields=PRICE_FIELDS, time_unit="D"):
+        """
+        Write a new cube from per-ticker DataFrames.
+
+        Dates are the union of all the tickers' dates, so stocks (trading days only) and
+        cryptocurrencies (every day) can share one cube; missing entries are NaN.
+
+        Args:
+            directory (str): Folder to write the cube into (created if needed).
+            frames (dict): Ticker mapped to a DataFrame indexed by date with the given fields.
+            fields (list of str): Fields to store, in array order.
+            time_unit (str): NumPy datetime unit of the date index ("D" for daily bars,
+                "s" or "m" for intraday bars).
+
+        Returns:
+            PriceCube: The newly written cube, opened read-only.
+        """
+        os.makedirs(directory, exist_ok=True)
+        dtype = f"datetime64[{time_unit}]"
+        tickers = list(frames)
+
+        # Build the sorted union of all dates
+        all_dates = [frames[t].index.values.astype(dtype) for t in tickers]
+        dates = np.unique(np.concatenate(all_dates)) if all_dates else np.array([], dtype=dtype)
+
+        # Allocate the array directly on disk and fill it one ticker at a time
+        values = np.lib.format.open_memmap(
+            os.path.join(directory, cls.PRICES_FILE), mode="w+", dtype=np.float64,
+            shape=(len(dates), len(tickers), len(fields)))
+        values[:] = np.nan
+        for position, (ticker, ticker_dates) in enumerate(zip(tickers, all_dates)):
+            rows = np.searchsorted(dates, ticker_dates)
+            # Fields the frame does not have are left as NaN
+            frame = frames[ticker].reindex(columns=list(fields))
+            values[rows, position, :] = frame.to_numpy(dtype=np.float64)
+        values.flush()
+        del values
+
+        # Write the sidecar indexes
+        np.save(os.path.join(directory, cls.DATES_FILE), dates)
+        with open(os.path.join(directory, cls.INDEX_FILE), "w") as handle:
+            json.dump({"tickers": tickers, "fields": list(fields)}, handle)
+        return cls(directory)
+
+    @classmethod
+    def from_csv_files(cls, directory, paths, fields=PRICE_FIELDS):
+        """
+        Build a cube from raw yfinance price files.
+
+        Args:
+            directory (str): Folder to write the cube into.
+            paths (list of str): Raw price files (e.g. from loaders.price_file_paths()).
+            fields (list of str): Fields to store, in array order.
+
+        Returns:
+            PriceCube: The newly written cube.
+        """
+        frames = {}
+        for path in paths:
+            ticker, df = read_price_csv(path)
+            frames[ticker] = df
+        return cls.build(directory, frames, fields)
+
+    @classmethod
+    def from_wide_frame(cls, directory, df, fields=PRICE_FIELDS):
+        """
+        Build a cube from a wide DataFrame with "{ticker}_{field}" columns.
+
+        Wide column names use underscores in place of spaces ("AAPL_Adj_Close"), so
+        "Adj Close" is looked up as "Adj_Close". Fields missing from the frame are NaN.
+
+        Args:
+            directory (str): Folder to write the cube into.
+            df (pd.DataFrame): Wide data with a "Date" column, such as
+                final_cleaned_enriched_data.csv.
+            fields (list of str): Fields to store, in array order.
+
+        Returns:
+            PriceCube: The newly written cube.
+        """
+        dates = pd.to_datetime(df["Date"])
+        wide_fields = {field.replace(" ", "_"): field for field in fields}
+
+        # Group the columns by ticker, keeping the first-seen ticker order
+        columns_by_ticker = {}
+        for col in df.columns:
+            ticker, _, wide_field = col.partition("_")
+            if wide_field in wide_fields:
+                columns_by_ticker.setdefault(ticker, {})[col] = wide_fields[wide_field]
+
+        frames = {}
+        for ticker, columns in columns_by_ticker.items():
+            frame = df[list(columns)].rename(columns=columns)
+            frame.index = dates
+            frames[ticker] = frame
+        return cls.build(directory, frames, fields)
+
+    @property
+    def shape(self):
+        """
+        Retrieve the shape of the price array.
+
+        Returns:
+            tuple: (number of dates, number of assets, number of fields).
+        """
+        return self.values.shape
+
+    def date_bounds(self, start=None, end=None):
+        """
+        Convert an inclusive date range into row positions using binary search.
+
+        Args:
+            start (str or datetime-like or None): First date to include.
+            end (str or datetime-like or None): Last date to include.
+
+        Returns:
+            tuple: (first row, one past the last row).
+        """
+        first = 0
+        last = len(self.dates)
+        if start is not None:
+            start = pd.Timestamp(start).to_datetime64().astype(self.dates.dtype)
+            first = int(np.searchsorted(self.dates, start, side="left"))
+        if end is not None:
+            end = pd.Timestamp(end).to_datetime64().astype(self.dates.dtype)
+            last = int(np.searchsorted(self.dates, end, side="right"))
+        return first, last
+
+    def select(self, ticker=None, field=None, start=None, end=None):
+        """
+        Slice the cube by asset, field and date range.
+
+        Only basic slicing is used, so the result is a view onto the memory map and
+        no data is read until it is accessed.
+
+        Args:
+            ticker (str or None): Single ticker to select, or None for all assets.
+            field (str or None): Single field to select, or None for all fields.
+            start (str or datetime-like or None): First date to include.
+            end (str or datetime-like or None): Last date to include.
+
+        Returns:
+            tuple: (date index of the selected rows, array view). Each given ticker or
+            field removes the corresponding axis from the view.
+        """
+        first, last = self.date_bounds(start, end)
+        asset_key = slice(None) if ticker is None else self._ticker_pos[ticker]
+        field_key = slice(None) if field is None else self._field_pos[field]
+        return self.dates[first:last], self.values[first:last, asset_key, field_key]
+
+    def asset(self, ticker, start=None, end=None):
+        """
+        Retrieve every field of one asset as a (dates x fields) view.
+
+        Args:
+            ticker (str): Ticker symbol (e.g. "AAPL").
+            start (str or datetime-like or None): First date to include.
+            end (str or datetime-like or None): Last date to include.
+
+        Returns:
+            np.ndarray: View of shape (dates, fields).
+        """
+        return self.select(ticker=ticker, start=start, end=end)[1]
+
+    def field(self, field, start=None, end=None):
+        """
+        Retrieve one field of every asset as a (dates x assets) view.
+
+        Args:
+            field (str): Field name (e.g. "Adj Close").
+            start (str or datetime-like or None): First date to include.
+            end (str or datetime-like or None): Last date to include.
+
+        Returns:
+            np.ndarray: View of shape (dates, assets), ready for features.compute_features.
+        """
+        return self.select(field=field, start=start, end=end)[1]
+
+    def to_frame(self, field, start=None, end=None):
+        """
+        Copy one field of every asset into a DataFrame indexed by date.
+
+        Args:
+            field (str): Field name (e.g. "Close").
+            start (str or datetime-like or None): First date to include.
+            end (str or datetime-like or None): Last date to include.
+
+        Returns:
+            pd.DataFrame: One column per ticker.
+        """
+        dates, view = self.select(field=field, start=start, end=end)
+        return pd.DataFrame(np.array(view), index=pd.DatetimeIndex(dates, name="Date"), columns=self.tickers)
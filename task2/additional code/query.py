@@ -0,0 +1,374 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains a small query API over the wide task 2 datasets
+(cleaned_grouped_data.csv, reordered_cleaned_data.csv and the other "{name}_{metric}"
+files). The first query of a CSV file converts it into a columnar copy split into row
+groups, with the min/max of every column kept per row group. Queries then push their
+predicates down to that copy: only the requested columns are mapped, and row groups
+whose date range or column statistics cannot match a filter are never read.
+"""
+
+import json
+import operator
+import os
+
+import numpy as np
+import pandas as pd
+
+from loaders import DATA_DIR, read_header
+from schema import DATE_DTYPE, FLOAT_DTYPE, apply_schema, column_dtype
+
+# Short names for the datasets analysts query most
+DATASETS = {
+    "grouped": os.path.join(DATA_DIR, "cleaned_grouped_data.csv"),
+    "assets": os.path.join(DATA_DIR, "reordered_cleaned_data.csv"),
+}
+
+# Folder holding the columnar copies (one sub-folder per source file)
+CACHE_DIR = os.path.join(DATA_DIR, ".query_cache")
+
+# Comparison operators allowed in filters
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+ROW_GROUP_SIZE = 4096
+
+
+def _group_may_match(op, value, low, high):
+    """
+    Decide from a row group's min/max whether any of its rows can satisfy a filter.
+
+    Args:
+        op (str): Comparison operator from OPERATORS.
+        value (float): Value compared against.
+        low (float): Smallest value in the row group (NaN if the group is all missing).
+        high (float): Largest value in the row group.
+
+    Returns:
+        bool: False only when no row of the group can match.
+    """
+    if np.isnan(low):
+        # Missing values never satisfy a comparison
+        return False
+    if op == "==":
+        return low <= value <= high
+    if op == "!=":
+        return not (low == high == value)
+    if op == "<":
+        return low < value
+    if op == "<=":
+        return low <= value
+    if op == ">":
+        return high > value
+    return high >= value
+
+
+class ColumnarTable:
+    """
+    The ColumnarTable class is a columnar copy of a wide CSV file, split into row groups
+    with per-group min/max statistics.
+
+    On-disk layout (one folder per table):
+        {column}.bin: One raw array per column (datetime64[D] dates, float32 measurements
+            and float64 volumes, which must hold missing values exactly).
+        meta.json: Source file signature, column dtypes, row count, row group size and the
+            per-group statistics.
+
+    Attributes:
+        META_FILE (str): File name of the metadata.
+        directory (str): Folder holding the table files.
+        meta (dict): Parsed metadata.
+        columns (list of str): Column names in source order.
+        starts (np.ndarray): First row of every row group, plus the row count at the end.
+    """
+    META_FILE = "meta.json"
+
+    def __init__(self, directory):
+        """
+        Open an existing table.
+
+        Args:
+            directory (str): Folder previously written by build().
+        """
+        self.directory = directory
+        with open(os.path.join(directory, ColumnarTable.META_FILE)) as handle:
+            self.meta = json.load(handle)
+        self.columns = self.meta["columns"]
+        rows = self.meta["rows"]
+        self.starts = np.append(np.arange(0, rows, self.meta["row_group_size"]), rows)
+        self._maps = {}  # column -> memory map, opened on first use
+        self._stat_arrays = {}  # column -> (row groups x 2) min/max array
+
+    @staticmethod
+    def signature(path):
+        """
+        Identify the version of a source file.
+
+        Args:
+            path (str): Source CSV file.
+
+        Returns:
+            list: [size in bytes, modification time in nanoseconds].
+        """
+        info = os.stat(path)
+        return [info.st_size, info.st_mtime_ns]
+
+    @staticmethod
+    def storage_dtype(column):
+        """
+        Pick the on-disk dtype of a column from the schema.
+
+        Args:
+            column (str): Column name.
+
+        Returns:
+            str: NumPy dtype.
+        """
+        dtype = column_dtype(column)
+        if dtype == DATE_DTYPE:
+            return "datetime64[D]"
+        return FLOAT_DTYPE if dtype == FLOAT_DTYPE else "float64"
+
+    @classmethod
+    def build(cls, csv_path, directory, row_group_size=ROW_GROUP_SIZE):
+        """
+        Convert a wide CSV file into a columnar table, one row group at a time.
+
+        Args:
+            csv_path (str): Source CSV file with a "Date" column.
+            directory (str): Folder to write the table into (created if needed).
+            row_group_size (int): Rows per row group.
+
+        Returns:
+            ColumnarTable: The new table.
+        """
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, cls.META_FILE)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        columns = read_header(csv_path)
+        dtypes = {column: cls.storage_dtype(column) for column in columns}
+        stats = {column: [] for column in columns}
+        handles = {column: open(os.path.join(directory, f"{column}.bin"), "wb") for column in columns}
+        rows = 0
+        try:
+            for chunk in pd.read_csv(csv_path, parse_dates=["Date"], chunksize=row_group_size):
+                rows += len(chunk)
+                for column in columns:
+                    values = chunk[column].to_numpy().astype(dtypes[column])
+                    handles[column].write(values.tobytes())
+                    # Dates are kept as day numbers so every statistic is a plain number
+                    if column == "Date":
+                        present = values[~np.isnat(values)].astype(np.int64)
+                    else:
+                        present = values[~np.isnan(values)]
+                    stats[column].append([float(present.min()), float(present.max())] if present.size
+                                         else [None, None])
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+        meta = {"source": os.path.abspath(csv_path), "signature": cls.signature(csv_path), "columns": columns,
+                "dtypes": dtypes, "rows": rows, "row_group_size": row_group_size, "stats": stats}
+        # Written last, so an interrupted build is never mistaken for a complete table
+        with open(meta_path, "w") as handle:
+            json.dump(meta, handle)
+        return cls(directory)
+
+    def column(self, name):
+        """
+        Memory-map one column.
+
+        Args:
+            name (str): Column name.
+
+        Returns:
+            np.ndarray: Read-only array of every row of the column.
+        """
+        if name not in self._maps:
+            if self.meta["rows"] == 0:
+                self._maps[name] = np.empty(0, dtype=self.meta["dtypes"][name])
+            else:
+                self._maps[name] = np.memmap(os.path.join(self.directory, f"{name}.bin"),
+                                             dtype=self.meta["dtypes"][name], mode="r",
+                                             shape=(self.meta["rows"],))
+        return self._maps[name]
+
+    def storage_value(self, name, value):
+        """
+        Convert a filter value to the storage dtype of a column, so that the row group
+        statistics and the stored rows are compared with exactly the same number.
+
+        Args:
+            name (str): Column name.
+            value (float): Value compared against.
+
+        Returns:
+            np.generic: The value as a NumPy scalar of the column's dtype.
+        """
+        with np.errstate(over="ignore"):
+            return np.asarray(value).astype(self.meta["dtypes"][name])[()]
+
+    def _stats(self, name):
+        """
+        Retrieve the min/max statistics of a column as an array.
+
+        Args:
+            name (str): Column name.
+
+        Returns:
+            np.ndarray: Array of shape (row groups, 2), NaN for all-missing groups.
+        """
+        if name not in self._stat_arrays:
+            self._stat_arrays[name] = np.array(self.meta["stats"][name], dtype=np.float64).reshape(-1, 2)
+        return self._stat_arrays[name]
+
+    def row_groups(self, start=None, end=None, filters=()):
+        """
+        Select the row groups that may contain matching rows, using only the statistics.
+
+        Args:
+            start (str or datetime-like or None): First date to include.
+            end (str or datetime-like or None): Last date to include.
+            filters (iterable of tuple): (column, operator, value) predicates on
+                measurement columns.
+
+        Returns:
+            np.ndarray: Indices of the row groups to read.
+        """
+        keep = np.ones(self.starts.size - 1, dtype=bool)
+        dates = self._stats("Date")
+        if start is not None:
+            keep &= dates[:, 1] >= pd.Timestamp(start).to_datetime64().astype("datetime64[D]").astype(np.int64)
+        if end is not None:
+            keep &= dates[:, 0] <= pd.Timestamp(end).to_datetime64().astype("datetime64[D]").astype(np.int64)
+        for name, op, value in filters:
+            stats = self._stats(name)
+            value = self.storage_value(name, value)
+            keep &= [_group_may_match(op, value, low, high) for low, high in stats]
+        return np.flatnonzero(keep)
+
+    def read(self, columns, groups):
+        """
+        Read some columns of some row groups.
+
+        Args:
+            columns (list of str): Columns to read.
+            groups (np.ndarray): Row group indices from row_groups().
+
+        Returns:
+            dict: Column mapped to the concatenated values of the row groups.
+        """
+        slices = [slice(self.starts[g], self.starts[g + 1]) for g in groups]
+        result = {}
+        for name in columns:
+            data = self.column(name)
+            result[name] = np.concatenate([data[s] for s in slices]) if slices else data[:0]
+        return result
+
+
+_tables = {}  # (source path, table folder) -> open ColumnarTable, kept between queries
+
+
+def open_table(path, cache_dir=CACHE_DIR, row_group_size=ROW_GROUP_SIZE):
+    """
+    Open the columnar copy of a CSV file, building or rebuilding it when needed.
+
+    Args:
+        path (str): Source CSV file, or a key of DATASETS.
+        cache_dir (str): Folder holding the columnar copies.
+        row_group_size (int): Rows per row group for new copies.
+
+    Returns:
+        ColumnarTable: Table that matches the current source file.
+    """
+    path = os.path.abspath(DATASETS.get(path, path))
+    signature = ColumnarTable.signature(path)
+    directory = os.path.join(cache_dir, os.path.splitext(os.path.basename(path))[0])
+    table = _tables.get((path, directory))
+    if table is not None and table.meta["signature"] == signature:
+        return table
+
+    try:
+        table = ColumnarTable(directory)
+        stale = table.meta["signature"] != signature or table.meta["source"] != path
+    except (OSError, ValueError, KeyError):
+        stale = True
+    if stale:
+        table = ColumnarTable.build(path, directory, row_group_size)
+    _tables[(path, directory)] = table
+    return table
+
+
+def query(path, start=None, end=None, assets=None, metrics=None, filters=None, columns=None, schema=True,
+          cache_dir=CACHE_DIR):
+    """
+    Query a wide dataset by date range, assets, metrics and value filters.
+
+    Columns are chosen as "{asset}_{metric}" (e.g. assets=["Stocks"] and
+    metrics=["Avg_Return"] select "Stocks_Avg_Return"), or given directly with columns.
+
+    Args:
+        path (str): Source CSV file, or "grouped"/"assets" for the DATASETS shortcuts.
+        start (str or datetime-like or None): First date to include.
+        end (str or datetime-like or None): Last date to include.
+        assets (list of str or None): Tickers or group names; defaults to all.
+        metrics (list of str or None): Metric suffixes such as "Volume"; defaults to all.
+        filters (list of tuple or None): (column, operator, value) predicates combined
+            with AND, e.g. [("BTC-USD_Adj_Close_Daily_Return", "<", -0.05)]. Rows where
+            the column is missing never match.
+        columns (list of str or None): Explicit columns, used instead of assets/metrics.
+        schema (bool): Apply the compact schema dtypes to the result.
+        cache_dir (str): Folder holding the columnar copies.
+
+    Returns:
+        pd.DataFrame: "Date" followed by the selected columns, for the matching rows.
+    """
+    table = open_table(path, cache_dir)
+    filters = [] if filters is None else list(filters)
+    for name, op, _ in filters:
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator '{op}'.")
+        if name not in table.columns:
+            raise KeyError(f"Unknown column '{name}'.")
+    # Compare in each column's storage dtype, so the result does not depend on the row
+    # group layout or on the type of the value given
+    filters = [(name, op, table.storage_value(name, value)) for name, op, value in filters]
+
+    if columns is None:
+        columns = []
+        for name in table.columns[1:]:
+            asset, _, metric = name.partition("_")
+            if (assets is None or asset in assets) and (metrics is None or metric in metrics):
+                columns.append(name)
+    else:
+        missing = [name for name in columns if name not in table.columns]
+        if missing:
+            raise KeyError(f"Unknown column(s): {', '.join(missing)}.")
+
+    # Only the row groups the statistics allow, and only the needed columns, are read
+    groups = table.row_groups(start, end, filters)
+    needed = list(dict.fromkeys(["Date"] + list(columns) + [name for name, _, _ in filters]))
+    data = table.read(needed, groups)
+
+    mask = np.ones(data["Date"].size, dtype=bool)
+    if start is not None:
+        mask &= data["Date"] >= pd.Timestamp(start).to_datetime64().astype("datetime64[D]")
+    if end is not None:
+        mask &= data["Date"] <= pd.Timestamp(end).to_datetime64().astype("datetime64[D]")
+    for name, op, value in filters:
+        # Missing values never satisfy a filter (not even "!="), as in the row group pruning
+        with np.errstate(invalid="ignore"):
+            mask &= OPERATORS[op](data[name], value) & ~np.isnan(data[name])
+
+    result = pd.DataFrame({name: data[name][mask] for name in ["Date"] + list(columns)})
+    if schema:
+        result, _ = apply_schema(result)
+    return result
@@ -0,0 +1,606 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the regime detection for returns and volatility, replacing
+the visual reading of the smoothed volatility plots. Batch detection uses PELT (pruned
+exact linear time) with a Gaussian cost for changes in mean and variance, keeping at
+most MAX_CANDIDATES start positions so long series without changes stay linear. Streaming
+detection uses Bayesian online change-point detection (BOCPD), with the run-length
+distribution truncated to a fixed length so memory stays bounded. It updates many series
+at once (for example every asset and group when a bar closes). Volatility is modelled
+on a log scale. Detected change points label each row of a dataset with a regime number
+per series.
+
+Usage:
+    python regimes.py --data ../data/cleaned_grouped_data.csv --output ../data/grouped_regimes.csv
+"""
+
+import argparse
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from group_aggregation import DEFAULT_GROUPS
+from loaders import DATA_DIR, read_wide_csv
+
+# Prior probability of a change at each step (one change per year of trading days on average)
+HAZARD = 1 / 250
+
+# Run lengths tracked by the online detector; longer runs are treated as this long
+MAX_RUN = 256
+
+# Shortest regime: PELT's minimum segment, and the least the online detector's estimate
+# of the current regime's start must move forward to report a new regime
+MIN_SIZE = 10
+
+# Start positions PELT keeps at most; on series with few changes pruning removes little,
+# so this bounds the run time at O(n * MAX_CANDIDATES)
+MAX_CANDIDATES = 1000
+
+# Normal-Gamma prior: confidence in the prior mean and variance, in observations
+KAPPA0 = 0.1
+ALPHA0 = 1.0
+
+# Scales the MAD so it estimates the standard deviation of normally distributed data
+MAD_SCALE = 1.4826
+
+
+def is_volatility(column):
+    """
+    Decide whether a column is modelled on a log scale.
+
+    Args:
+        column (str): Column name such as "Stocks_Avg_Volatility" or "AAPL_Volatility".
+
+    Returns:
+        bool: True for volatility columns.
+    """
+    return "Volatility" in column
+
+
+def prepare(values, column):
+    """
+    Transform a column for detection (log for volatility, which must be positive).
+
+    Args:
+        values (array-like): Column values.
+        column (str): Column name.
+
+    Returns:
+        np.ndarray: float64 values, NaN where missing or not usable.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if not is_volatility(column):
+        return values
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(values > 0, np.log(values), np.nan)
+
+
+def robust_prior(values):
+    """
+    Estimate the prior location and variance of a series robustly.
+
+    Args:
+        values (np.ndarray): Transformed values (NaN ignored).
+
+    Returns:
+        tuple: (median, variance from the MAD), falling back to the plain variance or 1.
+    """
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return 0.0, 1.0
+    loc = float(np.median(values))
+    variance = (MAD_SCALE * float(np.median(np.abs(values - loc)))) ** 2
+    if not variance > 0:
+        variance = float(values.var()) if values.size > 1 else 0.0
+    return loc, variance if variance > 0 else 1.0
+
+
+def _logsumexp(values):
+    """
+    Compute log(sum(exp(values))) along the last axis without overflow.
+
+    Args:
+        values (np.ndarray): Log values, -inf allowed.
+
+    Returns:
+        np.ndarray: One value per row.
+    """
+    peak = values.max(axis=-1)
+    safe = np.where(np.isfinite(peak), peak, 0.0)
+    with np.errstate(divide="ignore"):
+        return safe + np.log(np.exp(values - safe[..., None]).sum(axis=-1))
+
+
+class OnlineRegimes:
+    """
+    The OnlineRegimes class runs Bayesian online change-point detection on many series.
+
+    Each series keeps the posterior probability of every run length below max_run (the
+    number of observations since the last change; longer runs count as the longest) and,
+    for each run length, the Normal-Gamma posterior of the mean and variance. An update costs O(MAX_RUN) per
+    series whatever the length of the history, and only the series given a value are
+    touched. A series added without a prior first collects min_size values, takes its
+    prior from them (see robust_prior) and then replays them through the detector.
+
+    Attributes:
+        names (list of str): Series names, one row of the state per series.
+        hazard (float): Prior probability of a change at each step.
+        max_run (int): Run lengths tracked.
+        min_size (int): Shortest regime reported.
+        regime (np.ndarray): Current regime number of each series.
+        count (np.ndarray): Observations seen by each series.
+        start (np.ndarray): Observation number at which each series' current regime
+            started, revised as more observations arrive.
+    """
+
+    def __init__(self, names=(), hazard=HAZARD, max_run=MAX_RUN, min_size=MIN_SIZE, kappa0=KAPPA0,
+                 alpha0=ALPHA0):
+        """
+        Initialise the detector.
+
+        Args:
+            names (iterable of str): Series known in advance (more are added by update()).
+            hazard (float): Prior probability of a change at each step.
+            max_run (int): Run lengths tracked (bounds memory and time per update).
+            min_size (int): Shortest regime reported.
+            kappa0 (float): Prior confidence in the mean, in observations.
+            alpha0 (float): Prior shape of the precision.
+        """
+        self.hazard = hazard
+        self.max_run = max_run
+        self.min_size = min_size
+        self.kappa0 = kappa0
+        self.alpha0 = alpha0
+
+        # Run length r has seen r observations, so kappa, alpha and the Student-t
+        # constants only depend on r and are shared by every series
+        runs = np.arange(max_run)
+        self._kappa = kappa0 + runs
+        self._alpha = alpha0 + runs / 2
+        self._const = np.array([math.lgamma(a + 0.5) - math.lgamma(a) - 0.5 * math.log(2 * a * math.pi)
+                                for a in self._alpha])
+
+        self.names = []
+        self._rows = {}
+        self._log_prob = np.empty((0, max_run))  # log P(run length | data)
+        self._mu = np.empty((0, max_run))  # Posterior mean per run length
+        self._beta = np.empty((0, max_run))  # Posterior rate per run length
+        self._prior = np.empty((0, 2))  # Prior mean and rate per series
+        self._best = np.empty(0, dtype=np.int64)  # Most likely run length
+        self.regime = np.empty(0, dtype=np.int64)
+        self.count = np.empty(0, dtype=np.int64)
+        self.start = np.empty(0, dtype=np.int64)
+        self._warming = np.empty(0, dtype=bool)  # Still collecting values for the prior
+        self._warmup = {}  # row -> values collected so far
+        self.add(names)
+
+    def add(self, names, loc=None, variance=None):
+        """
+        Add series with the given prior (ignoring names already present).
+
+        Args:
+            names (iterable of str): New series names.
+            loc (float or None): Prior mean of the (transformed) values; None fits the
+                prior to the first min_size values of each series instead.
+            variance (float or None): Prior variance of the values (1 if only loc is given).
+        """
+        new = [name for name in dict.fromkeys(names) if name not in self._rows]
+        if not new:
+            return
+        warming = loc is None and variance is None
+        loc = 0.0 if loc is None else loc
+        variance = 1.0 if variance is None else variance
+        for name in new:
+            self._rows[name] = len(self.names)
+            if warming:
+                self._warmup[len(self.names)] = []
+            self.names.append(name)
+        count = len(new)
+        log_prob = np.full((count, self.max_run), -np.inf)
+        log_prob[:, 0] = 0.0
+        self._log_prob = np.vstack([self._log_prob, log_prob])
+        self._mu = np.vstack([self._mu, np.full((count, self.max_run), float(loc))])
+        self._beta = np.vstack([self._beta, np.full((count, self.max_run), self.alpha0 * variance)])
+        self._prior = np.vstack([self._prior, np.tile([float(loc), self.alpha0 * variance], (count, 1))])
+        zeros = np.zeros(count, dtype=np.int64)
+        self._best = np.concatenate([self._best, zeros])
+        self.regime = np.concatenate([self.regime, zeros])
+        self.count = np.concatenate([self.count, zeros])
+        self.start = np.concatenate([self.start, zeros])
+        self._warming = np.concatenate([self._warming, np.full(count, warming)])
+
+    def fit_prior(self, history):
+        """
+        Set each series' prior from past (transformed) values and restart its detection.
+
+        Args:
+            history (dict): Series name mapped to an array of past values.
+        """
+        for name, values in history.items():
+            self.add([name])
+            row = self._rows[name]
+            self._warming[row] = False
+            self._warmup.pop(row, None)
+            loc, variance = robust_prior(np.asarray(values, dtype=np.float64))
+            self._prior[row] = [loc, self.alpha0 * variance]
+            self._log_prob[row] = -np.inf
+            self._log_prob[row, 0] = 0.0
+            self._mu[row] = loc
+            self._beta[row] = self.alpha0 * variance
+
+    def push(self, rows, values):
+        """
+        Add one observation to each of several series at once.
+
+        Args:
+            rows (np.ndarray): Row numbers of the series (see names), each at most once.
+            values (np.ndarray): One (transformed) value per row; NaN values are skipped.
+
+        Returns:
+            np.ndarray: Boolean flags, True where the observation revealed a new regime.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        changed = np.zeros(rows.size, dtype=bool)
+        present = ~np.isnan(values)
+
+        # Series without a prior only collect values until they have min_size of them
+        warming = present & self._warming[rows]
+        ready = []
+        for row, value in zip(rows[warming], values[warming]):
+            self._warmup[row].append(value)
+            if len(self._warmup[row]) >= self.min_size:
+                ready.append(row)
+        for row in ready:
+            history = self._warmup[row]
+            self.fit_prior({self.names[row]: history})
+            for value in history:
+                self.push(np.array([row]), [value])
+
+        positions = np.flatnonzero(present & ~warming)
+        rows, x = rows[positions], values[positions][:, None]
+        if rows.size == 0:
+            return changed
+
+        log_prob, mu, beta = self._log_prob[rows], self._mu[rows], self._beta[rows]
+
+        # Student-t predictive probability of the value under every run length
+        scale2 = beta * (self._kappa + 1) / (self._alpha * self._kappa)
+        log_pred = (self._const - 0.5 * np.log(scale2)
+                    - (self._alpha + 0.5) * np.log1p((x - mu) ** 2 / (2 * self._alpha * scale2)))
+        joint = log_prob + log_pred
+
+        # Either the run grows by one or a change resets it to zero; runs reaching the
+        # longest tracked length stay there. No probability is lost, so the evidence
+        # normalises the result.
+        evidence = _logsumexp(joint)[:, None]
+        new_log_prob = np.empty_like(joint)
+        grown = joint - evidence + math.log1p(-self.hazard)
+        new_log_prob[:, :1] = math.log(self.hazard)
+        new_log_prob[:, 1:] = grown[:, :-1]
+        new_log_prob[:, -1] = np.logaddexp(new_log_prob[:, -1], grown[:, -1])
+
+        # Posterior of each grown run (the longest keeps the most recent max_run - 1
+        # observations); the new run starts from the prior
+        kappa = self._kappa[:-1]
+        new_mu = np.empty_like(mu)
+        new_beta = np.empty_like(beta)
+        new_mu[:, 0], new_beta[:, 0] = self._prior[rows, 0], self._prior[rows, 1]
+        new_mu[:, 1:] = (kappa * mu[:, :-1] + x) / (kappa + 1)
+        new_beta[:, 1:] = beta[:, :-1] + kappa * (x - mu[:, :-1]) ** 2 / (2 * (kappa + 1))
+
+        self._log_prob[rows], self._mu[rows], self._beta[rows] = new_log_prob, new_mu, new_beta
+        self.count[rows] += 1
+
+        # The most likely run length dates the start of the current regime (runs at the
+        # longest tracked length give no date). A start well after the current one is a
+        # new regime; an earlier start revises the current one.
+        best = new_log_prob.argmax(axis=1)
+        self._best[rows] = best
+        start = self.start[rows]
+        implied = np.where(best == self.max_run - 1, start, self.count[rows] - best)
+        fresh = implied >= start + self.min_size
+        self.regime[rows[fresh]] += 1
+        self.start[rows] = np.where(fresh | (implied < start), implied, start)
+        changed[positions[fresh]] = True
+        return changed
+
+    def update(self, values):
+        """
+        Add one observation to each of several series, by name.
+
+        Args:
+            values (dict): Series name mapped to its new (transformed) value. Unknown
+                series are added without a prior, so they warm up first (see add()).
+
+        Returns:
+            dict: Series name mapped to {"regime", "run_length", "changed"}.
+        """
+        self.add(values)
+        rows = np.array([self._rows[name] for name in values], dtype=np.int64)
+        changed = self.push(rows, np.fromiter(values.values(), dtype=np.float64, count=len(values)))
+        return {name: {"regime": int(self.regime[row]), "run_length": int(self._best[row]),
+                       "changed": bool(flag)}
+                for name, row, flag in zip(values, rows, changed)}
+
+    def run_length_probabilities(self, name):
+        """
+        Retrieve the run-length distribution of a series.
+
+        Args:
+            name (str): Series name.
+
+        Returns:
+            np.ndarray: P(run length = r) for r in 0..max_run-1.
+        """
+        return np.exp(self._log_prob[self._rows[name]])
+
+
+def bocpd(values, hazard=HAZARD, max_run=MAX_RUN, min_size=MIN_SIZE):
+    """
+    Find change points of one series with the online detector.
+
+    Args:
+        values (np.ndarray): Transformed values without missing entries.
+        hazard (float): Prior probability of a change at each step.
+        max_run (int): Run lengths tracked.
+        min_size (int): Shortest regime reported.
+
+    Returns:
+        list of int: Positions where a new regime starts, increasing.
+    """
+    detector = OnlineRegimes(hazard=hazard, max_run=max_run, min_size=min_size)
+    detector.fit_prior({"series": values})
+    rows = np.zeros(1, dtype=np.int64)
+    starts = {}
+    for value in values:
+        detector.push(rows, [value])
+        # Keep the latest estimate of each regime's start
+        starts[int(detector.regime[0])] = int(detector.start[0])
+    changes = []
+    for regime in sorted(starts)[1:]:
+        # A revised start can move before an earlier regime's; the later view wins
+        while changes and changes[-1] >= starts[regime]:
+            changes.pop()
+        if starts[regime] > 0:
+            changes.append(starts[regime])
+
+    # Revised starts can leave regimes shorter than min_size; merge them into the
+    # previous regime (the last regime must also have min_size values)
+    kept = []
+    for change in changes:
+        if change - (kept[-1] if kept else 0) >= min_size and len(values) - change >= min_size:
+            kept.append(change)
+    return kept
+
+
+def pelt(values, penalty=None, min_size=MIN_SIZE, max_candidates=MAX_CANDIDATES):
+    """
+    Find the change points of one series with PELT and a Gaussian mean/variance cost.
+
+    Segment costs come from cumulative sums in O(1), and start positions that can no
+    longer be optimal are pruned. Pruning alone is quadratic on series with few changes,
+    so at most max_candidates starts (those with the lowest cost so far) are kept, which
+    makes the run time linear in the length of the series; the result is exact whenever
+    pruning leaves fewer starts than that.
+
+    Args:
+        values (np.ndarray): Transformed values without missing entries.
+        penalty (float or None): Cost of each change; defaults to 3 log(n).
+        min_size (int): Shortest segment.
+        max_candidates (int): Start positions kept at most.
+
+    Returns:
+        list of int: Positions where a new regime starts, increasing.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = values.size
+    if n < 2 * min_size:
+        return []
+    penalty = 3 * math.log(n) if penalty is None else penalty
+    sums = np.concatenate([[0.0], np.cumsum(values)])
+    squares = np.concatenate([[0.0], np.cumsum(values * values)])
+    # Keeps constant stretches from having an infinitely negative cost
+    floor = 1e-12 * max(float(values.var()), 1e-300)
+
+    def cost(starts, end):
+        length = end - starts
+        mean = (sums[end] - sums[starts]) / length
+        variance = (squares[end] - squares[starts]) / length - mean * mean
+        return length * np.log(np.maximum(variance, floor))
+
+    best = np.empty(n + 1)
+    best[0] = -penalty
+    previous = np.zeros(n + 1, dtype=np.int64)
+    candidates = np.zeros(1, dtype=np.int64)
+    for end in range(min_size, n + 1):
+        # Segments need min_size values, so a start becomes usable min_size steps later
+        if end >= 2 * min_size:
+            candidates = np.append(candidates, end - min_size)
+        totals = best[candidates] + cost(candidates, end)
+        choice = totals.argmin()
+        best[end] = totals[choice] + penalty
+        previous[end] = candidates[choice]
+        # Starts that cannot beat the best even without a penalty are never optimal again
+        keep = totals <= best[end]
+        candidates, totals = candidates[keep], totals[keep]
+        if candidates.size > max_candidates:
+            # Keep the most promising starts, in position order
+            candidates = candidates[np.sort(np.argpartition(totals, max_candidates)[:max_candidates])]
+
+    changes = []
+    end = n
+    while end > 0:
+        end = int(previous[end])
+        if end > 0:
+            changes.append(end)
+    return changes[::-1]
+
+
+def regime_labels(changes, length):
+    """
+    Number the regimes of a series from its change points.
+
+    Args:
+        changes (list of int): Positions where a new regime starts.
+        length (int): Length of the series.
+
+    Returns:
+        np.ndarray: Regime number of every position (0 for the first regime).
+    """
+    labels = np.zeros(length, dtype=np.int64)
+    for change in changes:
+        labels[change:] += 1
+    return labels
+
+
+def detect_regimes(frame, columns=None, method="pelt", **options):
+    """
+    Label the regimes of several columns of a dataset.
+
+    Args:
+        frame (pd.DataFrame): Dataset with a "Date" column.
+        columns (list of str or None): Columns to analyse; defaults to every return and
+            volatility column.
+        method (str): "pelt" (batch) or "bocpd" (online detector run over the history).
+        **options: Passed on to pelt() or bocpd().
+
+    Returns:
+        pd.DataFrame: "Date" and a "{column}_Regime" column of regime numbers per column.
+            Rows with a missing value take the regime of the previous row.
+    """
+    if columns is None:
+        columns = [column for column in frame.columns if column.endswith("Return") or is_volatility(column)]
+    detect = {"pelt": pelt, "bocpd": bocpd}[method]
+    result = pd.DataFrame({"Date": frame["Date"]})
+    for column in columns:
+        values = prepare(frame[column], column)
+        present = np.flatnonzero(~np.isnan(values))
+        labels = np.zeros(len(frame), dtype=np.int64)
+        if present.size:
+            # Changes are found on the present values and mapped back to the rows
+            changes = detect(values[present], **options)
+            labels = regime_labels(present[changes].tolist(), len(frame))
+        result[f"{column}_Regime"] = labels
+    return result
+
+
+def regime_summary(frame, column, labels):
+    """
+    Describe each regime of a column.
+
+    Args:
+        frame (pd.DataFrame): Dataset with a "Date" column.
+        column (str): Column the regimes were found in.
+        labels (array-like): Regime number of every row.
+
+    Returns:
+        pd.DataFrame: Per regime: "Start", "End", "Rows", "Mean" and "Std" of the column.
+    """
+    data = pd.DataFrame({"Date": frame["Date"].to_numpy(), "Value": frame[column].to_numpy(dtype=np.float64),
+                         "Regime": np.asarray(labels)})
+    grouped = data.groupby("Regime")
+    return pd.DataFrame({
+        "Start": grouped["Date"].min(),
+        "End": grouped["Date"].max(),
+        "Rows": grouped["Value"].count(),
+        "Mean": grouped["Value"].mean(),
+        "Std": grouped["Value"].std(),
+    })
+
+
+class LiveRegimes:
+    """
+    The LiveRegimes class tracks the regimes of live bars, for use as (or inside) the
+    on_bar callback of live_ingest.LivePipeline.
+
+    Every bar updates the asset's return and volatility series and, for assets in a
+    group, the group's average return and volatility, in one detector step.
+
+    Attributes:
+        detector (OnlineRegimes): Online detector holding every series.
+        asset_groups (dict): Asset ticker mapped to its group name.
+        changes (list of dict): Changes reported so far ("Start" of the bar, "Series",
+            "Regime").
+    """
+
+    def __init__(self, asset_groups=None, history=None, **options):
+        """
+        Initialise the tracker.
+
+        Args:
+            asset_groups (dict or None): Asset -> group mapping; defaults to
+                group_aggregation.DEFAULT_GROUPS.
+            history (pd.DataFrame or None): Past data whose "{ticker}_Return",
+                "{ticker}_Volatility", "{group}_Avg_Return" and "{group}_Avg_Volatility"
+                columns set the priors of the matching series. Other series take
+                their prior from their first min_size bars.
+            **options: Passed on to OnlineRegimes.
+        """
+        self.asset_groups = dict(DEFAULT_GROUPS if asset_groups is None else asset_groups)
+        self.detector = OnlineRegimes(**options)
+        self.changes = []
+        if history is not None:
+            self.detector.fit_prior({column: prepare(history[column], column) for column in history.columns
+                                     if column.endswith("Return") or is_volatility(column)})
+
+    def __call__(self, result):
+        """
+        Update the regimes with the metrics of a closed bar.
+
+        Args:
+            result (dict): Bar metrics from live_ingest.LiveMetrics.update().
+
+        Returns:
+            dict: Series name mapped to {"regime", "run_length", "changed"}.
+        """
+        ticker = result["Ticker"]
+        values = {}
+        if result.get("Return") is not None:
+            values[f"{ticker}_Return"] = result["Return"]
+        values[f"{ticker}_Volatility"] = result["Volatility"]
+        group = self.asset_groups.get(ticker)
+        if group is not None:
+            for metric in ("Avg_Return", "Avg_Volatility"):
+                if result.get(f"{group}_{metric}") is not None:
+                    values[f"{group}_{metric}"] = result[f"{group}_{metric}"]
+
+        state = self.detector.update({name: float(prepare([value], name)[0]) for name, value in values.items()})
+        for name, status in state.items():
+            if status["changed"]:
+                self.changes.append({"Start": result["Start"], "Series": name, "Regime": status["regime"]})
+        return state
+
+
+def main(argv=None):
+    """
+    Command-line entry point: label the regimes of a dataset and summarise them.
+
+    Args:
+        argv (list of str or None): Arguments; defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Detect return and volatility regimes.")
+    parser.add_argument("--data", default=os.path.join(DATA_DIR, "cleaned_grouped_data.csv"),
+                        help="wide dataset with a Date column (default: cleaned_grouped_data.csv)")
+    parser.add_argument("--columns", nargs="+", default=None,
+                        help="columns to analyse (default: returns and volatility)")
+    parser.add_argument("--method", choices=["pelt", "bocpd"], default="pelt")
+    parser.add_argument("--output", default=None, help="write the dataset with the regime columns added")
+    args = parser.parse_args(argv)
+
+    frame = read_wide_csv(args.data)
+    labels = detect_regimes(frame, args.columns, args.method)
+    for column in labels.columns.drop("Date"):
+        source = column[:-len("_Regime")]
+        print(f"\n{source}: {labels[column].max() + 1} regime(s)")
+        print(regime_summary(frame, source, labels[column]).to_string())
+    if args.output:
+        pd.concat([frame, labels.drop(columns="Date")], axis=1).to_csv(args.output, index=False)
+        print(f"\nLabelled dataset written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
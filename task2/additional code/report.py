@@ -0,0 +1,348 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the headless report command. It renders the notebook's
+figures (daily returns, returns boxplot, smoothed volatility, volatility histogram,
+trading volume and cumulative returns, plus per-period returns and volatility read
+from the aggregate pyramid) with matplotlib's non-interactive Agg backend in
+a process pool, and writes them as a static HTML/PNG bundle. Each figure is cached by a
+hash of the data columns it uses, so regenerating the report after a small data change
+only redraws the affected charts.
+
+Usage:
+    python report.py --data ../data/cleaned_grouped_data.csv --output ../report
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from aggregate_pyramid import group_bars
+from loaders import read_wide_csv
+
+# Bump to force every figure to be redrawn after changing the plotting code
+RENDER_VERSION = 1
+
+# Default input data and output folder, relative to this file
+DEFAULT_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "cleaned_grouped_data.csv")
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "report")
+
+# Figure name mapped to (title, columns used besides Date)
+FIGURES = {
+    "daily_returns": ("Time-Series Plot of Daily Average Returns: Stocks vs Crypto",
+                      ["Stocks_Avg_Return", "Cryptos_Avg_Return"]),
+    "returns_boxplot": ("Distribution of Average Returns",
+                        ["Stocks_Avg_Return", "Cryptos_Avg_Return"]),
+    "smoothed_volatility": ("Smoothed Stocks vs Crypto Average Volatility (Log Scale)",
+                            ["Stocks_Avg_Volatility", "Cryptos_Avg_Volatility"]),
+    "volatility_histogram": ("Histogram of Volatility Distribution (Log Scale)",
+                             ["Stocks_Avg_Volatility", "Cryptos_Avg_Volatility"]),
+    "trading_volume": ("Smoothed Trading Volumes: Stocks vs Crypto (Log Scale)",
+                       ["Stocks_Total_Volume", "Cryptos_Total_Volume"]),
+    "cumulative_returns": ("Cumulative Return of $1 Invested (Stocks vs Crypto)",
+                           ["Stocks_Avg_Return", "Cryptos_Avg_Return"]),
+    "period_summary": ("Mean Return and Volatility per Period (Stocks vs Crypto)",
+                       ["Stocks_Avg_Return", "Cryptos_Avg_Return", "Stocks_Avg_Volatility", "Cryptos_Avg_Volatility"]),
+}
+
+# Figures drawn from the aggregate pyramid, mapped to the most periods they show; the
+# finest level that fits is read (monthly for the two years of the grouped dataset)
+PERIOD_FIGURES = {"period_summary": 60}
+
+
+def figure_hash(name, data):
+    """
+    Hash the data a figure depends on, together with its name and the render version.
+
+    Args:
+        name (str): Figure name from FIGURES.
+        data (pd.DataFrame): Report data with a "Date" column.
+
+    Returns:
+        str: Hex digest identifying this rendering of the figure.
+    """
+    digest = hashlib.sha256(f"{name}:{RENDER_VERSION}".encode())
+    digest.update(data["Date"].to_numpy().astype("datetime64[ns]").tobytes())
+    for column in FIGURES[name][1]:
+        digest.update(column.encode())
+        digest.update(data[column].to_numpy(dtype="float64").tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _plot_daily_returns(plt, data):
+    """Two stacked time-series plots of the daily average returns."""
+    fig, axes = plt.subplots(2, 1, figsize=(14, 10), sharex=True)
+    for ax, column, label, color in [(axes[0], "Stocks_Avg_Return", "Stocks", "blue"),
+                                     (axes[1], "Cryptos_Avg_Return", "Crypto", "orange")]:
+        ax.plot(data["Date"], data[column], label=label, color=color, alpha=0.8)
+        ax.axhline(y=0, color="black", linestyle="--", linewidth=0.8)
+        ax.set_title(f"{label}: Daily Average Returns", fontsize=18)
+        ax.set_xlabel("Date", fontsize=16)
+        ax.set_ylabel(f"Daily Average Return ({label})", fontsize=14)
+        ax.grid(alpha=0.3)
+        ax.tick_params(axis="x", labelrotation=45, labelsize=14)
+        ax.tick_params(axis="y", labelsize=14)
+    fig.suptitle(FIGURES["daily_returns"][0], fontsize=20)
+    return fig
+
+
+def _plot_returns_boxplot(plt, data):
+    """Boxplot of the average returns annotated with the median and quartiles."""
+    fig, ax = plt.subplots(figsize=(12, 6))
+    series = [data["Stocks_Avg_Return"].dropna(), data["Cryptos_Avg_Return"].dropna()]
+    ax.boxplot(series, patch_artist=True,
+               boxprops=dict(facecolor="lightblue", color="blue"),
+               medianprops=dict(color="red", linewidth=2),
+               whiskerprops=dict(color="blue"), capprops=dict(color="blue"),
+               flierprops=dict(marker="o", markerfacecolor="black", markersize=5, alpha=0.5))
+    ax.set_xticks([1, 2], ["Stocks", "Crypto"])
+    for x, values in enumerate(series, start=1):
+        ax.text(x + 0.1, values.median(), f"Median: {values.median():.4f}", ha="left", va="center", fontsize=12, color="red")
+        ax.text(x - 0.1, values.quantile(0.25), f"Q1: {values.quantile(0.25):.4f}", ha="right", va="center", fontsize=12, color="blue")
+        ax.text(x - 0.1, values.quantile(0.75), f"Q3: {values.quantile(0.75):.4f}", ha="right", va="center", fontsize=12, color="blue")
+    ax.set_title(FIGURES["returns_boxplot"][0], fontsize=16)
+    ax.set_ylabel("Average Daily Returns", fontsize=14)
+    ax.set_xlabel("Asset Class", fontsize=14)
+    ax.grid(axis="y", alpha=0.5)
+    return fig
+
+
+def _plot_smoothed_volatility(plt, data):
+    """30-day rolling average of the volatility on a logarithmic scale."""
+    fig, ax = plt.subplots(figsize=(14, 8))
+    ax.plot(data["Date"], data["Stocks_Avg_Volatility"].rolling(window=30).mean(),
+            label="Stocks Avg Volatility (Smoothed)", color="blue", alpha=0.8)
+    ax.plot(data["Date"], data["Cryptos_Avg_Volatility"].rolling(window=30).mean(),
+            label="Crypto Avg Volatility (Smoothed)", color="orange", alpha=0.8)
+    ax.set_yscale("log")
+    ax.set_title(FIGURES["smoothed_volatility"][0], fontsize=16)
+    ax.set_xlabel("Date", fontsize=14)
+    ax.set_ylabel("Average Daily Volatility (Log Scale)", fontsize=14)
+    ax.legend(fontsize=12)
+    ax.grid(alpha=0.5)
+    return fig
+
+
+def _plot_volatility_histogram(plt, data):
+    """Histograms of the volatility on a logarithmic x-axis."""
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.hist(data["Stocks_Avg_Volatility"].dropna(), bins=30, alpha=0.7, label="Stocks", color="blue")
+    ax.hist(data["Cryptos_Avg_Volatility"].dropna(), bins=30, alpha=0.7, label="Crypto", color="orange")
+    ax.set_xscale("log")
+    ax.set_title(FIGURES["volatility_histogram"][0], fontsize=16)
+    ax.set_xlabel("Volatility (Log Scale)", fontsize=14)
+    ax.set_ylabel("Frequency", fontsize=14)
+    ax.legend(fontsize=10)
+    ax.grid(alpha=0.5)
+    return fig
+
+
+def _plot_trading_volume(plt, data):
+    """Centred 30-day rolling average of the total trading volume on a log scale."""
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(data["Date"], data["Stocks_Total_Volume"].rolling(window=30, center=True).mean(),
+            label="Stocks Total Volume (Smoothed)", color="blue", alpha=0.8)
+    ax.plot(data["Date"], data["Cryptos_Total_Volume"].rolling(window=30, center=True).mean(),
+            label="Crypto Total Volume (Smoothed)", color="orange", alpha=0.8)
+    ax.set_yscale("log")
+    ax.set_title(FIGURES["trading_volume"][0], fontsize=16)
+    ax.set_xlabel("Date", fontsize=14)
+    ax.set_ylabel("Trading Volume (Log Scale)", fontsize=14)
+    ax.legend(fontsize=10)
+    ax.grid(alpha=0.5)
+    return fig
+
+
+def _plot_cumulative_returns(plt, data):
+    """Growth of $1 invested in each group."""
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(data["Date"], (1 + data["Stocks_Avg_Return"]).cumprod(), label="Stocks", color="blue", alpha=0.8)
+    ax.plot(data["Date"], (1 + data["Cryptos_Avg_Return"]).cumprod(), label="Crypto", color="orange", alpha=0.8)
+    ax.set_title(FIGURES["cumulative_returns"][0], fontsize=16)
+    ax.set_xlabel("Date", fontsize=14)
+    ax.set_ylabel("Cumulative Return", fontsize=14)
+    ax.legend(fontsize=12)
+    ax.grid(alpha=0.5)
+    return fig
+
+
+def _plot_period_summary(plt, data):
+    """Mean return per period with a one-standard-deviation band, and mean volatility."""
+    fig, axes = plt.subplots(2, 1, figsize=(14, 10), sharex=True)
+    for group, label, color in [("Stocks", "Stocks", "blue"), ("Cryptos", "Crypto", "orange")]:
+        mean, std = data[f"{group}_Avg_Return"], data[f"{group}_Return_Std"]
+        axes[0].plot(data["Date"], mean, label=label, color=color, marker="o", alpha=0.8)
+        axes[0].fill_between(data["Date"], mean - std, mean + std, color=color, alpha=0.15)
+        axes[1].plot(data["Date"], data[f"{group}_Avg_Volatility"], label=label, color=color, marker="o", alpha=0.8)
+    level = data["Level"].iloc[0] if len(data) else "period"
+    axes[0].axhline(y=0, color="black", linestyle="--", linewidth=0.8)
+    axes[0].set_ylabel(f"Mean Daily Return per {level.capitalize()} Period", fontsize=14)
+    axes[1].set_yscale("log")
+    axes[1].set_ylabel("Mean Volatility (Log Scale)", fontsize=14)
+    axes[1].set_xlabel("Period Start", fontsize=14)
+    for ax in axes:
+        ax.legend(fontsize=12)
+        ax.grid(alpha=0.5)
+    fig.suptitle(FIGURES["period_summary"][0], fontsize=18)
+    return fig
+
+
+def period_data(data_path, max_points):
+    """
+    Read the per-period statistics of both groups from the aggregate pyramid.
+
+    Args:
+        data_path (str): Grouped dataset such as cleaned_grouped_data.csv.
+        max_points (int): Most periods wanted; the finest level that fits is read.
+
+    Returns:
+        pd.DataFrame: Date, Level and the "{group}_{statistic}" columns of group_bars().
+    """
+    stocks = group_bars("Stocks", data_path, max_points=max_points)
+    cryptos = group_bars("Cryptos", data_path, max_points=max_points)
+    data = stocks[["Date"]].copy()
+    data["Level"] = stocks.attrs["level"]
+    for group, bars in (("Stocks", stocks), ("Cryptos", cryptos)):
+        for column in bars.columns.drop("Date"):
+            data[f"{group}_{column}"] = bars[column]
+    return data
+
+
+# Figure name mapped to its drawing function
+PLOTTERS = {
+    "daily_returns": _plot_daily_returns,
+    "returns_boxplot": _plot_returns_boxplot,
+    "smoothed_volatility": _plot_smoothed_volatility,
+    "volatility_histogram": _plot_volatility_histogram,
+    "trading_volume": _plot_trading_volume,
+    "cumulative_returns": _plot_cumulative_returns,
+    "period_summary": _plot_period_summary,
+}
+
+
+def render_figure(job):
+    """
+    Render one figure to PNG (executed inside a worker process).
+
+    Args:
+        job (tuple): (figure name, DataFrame with the Date and figure columns, output path).
+
+    Returns:
+        str: Path of the written PNG file.
+    """
+    name, data, path = job
+    # Select the non-interactive backend before pyplot is imported in this process
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig = PLOTTERS[name](plt, data)
+    fig.tight_layout()
+    # Write to a temporary file first so an interrupted run never leaves a broken PNG
+    temp_path = path + ".tmp"
+    fig.savefig(temp_path, dpi=100, format="png")
+    plt.close(fig)
+    os.replace(temp_path, path)
+    return path
+
+
+def write_html(output_dir, entries, data_path):
+    """
+    Write the report index page.
+
+    Args:
+        output_dir (str): Report folder.
+        entries (list of tuple): (figure name, title, PNG file name) in display order.
+        data_path (str): Input data file, shown in the page header.
+    """
+    sections = "\n".join(
+        f'<section id="{name}">\n<h2>{html.escape(title)}</h2>\n<img src="{file_name}" alt="{html.escape(title)}">\n</section>'
+        for name, title, file_name in entries)
+    page = (
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+        "<title>Stocks vs Cryptocurrencies Report</title>\n"
+        "<style>body{font-family:sans-serif;max-width:1100px;margin:auto}img{max-width:100%}</style>\n"
+        "</head>\n<body>\n<h1>Stocks vs Cryptocurrencies Report</h1>\n"
+        f"<p>Data: {html.escape(os.path.basename(data_path))}</p>\n{sections}\n</body>\n</html>\n")
+    with open(os.path.join(output_dir, "index.html"), "w") as handle:
+        handle.write(page)
+
+
+def build_report(data_path=DEFAULT_DATA, output_dir=DEFAULT_OUTPUT, workers=None, figures=None):
+    """
+    Render every figure whose input data changed and write the HTML index.
+
+    Args:
+        data_path (str): Grouped dataset such as cleaned_grouped_data.csv.
+        output_dir (str): Folder for the HTML/PNG bundle (created if needed).
+        workers (int or None): Number of rendering processes (None uses all cores,
+            1 renders in the current process).
+        figures (list of str or None): Figures to include; defaults to all of FIGURES.
+
+    Returns:
+        dict: "rendered" and "cached" lists of figure names.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    data = read_wide_csv(data_path)
+    figures = list(FIGURES) if figures is None else figures
+
+    # Work out which figures need redrawing from their data hashes
+    entries = []
+    jobs = []
+    cached = []
+    for name in figures:
+        file_name = f"{name}-{figure_hash(name, data)}.png"
+        entries.append((name, FIGURES[name][0], file_name))
+        if os.path.exists(os.path.join(output_dir, file_name)):
+            cached.append(name)
+        else:
+            if name in PERIOD_FIGURES:
+                figure_data = period_data(data_path, PERIOD_FIGURES[name])
+            else:
+                figure_data = data[["Date"] + FIGURES[name][1]]
+            jobs.append((name, figure_data, os.path.join(output_dir, file_name)))
+
+    if jobs:
+        if workers == 1:
+            list(map(render_figure, jobs))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(render_figure, jobs))
+
+    # Remove renderings of the figures that have been superseded
+    current = {file_name for _, _, file_name in entries}
+    for file_name in os.listdir(output_dir):
+        name = file_name.rsplit("-", 1)[0]
+        if file_name.endswith(".png") and name in figures and file_name not in current:
+            os.remove(os.path.join(output_dir, file_name))
+
+    write_html(output_dir, entries, data_path)
+    rendered = [job[0] for job in jobs]
+    with open(os.path.join(output_dir, "manifest.json"), "w") as handle:
+        json.dump({name: file_name for name, _, file_name in entries}, handle, indent=2)
+    return {"rendered": rendered, "cached": cached}
+
+
+def main(argv=None):
+    """
+    Command-line entry point for the report.
+
+    Args:
+        argv (list of str or None): Arguments; defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Render the stocks vs crypto report as static HTML/PNG.")
+    parser.add_argument("--data", default=DEFAULT_DATA, help="grouped dataset (default: cleaned_grouped_data.csv)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="output folder for the report")
+    parser.add_argument("--workers", type=int, default=None, help="number of rendering processes")
+    args = parser.parse_args(argv)
+
+    result = build_report(args.data, args.output, args.workers)
+    print(f"Rendered {len(result['rendered'])} figure(s), reused {len(result['cached'])} cached figure(s).")
+    print(f"Report written to {os.path.join(args.output, 'index.html')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,655 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the rolling-window statistics library. Batch functions
+work on 2-D (dates x assets) arrays, computing every asset at once with O(1) amortised
+work per value: running sums for mean/std/correlation and the van Herk/Gil-Werman block
+method for min/max. Streaming classes accept one value per tick and update their
+statistics without recomputing the window: Welford updates for mean/std, monotonic
+deques for min/max and a two-heap structure for medians and other quantiles.
+"""
+
+import heapq
+from collections import deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from features import rolling_mean_std
+
+
+# ---------------------------------------------------------------------------
+# Batch functions
+# ---------------------------------------------------------------------------
+
+def _as_2d(values):
+    """
+    Convert input data to a float64 2-D array.
+
+    Args:
+        values (array-like): 1-D series or 2-D (dates x assets) array.
+
+    Returns:
+        tuple: (2-D array, True if the input was 1-D).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        return values.reshape(-1, 1), True
+    return values, False
+
+
+def _finish(result, window, center, was_1d):
+    """
+    Optionally centre the windows and restore the input dimensionality.
+
+    A centred window at row t covers the same rows as a trailing window ending at row
+    t + (window - 1) // 2, matching pandas' rolling(window, center=True).
+
+    Args:
+        result (np.ndarray): Trailing-window results of shape (dates, assets).
+        window (int): Window length.
+        center (bool): Whether to centre the windows.
+        was_1d (bool): Whether the input was 1-D.
+
+    Returns:
+        np.ndarray: Final results.
+    """
+    if center:
+        offset = (window - 1) // 2
+        centred = np.full(result.shape, np.nan)
+        centred[:result.shape[0] - offset] = result[offset:]
+        result = centred
+    return result[:, 0] if was_1d else result
+
+
+def _full_windows(values, window):
+    """
+    Flag rows whose trailing window is complete and contains no NaN.
+
+    Args:
+        values (np.ndarray): 2-D array of shape (dates, assets).
+        window (int): Window length.
+
+    Returns:
+        np.ndarray: Boolean array of the same shape.
+    """
+    missing = np.concatenate([np.zeros((1, values.shape[1])), np.cumsum(np.isnan(values), axis=0)])
+    full = np.zeros(values.shape, dtype=bool)
+    if values.shape[0] >= window:
+        full[window - 1:] = (missing[window:] - missing[:-window]) == 0
+    return full
+
+
+def rolling_mean(values, window, center=False):
+    """
+    Calculate the rolling mean of every column.
+
+    Args:
+        values (array-like): 1-D series or 2-D (dates x assets) array.
+        window (int): Window length; windows with missing values give NaN.
+        center (bool): Centre the windows, as in rolling(window, center=True).
+
+    Returns:
+        np.ndarray: Rolling means with the same shape as values.
+    """
+    values, was_1d = _as_2d(values)
+    return _finish(rolling_mean_std(values, window)[0], window, center, was_1d)
+
+
+def rolling_std(values, window, center=False):
+    """
+    Calculate the rolling sample standard deviation (ddof=1) of every column.
+
+    Args:
+        values (array-like): 1-D series or 2-D (dates x assets) array.
+        window (int): Window length.
+        center (bool): Centre the windows.
+
+    Returns:
+        np.ndarray: Rolling standard deviations with the same shape as values.
+    """
+    values, was_1d = _as_2d(values)
+    return _finish(rolling_mean_std(values, window)[1], window, center, was_1d)
+
+
+def _rolling_extreme(values, window, reduce):
+    """
+    Rolling min or max with the van Herk/Gil-Werman algorithm.
+
+    Rows are split into blocks of the window length. A running extreme from the start of
+    each block (prefix) and from the end of each block (suffix) is computed once; every
+    window then spans at most two blocks, so its extreme is reduce(suffix[start],
+    prefix[end]). This costs three comparisons per value whatever the window length.
+
+    Args:
+        values (np.ndarray): 2-D array of shape (dates, assets).
+        window (int): Window length.
+        reduce (np.ufunc): np.minimum or np.maximum.
+
+    Returns:
+        np.ndarray: Rolling extremes, NaN for incomplete windows or windows with NaN.
+    """
+    n_rows, n_cols = values.shape
+    result = np.full(values.shape, np.nan)
+    if window < 1 or n_rows < window:
+        return result
+
+    # Pad to a whole number of blocks with a value that never wins the comparison
+    fill = np.inf if reduce is np.minimum else -np.inf
+    n_blocks = -(-n_rows // window)
+    padded = np.full((n_blocks * window, n_cols), fill)
+    padded[:n_rows] = np.where(np.isnan(values), fill, values)
+    blocks = padded.reshape(n_blocks, window, n_cols)
+
+    prefix = reduce.accumulate(blocks, axis=1).reshape(-1, n_cols)
+    suffix = reduce.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(-1, n_cols)
+
+    # Window ending at row t starts at row t - window + 1
+    ends = np.arange(window - 1, n_rows)
+    result[window - 1:] = reduce(suffix[ends - window + 1], prefix[ends])
+    return np.where(_full_windows(values, window), result, np.nan)
+
+
+def rolling_min(values, window, center=False):
+    """
+    Calculate the rolling minimum of every column in O(1) per value.
+
+    Args:
+        values (array-like): 1-D series or 2-D (dates x assets) array.
+        window (int): Window length.
+        center (bool): Centre the windows.
+
+    Returns:
+        np.ndarray: Rolling minima with the same shape as values.
+    """
+    values, was_1d = _as_2d(values)
+    return _finish(_rolling_extreme(values, window, np.minimum), window, center, was_1d)
+
+
+def rolling_max(values, window, center=False):
+    """
+    Calculate the rolling maximum of every column in O(1) per value.
+
+    Args:
+        values (array-like): 1-D series or 2-D (dates x assets) array.
+        window (int): Window length.
+        center (bool): Centre the windows.
+
+    Returns:
+        np.ndarray: Rolling maxima with the same shape as values.
+    """
+    values, was_1d = _as_2d(values)
+    return _finish(_rolling_extreme(values, window, np.maximum), window, center, was_1d)
+
+
+def rolling_quantile(values, window, q, center=False, chunk_rows=4096):
+    """
+    Calculate a rolling quantile (linear interpolation) of every column.
+
+    Windows are read through a strided view, and rows are processed in chunks so the
+    temporary partition buffer stays bounded for long histories.
+
+    Args:
+        values (array-like): 1-D series or 2-D (dates x assets) array.
+        window (int): Window length.
+        q (float): Quantile between 0 and 1 (0.5 for the rolling median).
+        center (bool): Centre the windows.
+        chunk_rows (int): Number of windows evaluated per chunk.
+
+    Returns:
+        np.ndarray: Rolling quantiles with the same shape as values.
+    """
+    values, was_1d = _as_2d(values)
+    result = np.full(values.shape, np.nan)
+    if values.shape[0] >= window >= 1:
+        # View of shape (windows, assets, window) without copying the data
+        windows = sliding_window_view(values, window, axis=0)
+        for first in range(0, windows.shape[0], chunk_rows):
+            part = windows[first:first + chunk_rows]
+            result[window - 1 + first:window - 1 + first + part.shape[0]] = np.quantile(part, q, axis=2)
+        result = np.where(_full_windows(values, window), result, np.nan)
+    return _finish(result, window, center, was_1d)
+
+
+def rolling_corr(x, y, window, center=False):
+    """
+    Calculate the rolling Pearson correlation between matching columns of x and y.
+
+    Args:
+        x (array-like): 1-D series or 2-D (dates x assets) array.
+        y (array-like): Array with the same shape as x.
+        window (int): Window length.
+        center (bool): Centre the windows.
+
+    Returns:
+        np.ndarray: Rolling correlations with the same shape as x.
+    """
+    x, was_1d = _as_2d(x)
+    y, _ = _as_2d(y)
+    # A window is only valid if both series are present on every row
+    missing = np.isnan(x) | np.isnan(y)
+    x = np.where(missing, np.nan, x)
+    y = np.where(missing, np.nan, y)
+
+    mean_x, std_x = rolling_mean_std(x, window)
+    mean_y, std_y = rolling_mean_std(y, window)
+    mean_xy, _ = rolling_mean_std(x * y, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Sample covariance from the window means, rescaled to ddof=1
+        covariance = (mean_xy - mean_x * mean_y) * window / (window - 1)
+        corr = covariance / (std_x * std_y)
+    corr[~np.isfinite(corr)] = np.nan
+    return _finish(np.clip(corr, -1.0, 1.0), window, center, was_1d)
+
+
+# ---------------------------------------------------------------------------
+# Streaming classes
+# ---------------------------------------------------------------------------
+
+class RollingMoments:
+    """
+    The RollingMoments class keeps the mean and variance of the last `window` values,
+    updated in O(1) per push with Welford's add/remove formulas.
+
+    Attributes:
+        window (int): Window length.
+        mean (float): Mean of the current window (NaN if empty).
+    """
+
+    def __init__(self, window):
+        """
+        Initialise an empty window.
+
+        Args:
+            window (int): Window length.
+        """
+        self.window = window
+        self._values = deque()
+        self.mean = np.nan
+        self._m2 = 0.0
+
+    def push(self, value):
+        """
+        Add a value, evicting the oldest one once the window is full.
+
+        Args:
+            value (float): New observation.
+        """
+        value = float(value)
+        self._values.append(value)
+        count = len(self._values)
+        if count == 1:
+            self.mean = value
+            self._m2 = 0.0
+        else:
+            delta = value - self.mean
+            self.mean += delta / count
+            self._m2 += delta * (value - self.mean)
+
+        if count > self.window:
+            # Reverse the Welford update for the evicted value
+            old = self._values.popleft()
+            count -= 1
+            delta = old - self.mean
+            self.mean -= delta / count
+            self._m2 -= delta * (old - self.mean)
+
+    @property
+    def count(self):
+        """
+        Retrieve the number of values in the window.
+
+        Returns:
+            int: Window occupancy.
+        """
+        return len(self._values)
+
+    @property
+    def variance(self):
+        """
+        Retrieve the sample variance (ddof=1) of the window.
+
+        Returns:
+            float: Variance, or NaN with fewer than two values.
+        """
+        if len(self._values) < 2:
+            return np.nan
+        return max(self._m2, 0.0) / (len(self._values) - 1)
+
+    @property
+    def std(self):
+        """
+        Retrieve the sample standard deviation of the window.
+
+        Returns:
+            float: Standard deviation, or NaN with fewer than two values.
+        """
+        return float(np.sqrt(self.variance))
+
+
+class RollingExtreme:
+    """
+    The RollingExtreme class tracks the minimum or maximum of the last `window` values
+    with a monotonic deque, giving O(1) amortised updates.
+
+    Attributes:
+        window (int): Window length.
+        kind (str): "min" or "max".
+    """
+
+    def __init__(self, window, kind="max"):
+        """
+        Initialise an empty window.
+
+        Args:
+            window (int): Window length.
+            kind (str): "min" or "max".
+        """
+        self.window = window
+        self.kind = kind
+        self._deque = deque()  # (tick, value) pairs with monotonic values
+        self._tick = 0
+
+    def push(self, value):
+        """
+        Add a value and return the current extreme.
+
+        Args:
+            value (float): New observation.
+
+        Returns:
+            float: Minimum or maximum of the window.
+        """
+        # Drop values that can never be the extreme again
+        if self.kind == "max":
+            while self._deque and self._deque[-1][1] <= value:
+                self._deque.pop()
+        else:
+            while self._deque and self._deque[-1][1] >= value:
+                self._deque.pop()
+        self._deque.append((self._tick, value))
+
+        # Drop the front value once it falls out of the window
+        if self._deque[0][0] <= self._tick - self.window:
+            self._deque.popleft()
+        self._tick += 1
+        return self._deque[0][1]
+
+    @property
+    def value(self):
+        """
+        Retrieve the current extreme.
+
+        Returns:
+            float: Minimum or maximum of the window, or NaN if empty.
+        """
+        return self._deque[0][1] if self._deque else np.nan
+
+
+class RollingQuantile:
+    """
+    The RollingQuantile class tracks a quantile of the last `window` values with two
+    heaps: a max-heap holding the lower part of the window and a min-heap holding the
+    upper part. Evicted values are deleted lazily when they reach the top of a heap, and
+    both heaps are rebuilt once more than `window` deleted entries have piled up (as they
+    do on trending data, where old values never reach the top), so memory stays O(window)
+    and each push costs amortised O(log window).
+
+    The result uses linear interpolation between neighbouring order statistics, so
+    q=0.5 gives the usual median (the mean of the middle pair for even windows).
+
+    Attributes:
+        window (int): Window length.
+        q (float): Quantile between 0 and 1.
+    """
+
+    def __init__(self, window, q=0.5):
+        """
+        Initialise an empty window.
+
+        Args:
+            window (int): Window length.
+            q (float): Quantile between 0 and 1.
+        """
+        self.window = window
+        self.q = q
+        self._low = []  # Max-heap of (-value, id)
+        self._high = []  # Min-heap of (value, id)
+        self._low_size = 0
+        self._high_size = 0
+        self._side = {}  # id -> 0 (low heap) or 1 (high heap)
+        self._removed = set()
+        self._order = deque()  # ids in arrival order
+        self._next_id = 0
+
+    def _prune(self, heap):
+        """
+        Pop lazily deleted entries from the top of a heap.
+
+        Args:
+            heap (list): self._low or self._high.
+        """
+        while heap and heap[0][1] in self._removed:
+            self._removed.discard(heapq.heappop(heap)[1])
+
+    def _compact(self):
+        """
+        Rebuild both heaps without the lazily deleted entries.
+        """
+        self._low = [entry for entry in self._low if entry[1] not in self._removed]
+        self._high = [entry for entry in self._high if entry[1] not in self._removed]
+        heapq.heapify(self._low)
+        heapq.heapify(self._high)
+        self._removed.clear()
+
+    def _move(self, source, target, to_side):
+        """
+        Move the top entry of one heap to the other.
+
+        Args:
+            source (list): Heap to take from.
+            target (list): Heap to push to.
+            to_side (int): 0 when moving to the low heap, 1 for the high heap.
+        """
+        self._prune(source)
+        key, item_id = heapq.heappop(source)
+        heapq.heappush(target, (-key, item_id))
+        self._side[item_id] = to_side
+        if to_side == 0:
+            self._low_size += 1
+            self._high_size -= 1
+        else:
+            self._low_size -= 1
+            self._high_size += 1
+
+    def push(self, value):
+        """
+        Add a value, evicting the oldest one once the window is full.
+
+        Args:
+            value (float): New observation.
+
+        Returns:
+            float: Current quantile of the window.
+        """
+        item_id = self._next_id
+        self._next_id += 1
+        self._order.append(item_id)
+
+        # Insert on the side that keeps every low value <= every high value
+        self._prune(self._low)
+        if self._low and value <= -self._low[0][0]:
+            heapq.heappush(self._low, (-value, item_id))
+            self._side[item_id] = 0
+            self._low_size += 1
+        else:
+            heapq.heappush(self._high, (value, item_id))
+            self._side[item_id] = 1
+            self._high_size += 1
+
+        # Evict the oldest value lazily
+        if len(self._order) > self.window:
+            old_id = self._order.popleft()
+            self._removed.add(old_id)
+            if self._side.pop(old_id) == 0:
+                self._low_size -= 1
+            else:
+                self._high_size -= 1
+            if len(self._removed) > self.window:
+                self._compact()
+
+        # Rebalance so the low heap holds exactly floor(q * (n - 1)) + 1 values
+        target = int(np.floor(self.q * (len(self._order) - 1))) + 1
+        while self._low_size > target:
+            self._move(self._low, self._high, 1)
+        while self._low_size < target:
+            self._move(self._high, self._low, 0)
+        return self.value
+
+    @property
+    def value(self):
+        """
+        Retrieve the current quantile.
+
+        Returns:
+            float: Interpolated quantile of the window, or NaN if empty.
+        """
+        count = len(self._order)
+        if count == 0:
+            return np.nan
+        self._prune(self._low)
+        self._prune(self._high)
+        lower = -self._low[0][0]
+        position = self.q * (count - 1)
+        fraction = position - np.floor(position)
+        if fraction == 0 or not self._high:
+            return lower
+        return lower + fraction * (self._high[0][0] - lower)
+
+
+class RollingCorrelation:
+    """
+    The RollingCorrelation class tracks the Pearson correlation of the last `window`
+    (x, y) pairs in O(1) per push using co-moment updates.
+
+    Attributes:
+        window (int): Window length.
+    """
+
+    def __init__(self, window):
+        """
+        Initialise an empty window.
+
+        Args:
+            window (int): Window length.
+        """
+        self.window = window
+        self._pairs = deque()
+        self._mean_x = 0.0
+        self._mean_y = 0.0
+        self._m2_x = 0.0
+        self._m2_y = 0.0
+        self._c_xy = 0.0
+
+    def _update(self, x, y, sign):
+        """
+        Add (sign=1) or remove (sign=-1) one pair from the running co-moments.
+
+        Args:
+            x (float): First value of the pair.
+            y (float): Second value of the pair.
+            sign (int): 1 to add, -1 to remove.
+        """
+        count = len(self._pairs)
+        if count == 0:
+            self._mean_x = self._mean_y = 0.0
+            self._m2_x = self._m2_y = self._c_xy = 0.0
+            return
+        dx = x - self._mean_x
+        dy = y - self._mean_y
+        self._mean_x += sign * dx / count
+        self._mean_y += sign * dy / count
+        self._m2_x += sign * dx * (x - self._mean_x)
+        self._m2_y += sign * dy * (y - self._mean_y)
+        self._c_xy += sign * dx * (y - self._mean_y)
+
+    def push(self, x, y):
+        """
+        Add a pair, evicting the oldest one once the window is full.
+
+        Args:
+            x (float): New value of the first series.
+            y (float): New value of the second series.
+
+        Returns:
+            float: Current correlation.
+        """
+        self._pairs.append((float(x), float(y)))
+        self._update(float(x), float(y), 1)
+        if len(self._pairs) > self.window:
+            old_x, old_y = self._pairs.popleft()
+            self._update(old_x, old_y, -1)
+        return self.value
+
+    @property
+    def value(self):
+        """
+        Retrieve the current correlation.
+
+        Returns:
+            float: Correlation, or NaN with fewer than two pairs or zero variance.
+        """
+        if len(self._pairs) < 2 or self._m2_x <= 0 or self._m2_y <= 0:
+            return np.nan
+        return float(np.clip(self._c_xy / np.sqrt(self._m2_x * self._m2_y), -1.0, 1.0))
+
+
+class RollingStats:
+    """
+    The RollingStats class bundles the streaming statistics of one series so a live
+    feed can update everything with a single push per tick.
+
+    Attributes:
+        window (int): Window length.
+        moments (RollingMoments): Mean and standard deviation.
+        minimum (RollingExtreme): Window minimum.
+        maximum (RollingExtreme): Window maximum.
+        median (RollingQuantile): Window median.
+    """
+
+    def __init__(self, window):
+        """
+        Initialise the statistics.
+
+        Args:
+            window (int): Window length.
+        """
+        self.window = window
+        self.moments = RollingMoments(window)
+        self.minimum = RollingExtreme(window, "min")
+        self.maximum = RollingExtreme(window, "max")
+        self.median = RollingQuantile(window, 0.5)
+
+    def push(self, value):
+        """
+        Add a value to every statistic.
+
+        Args:
+            value (float): New observation.
+
+        Returns:
+            dict: Current mean, std, min, max and median, NaN until the window is full.
+        """
+        self.moments.push(value)
+        self.minimum.push(value)
+        self.maximum.push(value)
+        self.median.push(value)
+        if self.moments.count < self.window:
+            return {"mean": np.nan, "std": np.nan, "min": np.nan, "max": np.nan, "median": np.nan}
+        return {
+            "mean": self.moments.mean,
+            "std": self.moments.std,
+            "min": self.minimum.value,
+            "max": self.maximum.value,
+            "median": self.median.value,
+        }
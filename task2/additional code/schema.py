@@ -0,0 +1,229 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: This file contains the schema layer for the task 2 datasets. It assigns a
+compact dtype to every column by name (float32 prices/returns/volatility, uint64
+volumes, day-resolution dates and categorical labels) and produces a validation report
+listing lossy or impossible conversions and the memory saved.
+
+The schema is applied by loaders.read_price_csv and loaders.read_wide_csv (unless
+schema=False) and by query.query. Other readers bypass it: query.ColumnarTable.build
+stores its own float32/float64 copies without a report, long_store only uses
+LABEL_DTYPE, group_aggregation parses float32 directly with read_dtypes, and
+data_quality checks the raw values.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Compact dtypes used by the schema
+FLOAT_DTYPE = "float32"
+VOLUME_DTYPE = "uint64"
+# Coarsest resolution pandas supports for datetime columns; NumPy arrays use datetime64[D]
+DATE_DTYPE = "datetime64[s]"
+LABEL_DTYPE = "category"
+
+# Columns holding text labels in long-format data
+LABEL_COLUMNS = {"Ticker", "Group", "Asset_Class", "Sector", "Exchange"}
+
+# Relative error above which a float32 conversion is reported as lossy
+FLOAT32_TOLERANCE = 1e-6
+
+
+def column_dtype(column):
+    """
+    Work out the schema dtype of a column from its name.
+
+    Args:
+        column (str): Column name, e.g. "AAPL_Volume", "BTC-USD_Adj_Close" or "Adj Close".
+
+    Returns:
+        str: Target dtype.
+    """
+    if column == "Date":
+        return DATE_DTYPE
+    if column in LABEL_COLUMNS:
+        return LABEL_DTYPE
+    if column.endswith("Volume"):
+        return VOLUME_DTYPE
+    # Prices, returns, volatility and other numeric measurements
+    return FLOAT_DTYPE
+
+
+def read_dtypes(columns):
+    """
+    Build a dtype mapping for pd.read_csv so float columns are parsed as float32 directly.
+
+    Volumes and dates are converted after parsing, because missing values cannot be
+    parsed straight into uint64. Values parsed this way are already rounded, so
+    apply_schema can no longer report float32 precision loss; parse as float64 when the
+    report is needed.
+
+    Args:
+        columns (iterable of str): Column names in the file.
+
+    Returns:
+        dict: Column mapped to the dtype to parse it as.
+    """
+    return {column: FLOAT_DTYPE for column in columns if column_dtype(column) == FLOAT_DTYPE}
+
+
+def _convert_volume(values, issues):
+    """
+    Convert a volume column to uint64, falling back when that would lose information.
+
+    Args:
+        values (pd.Series): Source column.
+        issues (list of str): Messages describing problems found (appended to).
+
+    Returns:
+        pd.Series: Converted column.
+    """
+    numeric = pd.to_numeric(values, errors="coerce")
+    missing = int(numeric.isna().sum())
+    negative = int((numeric < 0).sum())
+    fractional = int(((numeric % 1) != 0).sum() - missing)
+
+    if negative or fractional:
+        if negative:
+            issues.append(f"{negative} negative value(s); kept as float64")
+        if fractional:
+            issues.append(f"{fractional} non-integer value(s); kept as float64")
+        return numeric.astype("float64")
+    if missing:
+        # The nullable integer type keeps the missing values at one extra byte per row
+        issues.append(f"{missing} missing value(s); stored as nullable UInt64")
+        return numeric.astype("UInt64")
+    return numeric.astype(VOLUME_DTYPE)
+
+
+def _convert_float(values, issues):
+    """
+    Convert a numeric column to float32, reporting precision loss and overflow.
+
+    Args:
+        values (pd.Series): Source column.
+        issues (list of str): Messages describing problems found (appended to).
+
+    Returns:
+        pd.Series: Converted column.
+    """
+    numeric = pd.to_numeric(values, errors="coerce")
+    source = numeric.to_numpy(dtype=np.float64)
+    converted = source.astype(np.float32)
+
+    finite = np.isfinite(source)
+    overflow = int((finite & ~np.isfinite(converted)).sum())
+    if overflow:
+        issues.append(f"{overflow} value(s) overflow float32; kept as float64")
+        return numeric.astype("float64")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative = np.abs(converted[finite] - source[finite]) / np.abs(source[finite])
+    relative = relative[np.isfinite(relative)]
+    if relative.size and relative.max() > FLOAT32_TOLERANCE:
+        issues.append(f"float32 relative error up to {relative.max():.2e}")
+    return pd.Series(converted, index=values.index, name=values.name)
+
+
+def _convert_date(values, issues):
+    """
+    Convert a date column to day-resolution datetimes.
+
+    Args:
+        values (pd.Series): Source column.
+        issues (list of str): Messages describing problems found (appended to).
+
+    Returns:
+        pd.Series: Converted column.
+    """
+    dates = pd.to_datetime(values, errors="coerce")
+    invalid = int(dates.isna().sum() - values.isna().sum())
+    if invalid:
+        issues.append(f"{invalid} unparseable date(s)")
+    if (dates.dropna() != dates.dropna().dt.normalize()).any():
+        issues.append("time-of-day present; dates are not daily")
+    try:
+        return dates.astype(DATE_DTYPE)
+    except (TypeError, ValueError):
+        # Older pandas versions only support nanosecond resolution
+        return dates
+
+
+def _default_bytes(values):
+    """
+    Estimate the memory a column takes with pandas' default 64-bit dtypes.
+
+    Args:
+        values (pd.Series): Column as read.
+
+    Returns:
+        int: Bytes used by 64-bit numbers/datetimes, or the deep size of text columns.
+    """
+    if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_datetime64_any_dtype(values):
+        return 8 * len(values)
+    return int(values.memory_usage(index=False, deep=True))
+
+
+def apply_schema(df):
+    """
+    Convert every column of a DataFrame (and a DatetimeIndex, if any) to its schema dtype.
+
+    Args:
+        df (pd.DataFrame): Data as read from a CSV file.
+
+    Returns:
+        tuple: (converted DataFrame, validation report DataFrame with one row per column:
+        source dtype, dtype, missing count, issues, bytes with pandas' default 64-bit
+        dtypes and bytes after conversion).
+    """
+    converted = {}
+    rows = []
+    for column in df.columns:
+        values = df[column]
+        issues = []
+        target = column_dtype(column)
+        if target == DATE_DTYPE:
+            result = _convert_date(values, issues)
+        elif target == LABEL_DTYPE:
+            result = values.astype(LABEL_DTYPE)
+        elif target == VOLUME_DTYPE:
+            result = _convert_volume(values, issues)
+        else:
+            result = _convert_float(values, issues)
+        converted[column] = result
+        rows.append({
+            "column": column,
+            "source_dtype": str(values.dtype),
+            "dtype": str(result.dtype),
+            "missing": int(values.isna().sum()),
+            "issues": "; ".join(issues),
+            "bytes_before": _default_bytes(values),
+            "bytes_after": int(result.memory_usage(index=False, deep=True)),
+        })
+
+    # Build the result in one go rather than assigning column by column
+    result_df = pd.DataFrame(converted, index=df.index)
+    if isinstance(df.index, pd.DatetimeIndex):
+        result_df.index = pd.DatetimeIndex(_convert_date(df.index.to_series(), []), name=df.index.name)
+    report = pd.DataFrame(rows, columns=["column", "source_dtype", "dtype", "missing", "issues",
+                                         "bytes_before", "bytes_after"])
+    return result_df, report
+
+
+def summarise_report(report):
+    """
+    Summarise a validation report in one line.
+
+    Args:
+        report (pd.DataFrame): Report returned by apply_schema.
+
+    Returns:
+        str: Memory before/after and the number of columns with issues.
+    """
+    before = report["bytes_before"].sum()
+    after = report["bytes_after"].sum()
+    flagged = int((report["issues"] != "").sum())
+    saving = 100 * (1 - after / before) if before else 0.0
+    return (f"{len(report)} column(s): {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB "
+            f"({saving:.0f}% smaller), {flagged} column(s) with issues")
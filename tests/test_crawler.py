@@ -0,0 +1,41 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: Checks that the crawler's on-disk cache returns what was fetched.
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "task2", "additional code"))
+
+from crawler import CrawlCache, Crawler
+from loaders import PRICE_FIELDS
+
+
+class HourlyBackend:
+    """
+    Backend returning one bar per hour of the requested range.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch(self, ticker, start, end, interval="1d"):
+        self.calls += 1
+        index = pd.date_range(start, end, freq="h", inclusive="left", name="Date")
+        return pd.DataFrame({field: range(len(index)) for field in PRICE_FIELDS}, index=index, dtype=float)
+
+
+def test_hourly_bars_survive_the_cache(tmp_path):
+    backend = HourlyBackend()
+    crawler = Crawler(backend, CrawlCache(str(tmp_path)), rate=0)
+
+    fetched = crawler.fetch("AAPL", "2024-01-02", "2024-01-03", interval="1h")
+    cached = crawler.fetch("AAPL", "2024-01-02", "2024-01-03", interval="1h")
+
+    assert backend.calls == 1
+    assert len(fetched) == len(cached) == 24
+    assert list(cached.index) == list(pd.date_range("2024-01-02", periods=24, freq="h"))
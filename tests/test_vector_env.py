@@ -0,0 +1,39 @@
+"""
+Author: Mishara Sapukotanage
+Section: Data Science
+Description: Checks that VectorHatcheryEnv reproduces HatcheryEnv quarter by quarter.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "task1"))
+
+from Hatchery import Hatchery
+from HatcheryEnv import HatcheryEnv
+from VectorHatcheryEnv import FISH_TYPES, ROSTER_SLOTS, VENDORS, VectorHatcheryEnv
+
+
+def test_vector_env_matches_class_based_env():
+    num_envs, quarters = 500, 8
+    rng = np.random.default_rng(0)
+    demand = np.array([Hatchery.CUSTOMER_DEMAND[fish]["demand"] for fish in FISH_TYPES])
+    vector = VectorHatcheryEnv(num_envs, max_quarters=quarters)
+    envs = [HatcheryEnv(max_quarters=quarters) for _ in range(num_envs)]
+
+    for _ in range(quarters):
+        # Random staffing changes (some breaking the limits), sales and vendors
+        hire = rng.integers(-1, 3, size=(num_envs, len(ROSTER_SLOTS))) * (rng.random((num_envs, len(ROSTER_SLOTS))) < 0.4)
+        sales = rng.integers(0, demand + 1, size=(num_envs, len(FISH_TYPES)))
+        vendor = rng.integers(0, len(VENDORS), size=num_envs)
+        observations, rewards, dones, _ = vector.step({"hire": hire, "sales": sales, "vendor": vendor})
+
+        for i, env in enumerate(envs):
+            observation, reward, done, _ = env.step({"hire": hire[i], "sales": sales[i], "vendor": vendor[i]})
+            assert done == dones[i]
+            np.testing.assert_allclose(reward, rewards[i], rtol=1e-9, atol=1e-6)
+            if done:
+                observation = env.reset()
+            np.testing.assert_allclose(observation, observations[i], rtol=1e-9, atol=1e-6)